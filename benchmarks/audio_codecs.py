@@ -0,0 +1,74 @@
+"""
+Compares the STT upload formats (WAV / FLAC / OGG Opus) on the sample files in uploads/.
+
+Usage:
+    python -m benchmarks.audio_codecs                 # bytes + extraction time
+    python -m benchmarks.audio_codecs --end-to-end    # also GCS upload + STT latency (needs GCP credentials)
+"""
+import os
+import time
+import glob
+import argparse
+import tempfile
+import subprocess
+
+from services.audio_processing import AUDIO_FORMATS, extract_audio_from_compressed_video
+
+
+def run_end_to_end(audio_path: str, audio_format: str) -> float:
+    # Imported lazily so the offline benchmark does not need GCP settings
+    from services.gcp_helper import upload_to_gcp_bucket, delete_from_gcp_bucket, bucket_name
+    from services.audio_processing import transcribe_with_vertex_ai
+
+    bucket_path = f"benchmarks/{os.path.basename(audio_path)}"
+    start = time.perf_counter()
+    upload_to_gcp_bucket(audio_path, bucket_path)
+    transcribe_with_vertex_ai(f"gs://{bucket_name}/{bucket_path}", audio_format=audio_format)
+    elapsed = time.perf_counter() - start
+    delete_from_gcp_bucket(bucket_path)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", default="uploads/*", help="glob of input recordings")
+    parser.add_argument("--end-to-end", action="store_true", help="include GCS upload + STT latency")
+    args = parser.parse_args()
+
+    samples = sorted(glob.glob(args.samples))
+    if not samples:
+        print(f"No sample files match {args.samples}")
+        return
+
+    totals = {fmt: {"bytes": 0, "extract": 0.0, "e2e": 0.0, "files": 0} for fmt in AUDIO_FORMATS}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for sample in samples:
+            for fmt, spec in AUDIO_FORMATS.items():
+                out_path = os.path.join(tmp, f"{os.path.basename(sample)}.{spec['extension']}")
+
+                start = time.perf_counter()
+                try:
+                    extract_audio_from_compressed_video(sample, out_path, fmt)
+                except subprocess.CalledProcessError:
+                    print(f"⚠️ Skipping unreadable sample {sample}")
+                    break
+                extract_time = time.perf_counter() - start
+
+                totals[fmt]["bytes"] += os.path.getsize(out_path)
+                totals[fmt]["extract"] += extract_time
+                totals[fmt]["files"] += 1
+                if args.end_to_end:
+                    totals[fmt]["e2e"] += run_end_to_end(out_path, fmt)
+
+    wav_bytes = totals["wav"]["bytes"] or 1
+    print(f"\n{'format':<10}{'files':>6}{'bytes':>12}{'vs wav':>9}{'extract s':>11}" + (f"{'e2e s':>9}" if args.end_to_end else ""))
+    for fmt, t in totals.items():
+        line = f"{fmt:<10}{t['files']:>6}{t['bytes']:>12}{t['bytes'] / wav_bytes:>8.2f}x{t['extract']:>11.3f}"
+        if args.end_to_end:
+            line += f"{t['e2e']:>9.2f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
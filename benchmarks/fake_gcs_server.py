@@ -0,0 +1,326 @@
+"""
+Minimal in-process Cloud Storage emulator for transfer benchmarks.
+
+Speaks just enough of the JSON API (multipart / resumable uploads, ranged
+media downloads, object metadata, delete) and the XML multipart-upload API
+(used by transfer_manager.upload_chunks_concurrently) for services.gcp_helper.
+Every request pays `latency` seconds and every connection is throttled to
+`bandwidth` bytes/s, so parallel transfers behave like they do over a WAN.
+
+Usage (standalone):
+    python -m benchmarks.fake_gcs_server --port 9023 --latency-ms 20 --bandwidth-mbps 40
+    STORAGE_EMULATOR_HOST=http://127.0.0.1:9023 uvicorn main:app
+"""
+import argparse
+import base64
+import hashlib
+import itertools
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+
+import google_crc32c
+
+IO_CHUNK = 64 * 1024
+S3_NAMESPACE = "http://s3.amazonaws.com/doc/2006-03-01/"
+
+
+def _b64(digest: bytes) -> str:
+    return base64.b64encode(digest).decode("ascii")
+
+
+def _hashes(data: bytes) -> tuple[str, str]:
+    return _b64(google_crc32c.Checksum(data).digest()), _b64(hashlib.md5(data).digest())
+
+
+class _Store:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.objects = {}      # (bucket, name) -> (data, generation, content_type)
+        self.resumable = {}    # upload_id -> {"bucket", "name", "content_type", "data"}
+        self.multipart = {}    # upload_id -> {"bucket", "name", "content_type", "parts": {n: bytes}}
+        self.generations = itertools.count(1)
+
+    def put(self, bucket: str, name: str, data: bytes, content_type: str) -> dict:
+        with self.lock:
+            generation = next(self.generations)
+            self.objects[(bucket, name)] = (data, generation, content_type)
+        return self.metadata(bucket, name)
+
+    def metadata(self, bucket: str, name: str):
+        with self.lock:
+            entry = self.objects.get((bucket, name))
+        if entry is None:
+            return None
+        data, generation, content_type = entry
+        crc32c, md5 = _hashes(data)
+        return {
+            "kind": "storage#object",
+            "id": f"{bucket}/{name}/{generation}",
+            "bucket": bucket,
+            "name": name,
+            "size": str(len(data)),
+            "generation": str(generation),
+            "metageneration": "1",
+            "contentType": content_type,
+            "crc32c": crc32c,
+            "md5Hash": md5,
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "FakeGCS/1.0"
+
+    # ----------------------------------------------------------
+    # Throttled I/O
+    # ----------------------------------------------------------
+    def _throttle(self, nbytes: int) -> None:
+        if self.server.bandwidth:
+            time.sleep(nbytes / self.server.bandwidth)
+
+    def _read_body(self) -> bytes:
+        remaining = int(self.headers.get("Content-Length") or 0)
+        chunks = []
+        while remaining:
+            chunk = self.rfile.read(min(IO_CHUNK, remaining))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+            self._throttle(len(chunk))
+        return b"".join(chunks)
+
+    def _send(self, status: int, body: bytes = b"", headers: dict = None) -> None:
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        view = memoryview(body)
+        for offset in range(0, len(body), IO_CHUNK):
+            chunk = view[offset:offset + IO_CHUNK]
+            self.wfile.write(chunk)
+            self._throttle(len(chunk))
+
+    def _json(self, status: int, payload: dict, headers: dict = None) -> None:
+        self._send(status, json.dumps(payload).encode(), {"Content-Type": "application/json", **(headers or {})})
+
+    def _xml(self, status: int, body: str) -> None:
+        self._send(status, body.encode(), {"Content-Type": "application/xml"})
+
+    def _not_found(self) -> None:
+        self._json(404, {"error": {"code": 404, "message": "No such object"}})
+
+    def log_message(self, format, *args):
+        pass
+
+    # ----------------------------------------------------------
+    # Routing
+    # ----------------------------------------------------------
+    def _route(self, method: str) -> None:
+        time.sleep(self.server.latency)
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+        body = self._read_body() if method in ("POST", "PUT") else b""
+
+        if m := re.fullmatch(r"/upload/storage/v1/b/([^/]+)/o", url.path):
+            return self._json_upload(method, unquote(m.group(1)), query, body)
+        if m := re.fullmatch(r"/download/storage/v1/b/([^/]+)/o/(.+)", url.path):
+            return self._media_download(unquote(m.group(1)), unquote(m.group(2)))
+        if m := re.fullmatch(r"/storage/v1/b/([^/]+)/o/(.+)", url.path):
+            return self._object(method, unquote(m.group(1)), unquote(m.group(2)), query)
+        if m := re.fullmatch(r"/([^/]+)/(.+)", url.path):
+            return self._xml_multipart(method, unquote(m.group(1)), unquote(m.group(2)), query, body)
+        self._json(400, {"error": {"code": 400, "message": f"Unsupported path {url.path}"}})
+
+    def do_GET(self):
+        self._route("GET")
+
+    def do_POST(self):
+        self._route("POST")
+
+    def do_PUT(self):
+        self._route("PUT")
+
+    def do_DELETE(self):
+        self._route("DELETE")
+
+    # ----------------------------------------------------------
+    # JSON API
+    # ----------------------------------------------------------
+    def _json_upload(self, method: str, bucket: str, query: dict, body: bytes) -> None:
+        store = self.server.store
+        upload_type = query.get("uploadType")
+
+        if upload_type == "multipart" and method == "POST":
+            boundary = re.search(r'boundary="?([^";]+)"?', self.headers["Content-Type"]).group(1).encode()
+            parts = [p for p in body.split(b"--" + boundary) if p.strip() not in (b"", b"--")]
+            meta_part, media_part = (p.split(b"\r\n\r\n", 1) for p in parts[:2])
+            metadata = json.loads(meta_part[1])
+            content_type = re.search(rb"content-type: *([^\r\n]+)", media_part[0], re.I).group(1).decode()
+            data = media_part[1].removesuffix(b"\r\n")
+            return self._json(200, store.put(bucket, metadata["name"], data, content_type))
+
+        if upload_type == "resumable" and method == "POST":
+            metadata = json.loads(body or b"{}")
+            upload_id = uuid.uuid4().hex
+            store.resumable[upload_id] = {
+                "bucket": bucket,
+                "name": query.get("name") or metadata["name"],
+                "content_type": self.headers.get("X-Upload-Content-Type", "application/octet-stream"),
+                "data": bytearray(),
+            }
+            location = f"{self.server.url}/upload/storage/v1/b/{bucket}/o?uploadType=resumable&upload_id={upload_id}"
+            return self._send(200, headers={"Location": location})
+
+        if upload_type == "resumable" and method == "PUT":
+            session = store.resumable.get(query.get("upload_id"))
+            if session is None:
+                return self._not_found()
+            m = re.fullmatch(r"bytes (?:(\d+)-\d+|\*)/(\d+|\*)", self.headers.get("Content-Range", ""))
+            if m and m.group(1) is not None and int(m.group(1)) == len(session["data"]):
+                session["data"] += body
+            total = m.group(2) if m else "*"
+            if total != "*" and len(session["data"]) == int(total):
+                store.resumable.pop(query["upload_id"], None)
+                return self._json(200, store.put(session["bucket"], session["name"], bytes(session["data"]), session["content_type"]))
+            headers = {"Range": f"bytes=0-{len(session['data']) - 1}"} if session["data"] else {}
+            return self._send(308, headers=headers)
+
+        self._json(400, {"error": {"code": 400, "message": f"Unsupported upload {upload_type}"}})
+
+    def _media_download(self, bucket: str, name: str) -> None:
+        store = self.server.store
+        with store.lock:
+            entry = store.objects.get((bucket, name))
+        if entry is None:
+            return self._not_found()
+        data, generation, content_type = entry
+        crc32c, md5 = _hashes(data)
+        headers = {"Content-Type": content_type, "X-Goog-Generation": str(generation)}
+
+        m = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if m:
+            start = int(m.group(1))
+            end = min(int(m.group(2)) if m.group(2) else len(data) - 1, len(data) - 1)
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+            return self._send(206, data[start:end + 1], headers)
+
+        headers["X-Goog-Hash"] = f"crc32c={crc32c},md5={md5}"
+        self._send(200, data, headers)
+
+    def _object(self, method: str, bucket: str, name: str, query: dict) -> None:
+        store = self.server.store
+        if method == "DELETE":
+            with store.lock:
+                removed = store.objects.pop((bucket, name), None)
+            return self._send(204) if removed else self._not_found()
+        if query.get("alt") == "media":
+            return self._media_download(bucket, name)
+
+        metadata = store.metadata(bucket, name)
+        return self._json(200, metadata) if metadata else self._not_found()
+
+    # ----------------------------------------------------------
+    # XML multipart upload API
+    # ----------------------------------------------------------
+    def _xml_multipart(self, method: str, bucket: str, name: str, query: dict, body: bytes) -> None:
+        store = self.server.store
+
+        if method == "POST" and "uploads" in query:
+            upload_id = uuid.uuid4().hex
+            store.multipart[upload_id] = {
+                "bucket": bucket,
+                "name": name,
+                "content_type": self.headers.get("Content-Type", "application/octet-stream"),
+                "parts": {},
+            }
+            return self._xml(200, (
+                f'<?xml version="1.0" encoding="UTF-8"?>'
+                f'<InitiateMultipartUploadResult xmlns="{S3_NAMESPACE}">'
+                f"<Bucket>{bucket}</Bucket><Key>{name}</Key><UploadId>{upload_id}</UploadId>"
+                f"</InitiateMultipartUploadResult>"
+            ))
+
+        upload = store.multipart.get(query.get("uploadId"))
+        if upload is None:
+            return self._not_found()
+
+        if method == "PUT":
+            upload["parts"][int(query["partNumber"])] = body
+            crc32c, md5 = _hashes(body)
+            return self._send(200, headers={
+                "ETag": f'"{hashlib.md5(body).hexdigest()}"',
+                "X-Goog-Hash": f"crc32c={crc32c},md5={md5}",
+            })
+
+        if method == "POST":
+            store.multipart.pop(query["uploadId"], None)
+            data = b"".join(upload["parts"][n] for n in sorted(upload["parts"]))
+            store.put(bucket, name, data, upload["content_type"])
+            return self._xml(200, (
+                f'<?xml version="1.0" encoding="UTF-8"?>'
+                f'<CompleteMultipartUploadResult xmlns="{S3_NAMESPACE}">'
+                f"<Bucket>{bucket}</Bucket><Key>{name}</Key>"
+                f"</CompleteMultipartUploadResult>"
+            ))
+
+        if method == "DELETE":
+            store.multipart.pop(query["uploadId"], None)
+            return self._send(204)
+
+        self._xml(400, "<Error><Code>InvalidRequest</Code></Error>")
+
+
+class FakeGcsServer(ThreadingHTTPServer):
+    """
+    Threaded fake GCS endpoint; use as a context manager or call start() / stop().
+    """
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: float = 0.0, bandwidth: float = 0.0):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.store = _Store()
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+        self._thread = None
+
+    def start(self) -> "FakeGcsServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=9023)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added to every request")
+    parser.add_argument("--bandwidth-mbps", type=float, default=0.0, help="per-connection MB/s (0 = unthrottled)")
+    args = parser.parse_args()
+
+    server = FakeGcsServer(args.port, args.latency_ms / 1000, args.bandwidth_mbps * 1024 * 1024)
+    print(f"Fake GCS listening on {server.url} (STORAGE_EMULATOR_HOST={server.url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Upload / download throughput of services.gcp_helper at different concurrency
+levels, against the local fake GCS server (per-connection bandwidth cap and
+per-request latency emulate a regional worker talking to the bucket).
+
+Workers = 1 is the single-stream path (chunked resumable upload, one media
+download); higher counts use transfer_manager slices. Every download is
+compared byte-for-byte with the source file.
+
+Usage:
+    python -m benchmarks.gcs_transfers [--size-mb 64] [--slice-mb 8] \
+        [--bandwidth-mbps 20] [--latency-ms 20] [--workers 1,2,4,8]
+"""
+import argparse
+import filecmp
+import os
+import tempfile
+import time
+
+from benchmarks.fake_gcs_server import FakeGcsServer
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--slice-mb", type=int, default=8)
+    parser.add_argument("--bandwidth-mbps", type=float, default=20.0, help="per-connection MB/s")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--workers", default="1,2,4,8")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    mb = 1024 * 1024
+
+    server = FakeGcsServer(latency=args.latency_ms / 1000, bandwidth=args.bandwidth_mbps * mb).start()
+
+    # Must be set before the helpers read their configuration
+    os.environ.update({
+        "GCP_FAKE_BACKEND": "false",
+        "STORAGE_EMULATOR_HOST": server.url,
+        "GCP_BUCKET_NAME": "bench-bucket",
+        "GCS_PARALLEL_THRESHOLD": str(args.slice_mb * mb),
+        "GCS_SLICE_SIZE": str(args.slice_mb * mb),
+        "GCS_PARALLEL_DOWNLOAD": "true",
+    })
+    from services.gcp_helper import upload_to_gcp_bucket, download_from_gcp_bucket, delete_from_gcp_bucket
+
+    failures = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "answer.webm")
+            target = os.path.join(tmp, "copy.webm")
+            with open(source, "wb") as f:
+                f.write(os.urandom(args.size_mb * mb))
+
+            print(f"{args.size_mb} MB object, {args.slice_mb} MB slices, "
+                  f"{args.bandwidth_mbps:g} MB/s per connection, {args.latency_ms:g} ms latency")
+            print(f"{'workers':>8}{'upload s':>10}{'MB/s':>8}{'download s':>12}{'MB/s':>8}")
+
+            for workers in (int(w) for w in args.workers.split(",")):
+                bucket_path = f"benchmarks/answer_{workers}.webm"
+
+                start = time.perf_counter()
+                upload_to_gcp_bucket(source, bucket_path, max_workers=workers)
+                upload_s = time.perf_counter() - start
+
+                start = time.perf_counter()
+                download_from_gcp_bucket(bucket_path, target, max_workers=workers)
+                download_s = time.perf_counter() - start
+
+                ok = filecmp.cmp(source, target, shallow=False)
+                print(f"{workers:>8}{upload_s:>10.2f}{args.size_mb / upload_s:>8.1f}"
+                      f"{download_s:>12.2f}{args.size_mb / download_s:>8.1f}{'' if ok else '  ❌ content differs'}")
+                if not ok:
+                    failures.append(workers)
+
+                delete_from_gcp_bucket(bucket_path)
+    finally:
+        server.stop()
+
+    if failures:
+        raise SystemExit(f"Corrupted transfers with workers={failures}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Times report generation with the LLM response cache against the fake Gemini
+model: cold call, repeat (memory hit), repeat after a process restart
+(persistent hit), force_refresh, and TTL expiry.
+
+Usage:
+    python -m benchmarks.llm_cache [--backend disk|db] [--latency 0.5]
+    (the db backend uses DATABASE_URL)
+"""
+import argparse
+import os
+import tempfile
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", choices=["disk", "db"], default="disk")
+    parser.add_argument("--latency", type=float, default=0.5, help="fake Gemini latency (seconds)")
+    return parser.parse_args()
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    args = parse_args()
+    tmp = tempfile.mkdtemp(prefix="llm_cache_")
+
+    # Must be set before the services read their configuration
+    os.environ.update({
+        "GCP_FAKE_BACKEND": "true",
+        "FAKE_MODEL_LATENCY": str(args.latency),
+        "LLM_CACHE_BACKEND": args.backend,
+        "LLM_CACHE_DIR": tmp,
+    })
+    from services import llm_cache
+    from services.audio_processing import generate_hr_report_with_gemini, llm_executor
+
+    qa_pairs = [
+        {"question": f"Question {i}?", "transcript": f"Answer number {i} with some detail."}
+        for i in range(8)
+    ]
+    cache = llm_cache.get_llm_cache()
+    failures = []
+
+    cold, cold_ms = timed(generate_hr_report_with_gemini, qa_pairs)
+    warm, warm_ms = timed(generate_hr_report_with_gemini, qa_pairs)
+
+    # A new process only has the persistent tier
+    cache.memory.clear()
+    persisted, persisted_ms = timed(generate_hr_report_with_gemini, qa_pairs)
+
+    refreshed, refresh_ms = timed(generate_hr_report_with_gemini, qa_pairs, force_refresh=True)
+    changed, changed_ms = timed(generate_hr_report_with_gemini, qa_pairs[:-1])
+
+    print(f"{args.backend} backend, fake Gemini latency {args.latency:g}s")
+    print(f"{'call':<28}{'ms':>10}")
+    for name, ms in [
+        ("cold", cold_ms), ("repeat (memory hit)", warm_ms), ("restart (persistent hit)", persisted_ms),
+        ("force_refresh", refresh_ms), ("different answers", changed_ms),
+    ]:
+        print(f"{name:<28}{ms:>10.1f}")
+    print(f"cache counters: {cache.stats()}, Gemini calls: {llm_executor.stats()['calls']}")
+
+    if not (cold == warm == persisted == refreshed):
+        failures.append("cached report differs from the generated one")
+    if warm_ms > 50 or persisted_ms > 50:
+        failures.append("cache hits are not fast")
+    if refresh_ms < args.latency * 1000 or changed_ms < args.latency * 1000:
+        failures.append("force_refresh / new input did not call Gemini")
+    if llm_executor.stats()["calls"] != 3:
+        failures.append(f"expected 3 Gemini calls, got {llm_executor.stats()['calls']}")
+
+    # Expired entries are dropped by every tier
+    cache.memory.ttl = cache.persistent.ttl = 0
+    key = llm_cache.llm_cache_key("fake", "ttl-check", {}, "input")
+    cache.set(key, "stale", "fake")
+    if cache.get(key) is not None:
+        failures.append("expired entry was served")
+
+    llm_executor.stop()
+    if failures:
+        raise SystemExit(f"❌ Failed: {', '.join(failures)}")
+    print("✅ LLM cache serves repeats without calling Gemini")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Checks the bounded Gemini executor in services.audio_processing against the
+fake model: concurrency cap and queue depth under a burst, 429/503 retries,
+give-up after max attempts, per-call timeout, and the async entry point.
+
+Usage:
+    python -m benchmarks.llm_executor [--burst 24] [--concurrency 4] [--latency 0.1]
+"""
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from google.api_core.exceptions import ResourceExhausted, ServiceUnavailable
+
+from services.audio_processing import LLMExecutor
+from services.gcp_fakes import FakeGenerativeModel
+
+PROMPT = "Sections:\n1. Interview Summary\n2. Strengths\n"
+CONFIG = {"max_output_tokens": 2048, "temperature": 0.5}
+
+
+def check_burst(args, failures):
+    executor = LLMExecutor(max_concurrency=args.concurrency, timeout=5)
+    model = FakeGenerativeModel(latency=args.latency)
+    max_depth = 0
+    done = threading.Event()
+
+    def sample_depth():
+        nonlocal max_depth
+        while not done.is_set():
+            max_depth = max(max_depth, executor.stats()["queue_depth"])
+            time.sleep(0.005)
+
+    sampler = threading.Thread(target=sample_depth)
+    sampler.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.burst) as pool:
+        results = list(pool.map(lambda _: executor.run(model, PROMPT, CONFIG), range(args.burst)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    sampler.join()
+    executor.stop()
+
+    expected = args.burst / args.concurrency * args.latency
+    print(f"burst of {args.burst}: {elapsed:.2f}s (ideal {expected:.2f}s), "
+          f"max in flight {model.max_active}/{args.concurrency}, max queue depth {max_depth}")
+    if model.max_active > args.concurrency:
+        failures.append("concurrency cap exceeded")
+    if max_depth == 0 or executor.stats()["queue_depth"] != 0:
+        failures.append("queue depth not reported")
+    if len(results) != args.burst or not all("Strengths" in r.text for r in results):
+        failures.append("burst results")
+
+
+def check_retries(failures):
+    executor = LLMExecutor(max_attempts=3, base_delay=0.01, max_delay=0.05)
+    model = FakeGenerativeModel(failures=[ResourceExhausted("quota"), ServiceUnavailable("busy")])
+    response = executor.run(model, PROMPT, CONFIG)
+    stats = executor.stats()
+    print(f"429 + 503 then success: {model.calls} calls, {stats['retries']} retries")
+    if stats["retries"] != 2 or model.calls != 3 or not response.text:
+        failures.append("retry on 429/503")
+
+    model = FakeGenerativeModel(failures=[ResourceExhausted("quota")] * 3)
+    try:
+        executor.run(model, PROMPT, CONFIG)
+        failures.append("gave up after max attempts")
+    except ResourceExhausted:
+        print(f"429 x3: gave up after {model.calls} attempts")
+    executor.stop()
+
+
+def check_timeout(failures):
+    executor = LLMExecutor(timeout=0.2)
+    model = FakeGenerativeModel(latency=5)
+    start = time.perf_counter()
+    try:
+        executor.run(model, PROMPT, CONFIG)
+        failures.append("timeout")
+    except TimeoutError:
+        elapsed = time.perf_counter() - start
+        print(f"slow call: TimeoutError after {elapsed:.2f}s, in flight afterwards {executor.stats()['in_flight']}")
+        if elapsed > 1 or executor.stats()["in_flight"] != 0:
+            failures.append("timeout did not release the slot")
+    executor.stop()
+
+
+def check_async(failures):
+    executor = LLMExecutor(max_concurrency=2)
+    model = FakeGenerativeModel(latency=0.05)
+
+    async def burst():
+        return await asyncio.gather(*(executor.arun(model, PROMPT, CONFIG) for _ in range(6)))
+
+    results = asyncio.run(burst())
+    executor.stop()
+    print(f"async burst: {len(results)} results, max in flight {model.max_active}/2")
+    if len(results) != 6 or model.max_active > 2:
+        failures.append("async entry point")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--burst", type=int, default=24)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.1)
+    args = parser.parse_args()
+
+    failures = []
+    check_burst(args, failures)
+    check_retries(failures)
+    check_timeout(failures)
+    check_async(failures)
+
+    if failures:
+        raise SystemExit(f"❌ Failed: {', '.join(failures)}")
+    print("✅ LLM executor behaves as configured")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Micro-benchmark of the report section parser over the reports in Reports/.
+
+Compares the single-pass parser (services.audio_processing.parse_report_sections)
+with the previous approach of one DOTALL re.search per section, compiled on every
+call, for each report and for the whole set repeated (a backfill of thousands of
+reports). Also checks that every section of each report's layout was found.
+
+Usage:
+    python -m benchmarks.report_sections [--dir Reports] [--repeat 1000]
+"""
+import argparse
+import glob
+import os
+import re
+import time
+
+from services.audio_processing import REPORT_SECTION_LAYOUTS, REPORT_LIST_SECTIONS, parse_report_sections
+
+
+def legacy_parse_sections(text: str, round_type: str) -> dict:
+    """
+    The previous algorithm, generalised to every layout: each section is found
+    by its own numbered-heading search with a lookahead for the next heading.
+    """
+    def extract(number: int, title: str) -> str:
+        pattern = rf"{number}[.\s]+{title}.*?\s*\n(.*?)(?=\n\d+[\.\s]+|$)"
+        match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
+        return match.group(1).strip() if match else ""
+
+    sections = {}
+    for number, (key, title) in enumerate(REPORT_SECTION_LAYOUTS[round_type], start=1):
+        body = extract(number, title)
+        sections[key] = [line.strip() for line in body.split("\n") if line.strip()] if key in REPORT_LIST_SECTIONS else body
+    return sections
+
+
+def round_of(path: str) -> str:
+    return os.path.splitext(path)[0].rsplit("_", 1)[-1]
+
+
+def per_call_us(parse, reports, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text, round_type in reports:
+            parse(text, round_type)
+    return (time.perf_counter() - start) / (repeat * len(reports)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dir", default="Reports")
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    reports = []
+    for path in sorted(glob.glob(os.path.join(args.dir, "*.txt"))):
+        round_type = round_of(path)
+        if round_type in REPORT_SECTION_LAYOUTS:
+            with open(path, encoding="utf-8") as f:
+                reports.append((os.path.basename(path), f.read(), round_type))
+    if not reports:
+        raise SystemExit(f"No hr / technical / cultural reports found in {args.dir}")
+
+    failures = []
+    print(f"{'report':<62}{'bytes':>7}{'found':>7}{'single µs':>11}{'legacy µs':>11}")
+    for name, text, round_type in reports:
+        sections = parse_report_sections(text, round_type)
+        found = sum(1 for value in sections.values() if value)
+        single = per_call_us(parse_report_sections, [(text, round_type)], args.repeat)
+        legacy = per_call_us(legacy_parse_sections, [(text, round_type)], args.repeat)
+        print(f"{name[:60]:<62}{len(text):>7}{found:>4}/{len(sections):<2}{single:>11.1f}{legacy:>11.1f}")
+        if found != len(sections):
+            failures.append(name)
+
+    corpus = [(text, round_type) for _, text, round_type in reports]
+    total = args.repeat * len(corpus)
+    single = per_call_us(parse_report_sections, corpus, args.repeat)
+    legacy = per_call_us(legacy_parse_sections, corpus, args.repeat)
+    print(f"\n{total} reports: single-pass {single * total / 1e6:.2f}s ({single:.1f} µs/report), "
+          f"legacy {legacy * total / 1e6:.2f}s ({legacy:.1f} µs/report), {legacy / single:.1f}x")
+
+    # Long reports: cost should grow linearly with the text
+    text, round_type = corpus[0]
+    long_text = text.replace("\n\n", "\n\n" + "Filler sentence for a long report. " * 200 + "\n\n")
+    long_single = per_call_us(parse_report_sections, [(long_text, round_type)], max(1, args.repeat // 20))
+    long_legacy = per_call_us(legacy_parse_sections, [(long_text, round_type)], max(1, args.repeat // 20))
+    print(f"{len(long_text)} byte report: single-pass {long_single:.1f} µs, legacy {long_legacy:.1f} µs")
+
+    if failures:
+        raise SystemExit(f"❌ Missing sections in: {', '.join(failures)}")
+    print("✅ Every section of every report was parsed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Counts the SQL round-trips needed to load a task's answers with their questions,
+comparing the old lazy-loading pattern with services.response_queries.
+
+Runs against a throwaway in-memory SQLite database, so no settings are needed.
+
+Usage:
+    python -m benchmarks.response_queries
+    python -m benchmarks.response_queries --sizes 1 10 100 1000
+"""
+import time
+import argparse
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models import Base, UserTask, HrRound, TechnicalRound, CulturalFit
+from services.response_queries import (
+    RESPONSE_MODELS, load_responses_with_questions_sync, build_qa_pairs
+)
+
+QUESTION_MODELS = {
+    "technical": TechnicalRound,
+    "hr": HrRound,
+    "cultural": CulturalFit
+}
+
+
+def make_engine():
+    return create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+
+
+@contextmanager
+def count_queries(engine):
+    """
+    Yields a one-element list holding the number of statements executed inside the block.
+    """
+    counter = [0]
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        counter[0] += 1
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+
+
+def seed_task(db, round_type: str, task_id: str, answers: int, skill: str = "python") -> None:
+    """
+    One question per answer, so every response points at a distinct question row.
+    """
+    question_model = QUESTION_MODELS[round_type]
+    response_model = RESPONSE_MODELS[round_type]
+
+    db.add(UserTask(u_id="bench", type=round_type, task_id=task_id))
+    for i in range(answers):
+        if round_type == "technical":
+            question = question_model(question=f"Q{i}", answer=f"A{i}", skill=skill, difficulty="easy")
+        else:
+            question = question_model(question_text=f"Q{i}")
+        db.add(question)
+        db.flush()
+
+        fields = {"task_id": task_id, "question_id": question.id, "transcript": f"answer {i}"}
+        if round_type == "technical":
+            fields["skill"] = skill
+        db.add(response_model(**fields))
+    db.commit()
+
+
+def load_lazily(db, round_type: str, task_id: str) -> list:
+    # The pre-refactor pattern: plain SELECT, then one lazy load per answer
+    model = RESPONSE_MODELS[round_type]
+    responses = db.execute(select(model).where(model.task_id == task_id)).scalars().all()
+    return build_qa_pairs(round_type, responses)
+
+
+def load_joined(db, round_type: str, task_id: str) -> list:
+    return build_qa_pairs(round_type, load_responses_with_questions_sync(db, round_type, task_id))
+
+
+def measure(engine, Session, loader, round_type: str, task_id: str) -> tuple[int, float, int]:
+    db = Session()
+    try:
+        with count_queries(engine) as counter:
+            start = time.perf_counter()
+            pairs = loader(db, round_type, task_id)
+            elapsed = time.perf_counter() - start
+        return counter[0], elapsed, len(pairs)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000], help="answers per task")
+    parser.add_argument("--rounds", nargs="+", default=list(RESPONSE_MODELS), choices=list(RESPONSE_MODELS))
+    args = parser.parse_args()
+
+    print(f"{'round':<11}{'answers':>8}{'lazy q':>8}{'lazy ms':>9}{'joined q':>10}{'joined ms':>11}")
+    joined_counts = set()
+
+    for round_type in args.rounds:
+        for size in args.sizes:
+            engine = make_engine()
+            Base.metadata.create_all(engine)
+            Session = sessionmaker(bind=engine)
+
+            task_id = f"bench-{round_type}-{size}"
+            seed = Session()
+            seed_task(seed, round_type, task_id, size)
+            seed.close()
+
+            lazy_q, lazy_t, lazy_n = measure(engine, Session, load_lazily, round_type, task_id)
+            joined_q, joined_t, joined_n = measure(engine, Session, load_joined, round_type, task_id)
+            assert lazy_n == joined_n == size
+
+            joined_counts.add(joined_q)
+            print(
+                f"{round_type:<11}{size:>8}{lazy_q:>8}{lazy_t * 1000:>9.1f}"
+                f"{joined_q:>10}{joined_t * 1000:>11.1f}"
+            )
+            engine.dispose()
+
+    if len(joined_counts) != 1:
+        raise SystemExit(f"❌ Joined loader query count varies with answer count: {sorted(joined_counts)}")
+    print(f"\n✅ Joined loader uses {joined_counts.pop()} query(ies) regardless of answer count")
+
+
+if __name__ == "__main__":
+    main()
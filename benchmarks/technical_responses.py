@@ -0,0 +1,89 @@
+"""
+Times GET /technical-round/responses/{task_id} on tasks with up to 10k answers,
+counting SQL round-trips per call.
+
+All tasks share one in-memory SQLite database (aiosqlite), so every lookup
+also has to skip the other tasks' rows.
+
+Usage:
+    python -m benchmarks.technical_responses
+    python -m benchmarks.technical_responses --sizes 1000 5000 10000 --repeat 5
+"""
+import time
+import asyncio
+import argparse
+
+from sqlalchemy import insert, select, func
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models import Base, UserTask, TechnicalRound, TechnicalRoundResponse
+from routers.technical_round import get_technical_responses
+from benchmarks.response_queries import count_queries
+
+
+async def seed(engine, sizes: list[int]) -> None:
+    """
+    Bulk-inserts one question per answer for every task size.
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+        for size in sizes:
+            task_id = f"bench-{size}"
+            await conn.execute(insert(UserTask), [{"u_id": "bench", "type": "technical", "task_id": task_id}])
+
+            first_id = (await conn.execute(select(func.coalesce(func.max(TechnicalRound.id), 0)))).scalar() + 1
+            await conn.execute(insert(TechnicalRound), [
+                {"question": f"Q{i}", "answer": f"A{i}", "skill": "python", "difficulty": "easy"}
+                for i in range(size)
+            ])
+            await conn.execute(insert(TechnicalRoundResponse), [
+                {"task_id": task_id, "question_id": first_id + i, "transcript": f"answer {i}", "skill": "python"}
+                for i in range(size)
+            ])
+
+
+async def run(sizes: list[int], repeat: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+
+    start = time.perf_counter()
+    await seed(engine, sizes)
+    print(f"Seeded {sum(sizes)} responses in {time.perf_counter() - start:.1f}s\n")
+
+    print(f"{'answers':>8}{'queries':>9}{'best ms':>10}{'us/row':>9}")
+    query_counts = set()
+
+    for size in sizes:
+        best = float("inf")
+        for _ in range(repeat):
+            async with Session() as db:
+                with count_queries(engine.sync_engine) as counter:
+                    start = time.perf_counter()
+                    rows = await get_technical_responses(f"bench-{size}", db)
+                    best = min(best, time.perf_counter() - start)
+
+            assert len(rows) == size and rows[0]["correct_answer"] is not None
+            query_counts.add(counter[0])
+
+        print(f"{size:>8}{counter[0]:>9}{best * 1000:>10.1f}{best * 1e6 / size:>9.1f}")
+
+    await engine.dispose()
+
+    if len(query_counts) != 1:
+        raise SystemExit(f"❌ Query count varies with answer count: {sorted(query_counts)}")
+    print(f"\n✅ {query_counts.pop()} query(ies) per request regardless of answer count")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 2500, 5000, 10000], help="answers per task")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size (best is reported)")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.sizes, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
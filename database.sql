@@ -42,6 +42,17 @@ CREATE TABLE technical_round (
     difficulty VARCHAR(50)
 );
 
+-- Exact skill lookups (lower(skill) IN (...))
+CREATE INDEX idx_technical_round_skill_lower ON technical_round (lower(skill));
+
+-- Partial skill lookups (lower(skill) LIKE '%...%')
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX idx_technical_round_skill_trgm ON technical_round USING GIN (lower(skill) gin_trgm_ops);
+
+-- One row per normalised question text (and skill); used by the bulk importer's upsert
+CREATE UNIQUE INDEX uq_technical_round_question
+    ON technical_round ((lower(regexp_replace(btrim(question), '\s+', ' ', 'g'))), (lower(coalesce(skill, ''))));
+
 -- =====================================================
 -- HR ROUND QUESTIONS
 -- =====================================================
@@ -50,6 +61,9 @@ CREATE TABLE hr_round (
     question_text TEXT NOT NULL
 );
 
+CREATE UNIQUE INDEX uq_hr_round_question
+    ON hr_round ((lower(regexp_replace(btrim(question_text), '\s+', ' ', 'g'))));
+
 -- =====================================================
 -- CULTURAL FIT QUESTIONS
 -- =====================================================
@@ -58,6 +72,9 @@ CREATE TABLE cultural_fit (
     question_text TEXT NOT NULL
 );
 
+CREATE UNIQUE INDEX uq_cultural_fit_question
+    ON cultural_fit ((lower(regexp_replace(btrim(question_text), '\s+', ' ', 'g'))));
+
 -- =====================================================
 -- TECHNICAL RESPONSES
 -- =====================================================
@@ -115,6 +132,127 @@ CREATE TABLE cultural_round_response (
 );
 
 
+-- Responses are always read per task (reports, /responses routes)
+CREATE INDEX idx_technical_round_response_task ON technical_round_response (task_id, question_id);
+CREATE INDEX idx_hr_round_response_task ON hr_round_response (task_id, question_id);
+CREATE INDEX idx_cultural_round_response_task ON cultural_round_response (task_id, question_id);
+
+
+-- =====================================================
+-- BACKGROUND JOBS (transcription / report queue)
+-- =====================================================
+CREATE TABLE background_jobs (
+    id VARCHAR(36) PRIMARY KEY,
+    kind VARCHAR(50) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    dedup_key VARCHAR(255) UNIQUE,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_background_jobs_queue ON background_jobs (kind, status, created_at);
+
+
+-- =====================================================
+-- TRANSCRIPT CACHE (sha256 of audio + STT settings)
+-- =====================================================
+CREATE TABLE transcript_cache (
+    cache_key VARCHAR(64) PRIMARY KEY,
+    transcript TEXT NOT NULL,
+    audio_url TEXT,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+
+
+-- =====================================================
+-- LLM RESPONSE CACHE (sha256 of model + prompt version + config + QA)
+-- =====================================================
+CREATE TABLE llm_cache (
+    cache_key VARCHAR(64) PRIMARY KEY,
+    model VARCHAR(100) NOT NULL,
+    response TEXT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX idx_llm_cache_expires ON llm_cache (expires_at);
+
+
+-- =====================================================
+-- QUESTION BANK VERSION (invalidates the in-process question cache)
+-- =====================================================
+CREATE TABLE question_bank_version (
+    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO question_bank_version (id, version) VALUES (1, 0);
+
+-- Any change to a question table bumps the version and notifies listening app servers
+CREATE OR REPLACE FUNCTION bump_question_bank_version() RETURNS TRIGGER AS $$
+DECLARE
+    new_version BIGINT;
+BEGIN
+    UPDATE question_bank_version SET version = version + 1 WHERE id = 1
+    RETURNING version INTO new_version;
+    PERFORM pg_notify('question_bank', new_version::TEXT);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_technical_round_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON technical_round
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_question_bank_version();
+
+CREATE TRIGGER trg_hr_round_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON hr_round
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_question_bank_version();
+
+CREATE TRIGGER trg_cultural_fit_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON cultural_fit
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_question_bank_version();
+
+
+-- =====================================================
+-- QUESTIONS ISSUED PER TASK (drives automatic report builds)
+-- =====================================================
+CREATE TABLE task_questions (
+    task_id VARCHAR NOT NULL,
+    round_type VARCHAR(20) NOT NULL,
+    question_id INTEGER NOT NULL,
+    issued_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (task_id, round_type, question_id)
+);
+
+
+-- =====================================================
+-- GENERATED REPORTS (read path cache in front of GCS)
+-- =====================================================
+CREATE TABLE interview_reports (
+    task_id VARCHAR NOT NULL,
+    round_type VARCHAR(20) NOT NULL,
+    content TEXT NOT NULL,
+    sections TEXT,
+    etag VARCHAR(64) NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL,
+    -- Scores of structured (REPORT_OUTPUT_FORMAT=json) reports
+    technical_score INTEGER,
+    grammar_score INTEGER,
+    confidence VARCHAR(10),
+    communication_score INTEGER,
+    teamwork_score INTEGER,
+    culture_alignment_score INTEGER,
+    recommendation TEXT,
+    PRIMARY KEY (task_id, round_type)
+);
+
+CREATE INDEX idx_interview_reports_technical_score ON interview_reports (round_type, technical_score);
+CREATE INDEX idx_interview_reports_culture_score ON interview_reports (round_type, culture_alignment_score);
+
+
 -- =====================================================
 -- OPTIONAL: RELATIONSHIPS (not enforced, but logical)
 -- =====================================================
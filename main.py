@@ -6,6 +6,12 @@ import vertexai
 import os
 
 from routers import users, hr_round, technical_round, cultural_fit, upload, reports, tasks
+from services.job_queue import register_handler, start_workers, stop_workers
+from services.transcription import TRANSCRIPTION_JOB, run_transcription_job
+from services.report_generation import REPORT_JOB, REPORT_JOB_WORKERS, run_report_job
+from services.question_bank import start_question_bank_watcher, stop_question_bank_watcher
+from services.audio_processing import llm_executor
+from services.llm_cache import get_llm_cache
 
 load_dotenv()
 
@@ -35,6 +41,47 @@ app.include_router(reports.router, prefix="/reports", tags=["Reports"])
 app.include_router(tasks.router, prefix="/tasks", tags=["Tasks"])
 
 
+# ✅ Background job workers (DB-backed queue)
+register_handler(TRANSCRIPTION_JOB, run_transcription_job)
+register_handler(REPORT_JOB, run_report_job)
+
+
+@app.on_event("startup")
+def start_job_workers():
+    start_workers([TRANSCRIPTION_JOB])
+    # Separate, bounded pool so slow Gemini calls never starve transcriptions
+    start_workers([REPORT_JOB], count=REPORT_JOB_WORKERS)
+
+
+@app.on_event("shutdown")
+def stop_job_workers():
+    stop_workers()
+
+
+# ✅ In-process question bank (reloaded when question_bank_version changes)
+@app.on_event("startup")
+def load_question_bank():
+    start_question_bank_watcher()
+
+
+@app.on_event("shutdown")
+def stop_question_bank():
+    stop_question_bank_watcher()
+
+
+# ✅ Gemini executor (bounded concurrency; see LLM_MAX_CONCURRENCY)
+@app.on_event("shutdown")
+def stop_llm_executor():
+    llm_executor.stop()
+
+
+@app.get("/llm/stats")
+async def llm_stats():
+    """Gemini calls in flight, queue depth, retry / timeout / failure counters and cache hits."""
+    cache = get_llm_cache()
+    return {**llm_executor.stats(), "cache": cache.stats() if cache else None}
+
+
 @app.get("/")
 async def root():
     return {"message": "Backend API is running successfully 🚀"}
@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Column, Integer, String, Text, ForeignKey, DateTime, func
+    Column, Integer, BigInteger, String, Text, ForeignKey, DateTime, Index, func
 )
 from sqlalchemy.orm import declarative_base, relationship
 
@@ -62,6 +62,24 @@ class TechnicalRound(Base):
     responses = relationship("TechnicalRoundResponse", back_populates="question")
 
 
+# Exact skill lookups; the pg_trgm index for partial matches lives in database.sql
+Index("idx_technical_round_skill_lower", func.lower(TechnicalRound.skill))
+
+
+def _normalized_question(column):
+    # Same expression as PG_TEXT_KEY in services/question_io.py (the importer's ON CONFLICT target)
+    return func.lower(func.regexp_replace(func.btrim(column), r"\s+", " ", "g"))
+
+
+# One row per normalised question text (and skill); Postgres only, like the importer's upsert
+Index(
+    "uq_technical_round_question",
+    _normalized_question(TechnicalRound.question),
+    func.lower(func.coalesce(TechnicalRound.skill, "")),
+    unique=True
+).ddl_if(dialect="postgresql")
+
+
 # ============================================================
 # HR ROUND QUESTIONS
 # ============================================================
@@ -74,6 +92,9 @@ class HrRound(Base):
     responses = relationship("HrRoundResponse", back_populates="question")
 
 
+Index("uq_hr_round_question", _normalized_question(HrRound.question_text), unique=True).ddl_if(dialect="postgresql")
+
+
 # ============================================================
 # CULTURAL FIT QUESTIONS
 # ============================================================
@@ -86,11 +107,15 @@ class CulturalFit(Base):
     responses = relationship("CulturalRoundResponse", back_populates="question")
 
 
+Index("uq_cultural_fit_question", _normalized_question(CulturalFit.question_text), unique=True).ddl_if(dialect="postgresql")
+
+
 # ============================================================
 # TECHNICAL ROUND RESPONSES
 # ============================================================
 class TechnicalRoundResponse(Base):
     __tablename__ = "technical_round_response"
+    __table_args__ = (Index("idx_technical_round_response_task", "task_id", "question_id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     task_id = Column(String, ForeignKey("user_tasks.task_id", ondelete="CASCADE"), nullable=False)
@@ -107,6 +132,7 @@ class TechnicalRoundResponse(Base):
 # ============================================================
 class HrRoundResponse(Base):
     __tablename__ = "hr_round_response"
+    __table_args__ = (Index("idx_hr_round_response_task", "task_id", "question_id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     task_id = Column(String, ForeignKey("user_tasks.task_id", ondelete="CASCADE"), nullable=False)
@@ -122,6 +148,7 @@ class HrRoundResponse(Base):
 # ============================================================
 class CulturalRoundResponse(Base):
     __tablename__ = "cultural_round_response"
+    __table_args__ = (Index("idx_cultural_round_response_task", "task_id", "question_id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     task_id = Column(String, ForeignKey("user_tasks.task_id", ondelete="CASCADE"), nullable=False)
@@ -130,3 +157,95 @@ class CulturalRoundResponse(Base):
 
     user_task = relationship("UserTask", back_populates="cultural_responses")
     question = relationship("CulturalFit", back_populates="responses")
+
+
+# ============================================================
+# BACKGROUND JOBS (DB-backed queue, no external broker)
+# ============================================================
+class BackgroundJob(Base):
+    __tablename__ = "background_jobs"
+
+    id = Column(String(36), primary_key=True)
+    kind = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False, default="queued", index=True)
+    dedup_key = Column(String(255), nullable=True, unique=True)
+    payload = Column(Text, nullable=False)
+    result = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+# ============================================================
+# TRANSCRIPT CACHE (keyed by audio hash + STT settings)
+# ============================================================
+class TranscriptCacheEntry(Base):
+    __tablename__ = "transcript_cache"
+
+    cache_key = Column(String(64), primary_key=True)
+    transcript = Column(Text, nullable=False)
+    audio_url = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+# ============================================================
+# LLM RESPONSE CACHE (persistent tier of services/llm_cache.py)
+# ============================================================
+class LlmCacheEntry(Base):
+    __tablename__ = "llm_cache"
+
+    cache_key = Column(String(64), primary_key=True)
+    model = Column(String(100), nullable=False)
+    response = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+
+# ============================================================
+# QUESTION BANK VERSION (single row, bumped on question changes)
+# ============================================================
+class QuestionBankVersion(Base):
+    __tablename__ = "question_bank_version"
+
+    id = Column(Integer, primary_key=True, default=1)
+    version = Column(BigInteger, nullable=False, default=0)
+
+
+# ============================================================
+# QUESTIONS ISSUED PER TASK (expected answers for a round)
+# ============================================================
+class TaskQuestion(Base):
+    __tablename__ = "task_questions"
+
+    task_id = Column(String, primary_key=True)
+    round_type = Column(String(20), primary_key=True)
+    question_id = Column(Integer, primary_key=True)
+    issued_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+# ============================================================
+# GENERATED REPORTS (served before falling back to GCS)
+# ============================================================
+class InterviewReport(Base):
+    __tablename__ = "interview_reports"
+
+    task_id = Column(String, primary_key=True)
+    round_type = Column(String(20), primary_key=True)
+    content = Column(Text, nullable=False)
+    sections = Column(Text, nullable=True)
+    etag = Column(String(64), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+
+    # Filled from structured (JSON mode) reports, for ranking and dashboards
+    technical_score = Column(Integer, nullable=True)
+    grammar_score = Column(Integer, nullable=True)
+    confidence = Column(String(10), nullable=True)
+    communication_score = Column(Integer, nullable=True)
+    teamwork_score = Column(Integer, nullable=True)
+    culture_alignment_score = Column(Integer, nullable=True)
+    recommendation = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("idx_interview_reports_technical_score", "round_type", "technical_score"),
+        Index("idx_interview_reports_culture_score", "round_type", "culture_alignment_score"),
+    )
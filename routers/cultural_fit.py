@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database import get_db
-from models import CulturalFit, CulturalRoundResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
+from models import CulturalFit
+from services.response_queries import load_responses_with_questions
+from services.question_bank import QUESTION_BANK_CACHE, aget_question_bank
 from schemas import CulturalQuestion, CulturalResponse as CulturalResponseSchema
 from typing import List
 
@@ -9,16 +12,23 @@ router = APIRouter()
 
 
 @router.get("/questions", response_model=List[CulturalQuestion])
-def get_cultural_questions(db: Session = Depends(get_db)):
-    questions = db.query(CulturalFit).order_by(CulturalFit.id).all()
+async def get_cultural_questions(db: AsyncSession = Depends(get_async_db)):
+    if QUESTION_BANK_CACHE:
+        questions = [q._asdict() for q in (await aget_question_bank()).cultural]
+    else:
+        result = await db.execute(select(CulturalFit).order_by(CulturalFit.id))
+        questions = result.scalars().all()
     if not questions:
         raise HTTPException(status_code=404, detail="No cultural fit questions found")
     return questions
 
 
 @router.get("/responses/{task_id}", response_model=List[CulturalResponseSchema])
-def get_cultural_responses(task_id: str, db: Session = Depends(get_db)):
-    responses = db.query(CulturalRoundResponse).filter(CulturalRoundResponse.task_id == task_id).all()
+async def get_cultural_responses(task_id: str, db: AsyncSession = Depends(get_async_db)):
+    responses = await load_responses_with_questions(db, "cultural", task_id)
     if not responses:
         raise HTTPException(status_code=404, detail="No cultural fit responses found")
-    return responses
+    return [
+        {"task_id": r.task_id, "question": r.question.question_text, "transcript": r.transcript}
+        for r in responses
+    ]
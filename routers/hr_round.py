@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database import get_db
-from models import HrRound, HrRoundResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
+from models import HrRound
+from services.response_queries import load_responses_with_questions
+from services.question_bank import QUESTION_BANK_CACHE, aget_question_bank
 from schemas import HRQuestion, HRResponse
 from typing import List
 
@@ -9,16 +12,23 @@ router = APIRouter()
 
 
 @router.get("/questions", response_model=List[HRQuestion])
-def get_hr_questions(db: Session = Depends(get_db)):
-    questions = db.query(HrRound).order_by(HrRound.id).all()
+async def get_hr_questions(db: AsyncSession = Depends(get_async_db)):
+    if QUESTION_BANK_CACHE:
+        questions = [q._asdict() for q in (await aget_question_bank()).hr]
+    else:
+        result = await db.execute(select(HrRound).order_by(HrRound.id))
+        questions = result.scalars().all()
     if not questions:
         raise HTTPException(status_code=404, detail="No HR questions found")
     return questions
 
 
 @router.get("/responses/{task_id}", response_model=List[HRResponse])
-def get_hr_responses(task_id: str, db: Session = Depends(get_db)):
-    responses = db.query(HrRoundResponse).filter(HrRoundResponse.task_id == task_id).all()
+async def get_hr_responses(task_id: str, db: AsyncSession = Depends(get_async_db)):
+    responses = await load_responses_with_questions(db, "hr", task_id)
     if not responses:
         raise HTTPException(status_code=404, detail="No HR responses found")
-    return responses
+    return [
+        {"task_id": r.task_id, "question_text": r.question.question_text, "transcript": r.transcript}
+        for r in responses
+    ]
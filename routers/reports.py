@@ -1,165 +1,200 @@
-from fastapi import APIRouter, Form, Depends, HTTPException
-from sqlalchemy.orm import Session
-from fastapi.responses import JSONResponse
-from database import get_db
-from services.gcp_helper import upload_to_gcp_bucket, bucket_name, read_text_from_gcp_bucket
-from services.audio_processing import (
-    generate_hr_report_with_gemini,
-    generate_technical_report_with_gemini,
-    generate_cultural_report_with_gemini
+from fastapi import APIRouter, Form, Depends, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from database import get_async_db
+from services.gcp_helper import read_text_from_gcp_bucket
+from services.response_queries import load_responses_with_questions, build_qa_pairs
+from services.report_generation import (
+    REPORT_ROUNDS, REPORT_JOB_MODE,
+    generate_report, astream_report, aschedule_report, report_bucket_path, report_url, report_dedup_key
 )
-from models import HrRoundResponse, TechnicalRoundResponse, CulturalRoundResponse
-import os
+from services.report_store import (
+    aget_stored_report, astore_report, report_etag, report_last_modified, is_not_modified, report_scores
+)
+from services.job_queue import JOB_QUEUED, JOB_RUNNING, JOB_FAILED, aget_job_by_key
+from typing import Optional
+import json
+import logging
 
 router = APIRouter()
 
 
+async def _create_report(round_type: str, task_id: str, async_mode: Optional[bool], force_refresh: bool, db: AsyncSession):
+    """
+    Builds the report inline, or queues it and returns 202 in job mode.
+    force_refresh asks Gemini again instead of reusing a cached answer.
+    """
+    responses = await load_responses_with_questions(db, round_type, task_id)
+    if not responses:
+        raise HTTPException(status_code=404, detail=f"No {REPORT_ROUNDS[round_type]['label']} data found")
+
+    use_job_queue = REPORT_JOB_MODE if async_mode is None else async_mode
+    if use_job_queue:
+        job = await aschedule_report(db, round_type, task_id, force_refresh)
+        return JSONResponse(status_code=202, content={
+            "task_id": task_id,
+            "job_id": job.id,
+            "status": "pending",
+            "status_url": f"/reports/{round_type}/{task_id}"
+        })
+
+    qa_pairs = build_qa_pairs(round_type, responses)
+    try:
+        result = await run_in_threadpool(generate_report, round_type, task_id, qa_pairs, force_refresh)
+    except Exception as e:
+        # Nothing is saved, so a previously stored report stays in place
+        logging.error(f"❌ {REPORT_ROUNDS[round_type]['label']} report for {task_id} failed: {e}")
+        raise HTTPException(status_code=502, detail=f"Report generation failed: {e}")
+    return JSONResponse(result)
+
+
 # =====================================================
 # HR REPORT
 # =====================================================
 @router.post("/hr")
-def generate_hr_report(task_id: str = Form(...), db: Session = Depends(get_db)):
-    responses = db.query(HrRoundResponse).filter(HrRoundResponse.task_id == task_id).all()
-    if not responses:
-        raise HTTPException(status_code=404, detail="No HR data found")
-
-    qa_pairs = [
-        {"question": r.question.question_text, "transcript": r.transcript}
-        for r in responses
-    ]
-
-    report = generate_hr_report_with_gemini(qa_pairs)
-
-    os.makedirs("Reports", exist_ok=True)
-    local_path = f"Reports/{task_id}_hr.txt"
-    with open(local_path, "w") as f:
-        f.write(report)
-
-    bucket_path = f"reports/{task_id}_hr.txt"
-    upload_to_gcp_bucket(local_path, bucket_path)
-
-    # OPTIONAL: delete local copy
-    # os.remove(local_path)
-
-    url = f"https://storage.googleapis.com/{bucket_name}/{bucket_path}"
-
-    return JSONResponse({"task_id": task_id, "report_url": url, "message": "HR report generated"})
+async def generate_hr_report(
+    task_id: str = Form(...),
+    async_mode: Optional[bool] = Form(None),
+    force_refresh: bool = Form(False),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await _create_report("hr", task_id, async_mode, force_refresh, db)
 
 
 # =====================================================
 # TECHNICAL REPORT
 # =====================================================
 @router.post("/technical")
-def generate_technical_report(task_id: str = Form(...), db: Session = Depends(get_db)):
-    responses = db.query(TechnicalRoundResponse).filter(TechnicalRoundResponse.task_id == task_id).all()
-    if not responses:
-        raise HTTPException(status_code=404, detail="No technical data found")
-
-    qa_pairs = [
-        {
-            "question": r.question.question,
-            "transcript": r.transcript,
-            "correct_answer": r.question.answer
-        }
-        for r in responses
-    ]
-
-    report = generate_technical_report_with_gemini(qa_pairs)
-
-    os.makedirs("Reports", exist_ok=True)
-    local_path = f"Reports/{task_id}_technical.txt"
-    with open(local_path, "w") as f:
-        f.write(report)
-
-    bucket_path = f"reports/{task_id}_technical.txt"
-    upload_to_gcp_bucket(local_path, bucket_path)
-
-    # OPTIONAL: delete local copy
-    # os.remove(local_path)
-
-    url = f"https://storage.googleapis.com/{bucket_name}/{bucket_path}"
-
-    return JSONResponse({"task_id": task_id, "report_url": url, "message": "Technical report generated"})
+async def generate_technical_report(
+    task_id: str = Form(...),
+    async_mode: Optional[bool] = Form(None),
+    force_refresh: bool = Form(False),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await _create_report("technical", task_id, async_mode, force_refresh, db)
 
 
 # =====================================================
 # CULTURAL REPORT
 # =====================================================
 @router.post("/cultural")
-def generate_cultural_report(task_id: str = Form(...), db: Session = Depends(get_db)):
-    responses = db.query(CulturalRoundResponse).filter(CulturalRoundResponse.task_id == task_id).all()
-    if not responses:
-        raise HTTPException(status_code=404, detail="No cultural data found")
-
-    qa_pairs = [
-        {"question": r.question.question_text, "transcript": r.transcript}
-        for r in responses
-    ]
-
-    report = generate_cultural_report_with_gemini(qa_pairs)
-
-    os.makedirs("Reports", exist_ok=True)
-    local_path = f"Reports/{task_id}_cultural.txt"
-    with open(local_path, "w") as f:
-        f.write(report)
+async def generate_cultural_report(
+    task_id: str = Form(...),
+    async_mode: Optional[bool] = Form(None),
+    force_refresh: bool = Form(False),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await _create_report("cultural", task_id, async_mode, force_refresh, db)
 
-    bucket_path = f"reports/{task_id}_cultural.txt"
-    upload_to_gcp_bucket(local_path, bucket_path)
 
-    # OPTIONAL: delete local copy
-    # os.remove(local_path)
-
-    url = f"https://storage.googleapis.com/{bucket_name}/{bucket_path}"
-
-    return JSONResponse({"task_id": task_id, "report_url": url, "message": "Cultural report generated"})
-
-
-# ------------ GET HR REPORT ------------
-@router.get("/hr/{task_id}")
-def get_hr_report(task_id: str):
-    bucket_path = f"reports/{task_id}_hr.txt"
-
-    try:
-        text = read_text_from_gcp_bucket(bucket_path)
-        url = f"https://storage.googleapis.com/{bucket_name}/{bucket_path}"
-
-        return {"task_id": task_id, "report_url": url, "content": text}
-
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="HR report not found")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-# ------------ GET TECHNICAL REPORT ------------
-@router.get("/technical/{task_id}")
-def get_tech_report(task_id: str):
-    bucket_path = f"reports/{task_id}_technical.txt"
-
-    try:
-        text = read_text_from_gcp_bucket(bucket_path)
-        url = f"https://storage.googleapis.com/{bucket_name}/{bucket_path}"
-
-        return {"task_id": task_id, "report_url": url, "content": text}
-
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Technical report not found")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-# ------------ GET CULTURAL REPORT ------------
-@router.get("/cultural/{task_id}")
-def get_cultural_report(task_id: str):
-    bucket_path = f"reports/{task_id}_cultural.txt"
-
-    try:
-        text = read_text_from_gcp_bucket(bucket_path)
-        url = f"https://storage.googleapis.com/{bucket_name}/{bucket_path}"
-
-        return {"task_id": task_id, "report_url": url, "content": text}
-
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Cultural report not found")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+# =====================================================
+# STREAMING REPORT (Server-Sent Events)
+# =====================================================
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/{round_type}/stream")
+async def stream_report(
+    round_type: str,
+    task_id: str = Form(...),
+    force_refresh: bool = Form(False),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Streams the report as it is written: "chunk" events carry text, then a
+    "done" event with the report URL once it is saved to Reports/, GCS and the
+    report store (or an "error" event).
+    """
+    if round_type not in REPORT_ROUNDS:
+        raise HTTPException(status_code=404, detail="Unknown report type")
+
+    responses = await load_responses_with_questions(db, round_type, task_id)
+    if not responses:
+        raise HTTPException(status_code=404, detail=f"No {REPORT_ROUNDS[round_type]['label']} data found")
+    qa_pairs = build_qa_pairs(round_type, responses)
+
+    async def events():
+        try:
+            async for chunk in astream_report(round_type, task_id, qa_pairs, force_refresh):
+                yield _sse("chunk", {"text": chunk})
+        except Exception as e:
+            logging.error(f"❌ Streaming {round_type} report for {task_id} failed: {e}")
+            yield _sse("error", {"detail": str(e)})
+            return
+
+        yield _sse("done", {
+            "task_id": task_id,
+            "report_url": report_url(round_type, task_id),
+            "message": f"{REPORT_ROUNDS[round_type]['label']} report generated"
+        })
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+
+
+# ------------ GET REPORT (hr / technical / cultural) ------------
+@router.get("/{round_type}/{task_id}")
+async def get_report(
+    round_type: str,
+    task_id: str,
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Returns the stored report ("ready"), or the state of its background build
+    ("pending" with 202, or "failed") while there is no report yet. Ready reports
+    come from the report store, fall back to GCS, and honour If-None-Match /
+    If-Modified-Since with 304. A regenerate in progress or failed is listed
+    under "refresh" next to the report it would replace.
+    """
+    if round_type not in REPORT_ROUNDS:
+        raise HTTPException(status_code=404, detail="Unknown report type")
+    label = REPORT_ROUNDS[round_type]["label"]
+
+    job = await aget_job_by_key(db, report_dedup_key(round_type, task_id))
+    if job and job.status not in (JOB_QUEUED, JOB_RUNNING, JOB_FAILED):
+        job = None
+
+    record = await aget_stored_report(db, round_type, task_id)
+    if record is None:
+        if job and job.status != JOB_FAILED:
+            # The job writes the store when it finishes; no GCS lookup per poll
+            return JSONResponse(status_code=202, content={"task_id": task_id, "job_id": job.id, "status": "pending"})
+        try:
+            text = await run_in_threadpool(read_text_from_gcp_bucket, report_bucket_path(round_type, task_id))
+        except FileNotFoundError:
+            if job:
+                return {"task_id": task_id, "job_id": job.id, "status": "failed", "error": job.error}
+            raise HTTPException(status_code=404, detail=f"{label} report not found")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+        # Reports generated before the store existed are backfilled on first view
+        record = await astore_report(db, round_type, task_id, text)
+
+    headers = {
+        "ETag": report_etag(record),
+        "Last-Modified": report_last_modified(record),
+        "Cache-Control": "private, no-cache"
+    }
+    if is_not_modified(record, if_none_match, if_modified_since):
+        return Response(status_code=304, headers=headers)
+
+    return JSONResponse(headers=headers, content={
+        "task_id": task_id,
+        "report_url": report_url(round_type, task_id),
+        "status": "ready",
+        "content": record.content,
+        "sections": json.loads(record.sections) if record.sections else None,
+        "scores": report_scores(record),
+        "refresh": {
+            "job_id": job.id,
+            "status": "failed" if job.status == JOB_FAILED else "pending",
+            "error": job.error
+        } if job else None
+    })
@@ -1,14 +1,14 @@
 from datetime import datetime
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
 from models import UserTask
 from schemas import UserTaskCreate, UserTaskResponse
 
 router = APIRouter()
 
 @router.post("/generate_task", response_model=UserTaskResponse)
-def generate_single_task(request: UserTaskCreate, db: Session = Depends(get_db)):
+async def generate_single_task(request: UserTaskCreate, db: AsyncSession = Depends(get_async_db)):
 
     # Generate unique timestamp part
     unique_part = datetime.utcnow().strftime("%Y-%m-%d-%H-%M")
@@ -24,7 +24,7 @@ def generate_single_task(request: UserTaskCreate, db: Session = Depends(get_db))
     )
 
     db.add(new_task)
-    db.commit()
-    db.refresh(new_task)
+    await db.commit()
+    await db.refresh(new_task)
 
     return new_task
@@ -1,73 +1,165 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database import get_db
-from models import TechnicalRound, TechnicalRoundResponse
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, func, or_, false, case, cast, BigInteger
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
+from models import TechnicalRound
+from services.response_queries import load_responses_with_questions
+from services.question_bank import QUESTION_BANK_CACHE, aget_question_bank
+from services.interview_progress import arecord_issued_questions
+from services.question_sampling import (
+    QUESTION_DIFFICULTY_MIX, parse_difficulty_mix, allocate_counts, sample_questions, task_seed
+)
 from schemas import TechnicalQuestion, TechnicalResponse as TechnicalResponseSchema
-from typing import List
+from typing import List, Optional
 import random
 
 router = APIRouter()
 
+# Modulus of the keyed hash that orders questions for a seeded selection (2^31 - 1, prime)
+SAMPLE_HASH_PRIME = 2147483647
 
-@router.get("/questions/{skill}", response_model=List[TechnicalQuestion])
-def get_technical_questions(skill: str, db: Session = Depends(get_db)):
-    skills = [s.strip().lower() for s in skill.split(",")]
-    all_questions = []
 
-    for s in skills:
-        qset = db.query(TechnicalRound).filter(TechnicalRound.skill.ilike(s)).all()
-        all_questions.extend(qset)
+def parse_skills(skill: str) -> list[str]:
+    # Example: "python,react" → ["python", "react"]
+    return [s.strip().lower() for s in skill.split(",") if s.strip()]
+
+
+def skill_filter(skills: list[str], partial: bool):
+    """
+    One predicate for all skills. Exact matches use the lower(skill) btree index,
+    partial matches the pg_trgm GIN index (see database.sql).
+    """
+    skill_column = func.lower(TechnicalRound.skill)
+    if not partial:
+        return skill_column.in_(skills)
+    return or_(false(), *[skill_column.contains(s, autoescape=True) for s in skills])
+
+
+def sample_order(seed: Optional[str]):
+    """
+    Random order for sampling in SQL. With a seed it is a keyed hash of the id,
+    (a * id + b) mod p, so the same task gets the same questions while the bank is unchanged.
+    """
+    if seed is None:
+        return func.random()
+    rng = random.Random(seed)
+    a, b = rng.randrange(1, SAMPLE_HASH_PRIME), rng.randrange(SAMPLE_HASH_PRIME)
+    return (cast(TechnicalRound.id, BigInteger) * a + b) % SAMPLE_HASH_PRIME
+
+
+async def sample_questions_from_db(
+    db: AsyncSession, skills: list[str], n: int, mix: dict[str, float], seed: Optional[str]
+) -> list[TechnicalRound]:
+    """
+    Samples up to n matching questions in the database: ORDER BY random LIMIT n, or
+    with a mix, the first k rows of each difficulty by a window query (after one
+    GROUP BY count per difficulty to size k). Only the selected rows are returned.
+    """
+    match = skill_filter(skills, partial=True)
+    order = sample_order(seed)
+
+    if not mix:
+        query = select(TechnicalRound).where(match).order_by(order, TechnicalRound.id).limit(n)
+    else:
+        difficulty = func.lower(func.trim(func.coalesce(TechnicalRound.difficulty, "")))
+        result = await db.execute(select(difficulty, func.count()).where(match).group_by(difficulty))
+        counts = {d: k for d, k in allocate_counts(n, mix, dict(result.all())).items() if k}
+        if not counts:
+            return []
+
+        ranked = (
+            select(
+                TechnicalRound.id,
+                difficulty.label("difficulty"),
+                func.row_number().over(partition_by=difficulty, order_by=(order, TechnicalRound.id)).label("rank")
+            )
+            .where(match)
+            .subquery()
+        )
+        quota = case(counts, value=ranked.c.difficulty, else_=0)
+        query = select(TechnicalRound).join(ranked, ranked.c.id == TechnicalRound.id).where(ranked.c.rank <= quota)
+
+    questions = sorted((await db.execute(query)).scalars().all(), key=lambda q: q.id)
+    random.Random(seed).shuffle(questions)
+    return questions
+
+
+@router.get("/questions/{skill}", response_model=List[TechnicalQuestion])
+async def get_technical_questions(skill: str, db: AsyncSession = Depends(get_async_db)):
+    skills = parse_skills(skill)
+
+    if QUESTION_BANK_CACHE:
+        bank = await aget_question_bank()
+        all_questions = [q._asdict() for q in bank.technical_questions(skills, partial=False)]
+        random.shuffle(all_questions)
+    else:
+        result = await db.execute(
+            select(TechnicalRound)
+            .where(skill_filter(skills, partial=False))
+            .order_by(func.random())
+        )
+        all_questions = result.scalars().all()
 
     if not all_questions:
         raise HTTPException(status_code=404, detail="No questions found for the given skills")
 
-    random.shuffle(all_questions)
     return all_questions
 
 @router.get("/questions/{skill}/{numQuestions}", response_model=List[TechnicalQuestion])
-def get_technical_questions(skill: str, numQuestions: int, db: Session = Depends(get_db)):
-    
-    # Convert comma-separated skills → list
-    # Example: "python,react" → ["python", "react"]
-    skills = [s.strip().lower() for s in skill.split(",")]
-
-    all_questions = []
-
-    # Search each skill using ILIKE + wildcard (%)
-    for s in skills:
-        qset = db.query(TechnicalRound).filter(
-            TechnicalRound.skill.ilike(f"%{s}%")   # 🔥 partial + case-insensitive
-        ).all()
-
-        all_questions.extend(qset)
-
-    if not all_questions:
+async def get_technical_questions(
+    skill: str,
+    numQuestions: int,
+    difficulty_mix: Optional[str] = Query(None, description='e.g. "easy:40,medium:40,hard:20"'),
+    task_id: Optional[str] = Query(None, description="Same task_id → same questions"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    skills = parse_skills(skill)
+
+    mix_spec = difficulty_mix if difficulty_mix is not None else QUESTION_DIFFICULTY_MIX
+    try:
+        mix = parse_difficulty_mix(mix_spec)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid difficulty_mix: {e}")
+    seed = task_seed(task_id, skill, numQuestions, mix_spec) if task_id else None
+
+    if QUESTION_BANK_CACHE:
+        # Partial + case-insensitive match against the cached bank, stratified by difficulty
+        bank = await aget_question_bank()
+        selected_questions = [
+            q._asdict() for q in sample_questions(bank, skills, numQuestions, mix, seed)
+        ]
+    else:
+        # Partial + case-insensitive match on every skill; the database shuffles
+        # (per difficulty when stratified) and only returns the number requested
+        selected_questions = await sample_questions_from_db(db, skills, numQuestions, mix, seed)
+
+    if not selected_questions:
         raise HTTPException(
             status_code=404,
             detail="No questions found for the given skills."
         )
 
-    # Shuffle randomly
-    random.shuffle(all_questions)
-
-    # Only return the number requested
-    selected_questions = all_questions[:numQuestions]
+    if task_id:
+        # Expected answers for this task: its report is built once they are all in
+        question_ids = [q["id"] if isinstance(q, dict) else q.id for q in selected_questions]
+        await arecord_issued_questions(db, task_id, "technical", question_ids)
 
     return selected_questions
 
 @router.get("/responses/{task_id}", response_model=List[TechnicalResponseSchema])
-def get_technical_responses(task_id: str, db: Session = Depends(get_db)):
-    responses = db.query(TechnicalRoundResponse).filter(TechnicalRoundResponse.task_id == task_id).all()
+async def get_technical_responses(task_id: str, db: AsyncSession = Depends(get_async_db)):
+    # Responses and their questions (incl. the expected answer) in one JOIN
+    responses = await load_responses_with_questions(db, "technical", task_id)
     if not responses:
         raise HTTPException(status_code=404, detail="No responses found for this task")
 
-    result = []
-    for res in responses:
-        q = db.query(TechnicalRound).filter(TechnicalRound.question == res.question).first()
-        result.append({
-            "task_id": res.task_id,
-            "question": res.question,
-            "transcript": res.transcript,
-            "correct_answer": q.answer if q else "N/A"
-        })
-    return result
+    return [
+        {
+            "task_id": r.task_id,
+            "question": r.question.question,
+            "transcript": r.transcript,
+            "skill": r.skill,
+            "correct_answer": r.question.answer
+        }
+        for r in responses
+    ]
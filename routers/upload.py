@@ -1,13 +1,61 @@
-from fastapi import APIRouter, File, UploadFile, Form, HTTPException, Depends
-from services.audio_processing import extract_audio_from_compressed_video, transcribe_with_vertex_ai
-from services.gcp_helper import upload_to_gcp_bucket, bucket_name
-from database import get_db
-import os, shutil, uuid, logging
-from models import HrRoundResponse, TechnicalRoundResponse, CulturalRoundResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, File, UploadFile, Form, Header, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from services.transcription import (
+    ROUND_TYPES, UPLOAD_DIR, TRANSCRIPTION_JOB,
+    save_upload, transcribe_uploaded_video, transcribe_video_stream, astore_transcript,
+    transcribe_batch, build_batch_records, summarize_batch, batch_item_result,
+    derive_dedup_key, afind_existing_response, afind_answered_questions
+)
+from services.job_queue import (
+    JOB_DONE, JOB_FAILED, JOB_RUNNING,
+    acreate_job, aenqueue_job, arestart_job, afinish_job, aget_job, aget_job_by_key, wait_for_job, job_to_dict
+)
+from services.interview_progress import amaybe_schedule_report
+from database import get_async_db
+from schemas import JobStatusResponse
+import os, json, uuid, logging
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
 
+# When true, /transcribe enqueues a job and returns immediately (overridable per request)
+UPLOAD_JOB_MODE = os.getenv("UPLOAD_JOB_MODE", "false").lower() == "true"
+
+# When true, inline requests pipe the upload through ffmpeg into GCS without temp files
+UPLOAD_STREAMING = os.getenv("UPLOAD_STREAMING", "false").lower() == "true"
+
+# How long an inline retry waits for the original in-flight request before returning 202
+IDEMPOTENT_WAIT_SECONDS = float(os.getenv("IDEMPOTENT_WAIT_SECONDS", "600"))
+
+
+def _job_accepted(job, message: str) -> JSONResponse:
+    return JSONResponse(status_code=202, content={
+        "message": message,
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/upload/jobs/{job.id}"
+    })
+
+
+async def _respond_with_existing_job(db: AsyncSession, job, use_job_queue: bool):
+    """
+    A retry of a request we have already seen: return the stored result,
+    or join the in-flight job instead of redoing the pipeline.
+    """
+    if use_job_queue:
+        return _job_accepted(job, "Transcription already submitted")
+
+    if job.status != JOB_DONE:
+        job = await wait_for_job(db, job.id, IDEMPOTENT_WAIT_SECONDS)
+
+    if job.status == JOB_DONE:
+        return json.loads(job.result)
+    if job.status == JOB_FAILED:
+        raise HTTPException(status_code=500, detail=job.error)
+    return _job_accepted(job, "Transcription still in progress")
+
 
 @router.post("/transcribe")
 async def process_audio_for_transcription(
@@ -16,74 +64,210 @@ async def process_audio_for_transcription(
     question_id: int = Form(...),
     round_type: str = Form(...),
     skill: str = Form(None),   # Only used for TECHNICAL
-    db: Session = Depends(get_db)
+    async_mode: Optional[bool] = Form(None),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    try:
-        os.makedirs("uploads", exist_ok=True)
+    if round_type.lower() not in ROUND_TYPES:
+        raise HTTPException(status_code=400, detail="Invalid round type")
 
-        base = f"{task_id}_{uuid.uuid4().hex[:6]}"
-        video_path = f"uploads/{base}.webm"
-        audio_path = f"uploads/{base}.wav"
+    use_job_queue = UPLOAD_JOB_MODE if async_mode is None else async_mode
 
-        # Save uploaded video
-        with open(video_path, "wb") as f:
-            shutil.copyfileobj(video_file.file, f)
+    # -----------------------------
+    # Idempotency: replay stored results / join in-flight work
+    # -----------------------------
+    if idempotency_key:
+        dedup_key = f"idempotency:{idempotency_key}"
+    else:
+        dedup_key = derive_dedup_key(round_type, task_id, question_id)
 
-        # Extract audio
-        extract_audio_from_compressed_video(video_path, audio_path)
+    existing_job = await aget_job_by_key(db, dedup_key)
+    if existing_job and existing_job.status != JOB_FAILED:
+        return await _respond_with_existing_job(db, existing_job, use_job_queue)
 
-        # Upload audio to GCP
-        gcp_audio_path = f"audios/{base}.wav"
-        upload_to_gcp_bucket(audio_path, gcp_audio_path)
+    if not idempotency_key:
+        record = await afind_existing_response(db, round_type, task_id, question_id)
+        if record:
+            return {
+                "message": "Already processed",
+                "transcript": record.transcript,
+                "audio_url": None
+            }
 
-        # Transcribe with Vertex
-        gcs_uri = f"gs://{bucket_name}/{gcp_audio_path}"
-        transcript = transcribe_with_vertex_ai(gcs_uri)
+    try:
+        base = f"{task_id}_{uuid.uuid4().hex[:6]}"
+        video_path = f"{UPLOAD_DIR}/{base}.webm"
+        payload = {
+            "video_path": video_path,
+            "base": base,
+            "task_id": task_id,
+            "question_id": question_id,
+            "round_type": round_type,
+            "skill": skill
+        }
 
         # -----------------------------
-        # Insert into correct response table
+        # Job mode: hand off to the worker pool
         # -----------------------------
-        round_type_lower = round_type.lower()
-
-        if round_type_lower == "technical":
-            record = TechnicalRoundResponse(
-                task_id=task_id,
-                question_id=question_id,
-                transcript=transcript,
-                skill=skill  # ONLY technical has skill
-            )
-
-        elif round_type_lower == "hr":
-            record = HrRoundResponse(
-                task_id=task_id,
-                question_id=question_id,
-                transcript=transcript
-            )
-
-        elif round_type_lower == "cultural":
-            record = CulturalRoundResponse(
-                task_id=task_id,
-                question_id=question_id,
-                transcript=transcript
-            )
-
-        else:
-            raise HTTPException(status_code=400, detail="Invalid round type")
-
-        db.add(record)
-        db.commit()
-        db.refresh(record)
-
-        # Cleanup temp files
-        os.remove(video_path)
-        os.remove(audio_path)
-
-        return {
-            "message": "Processed successfully",
-            "transcript": transcript,
-            "audio_url": gcs_uri
-        }
+        if use_job_queue:
+            await run_in_threadpool(save_upload, video_file.file, video_path)
+
+            job = await aenqueue_job(db, TRANSCRIPTION_JOB, payload, dedup_key)
+            if json.loads(job.payload).get("video_path") != video_path:
+                # A concurrent retry won the race; our copy is not needed
+                os.remove(video_path)
+            return _job_accepted(job, "Transcription queued")
+
+        # -----------------------------
+        # Inline mode: tracked as a running job so retries can join it
+        # -----------------------------
+        inline_payload = {**payload, "inline": True}
+        job, created = await acreate_job(db, TRANSCRIPTION_JOB, inline_payload, dedup_key, status=JOB_RUNNING)
+        if not created:
+            if job.status != JOB_FAILED:
+                return await _respond_with_existing_job(db, job, use_job_queue)
+            job = await arestart_job(db, job, inline_payload, JOB_RUNNING)
+        # Read before a rollback can expire it (no lazy loads on an async session)
+        job_id = job.id
+
+        try:
+            if UPLOAD_STREAMING:
+                # Streaming mode: upload body → ffmpeg → resumable GCS upload
+                transcript, gcs_uri = await run_in_threadpool(transcribe_video_stream, video_file.file, base)
+            else:
+                await run_in_threadpool(save_upload, video_file.file, video_path)
+
+                # Run the blocking pipeline off the event loop
+                transcript, gcs_uri = await run_in_threadpool(transcribe_uploaded_video, video_path, base)
+
+            result = await astore_transcript(db, task_id, question_id, round_type, skill, transcript, gcs_uri)
+        except Exception as e:
+            await db.rollback()
+            await afinish_job(db, job_id, JOB_FAILED, error=str(e))
+            raise
+
+        await afinish_job(db, job_id, JOB_DONE, result=result)
+        return result
 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Transcription failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/transcribe/batch")
+async def process_batch_for_transcription(
+    task_id: str = Form(...),
+    round_type: str = Form(...),
+    question_ids: List[int] = Form(None),      # one per video_files entry
+    skills: List[str] = Form(None),            # Only used for TECHNICAL (one per entry, or a single value)
+    video_files: List[UploadFile] = File(None),
+    manifest: str = Form(None),                # JSON: [{"question_id": 1, "gcs_path": "...", "skill": "..."}]
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Transcribes all answers of a task in one request, either uploaded as
+    multipart files or referenced by a manifest of objects already in the bucket.
+    """
+    if round_type.lower() not in ROUND_TYPES:
+        raise HTTPException(status_code=400, detail="Invalid round type")
+
+    entries = []
+    if video_files:
+        if not question_ids or len(question_ids) != len(video_files):
+            raise HTTPException(status_code=400, detail="question_ids must match video_files")
+        if skills and len(skills) not in (1, len(video_files)):
+            raise HTTPException(status_code=400, detail="skills must be a single value or match video_files")
+        for i, (question_id, upload) in enumerate(zip(question_ids, video_files)):
+            skill = skills[i if len(skills) > 1 else 0] if skills else None
+            entries.append({"question_id": question_id, "skill": skill, "upload": upload})
+
+    if manifest:
+        try:
+            for entry in json.loads(manifest):
+                entries.append({
+                    "question_id": int(entry["question_id"]),
+                    "skill": entry.get("skill") or (skills[0] if skills and len(skills) == 1 else None),
+                    "gcs_path": entry["gcs_path"]
+                })
+        except (ValueError, KeyError, TypeError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid manifest: {e}")
+
+    if not entries:
+        raise HTTPException(status_code=400, detail="No answers supplied")
+
+    question_list = [e["question_id"] for e in entries]
+    duplicates = sorted({q for q in question_list if question_list.count(q) > 1})
+    if duplicates:
+        raise HTTPException(status_code=400, detail=f"Duplicate question_ids: {duplicates}")
+
+    # Questions that already have a stored response are not processed again
+    answered = await afind_answered_questions(db, round_type, task_id, question_list)
+    skipped = [q for q in question_list if q in answered]
+    entries = [e for e in entries if e["question_id"] not in answered]
+
+    # Each answer holds the same dedup job as a single /transcribe of that question,
+    # so overlapping uploads and batch retries join the in-flight work instead
+    jobs = {}
+    in_progress = []
+    for entry in list(entries):
+        question_id = entry["question_id"]
+        payload = {"task_id": task_id, "question_id": question_id, "round_type": round_type,
+                   "skill": entry["skill"], "inline": True}
+        dedup_key = derive_dedup_key(round_type, task_id, question_id)
+        job, created = await acreate_job(db, TRANSCRIPTION_JOB, payload, dedup_key, status=JOB_RUNNING)
+        if not created and job.status == JOB_FAILED:
+            job = await arestart_job(db, job, payload, JOB_RUNNING)
+        elif not created:
+            entries.remove(entry)
+            if job.status == JOB_DONE:
+                skipped.append(question_id)
+            else:
+                in_progress.append({"question_id": question_id, "job_id": job.id,
+                                    "status_url": f"/upload/jobs/{job.id}"})
+            continue
+        jobs[question_id] = job.id
+
+    try:
+        items = []
+        for entry in entries:
+            base = f"{task_id}_{uuid.uuid4().hex[:6]}"
+            video_path = f"{UPLOAD_DIR}/{base}.webm"
+            upload = entry.pop("upload", None)
+            if upload is not None:
+                await run_in_threadpool(save_upload, upload.file, video_path)
+            items.append({**entry, "base": base, "video_path": video_path})
+
+        results = await run_in_threadpool(transcribe_batch, items)
+
+        # One transaction for every successful answer
+        db.add_all(build_batch_records(task_id, round_type, results))
+        await db.commit()
+
+        for r in results:
+            if r["error"] is None:
+                await afinish_job(db, jobs[r["question_id"]], JOB_DONE, result=batch_item_result(r))
+            else:
+                await afinish_job(db, jobs[r["question_id"]], JOB_FAILED, error=r["error"])
+        await amaybe_schedule_report(db, task_id, round_type)
+
+        summary = summarize_batch(task_id, results)
+        summary["skipped"] = skipped
+        summary["in_progress"] = in_progress
+        return summary
+
+    except Exception as e:
+        logging.error(f"Batch transcription failed: {e}")
+        await db.rollback()
+        for job_id in jobs.values():
+            await afinish_job(db, job_id, JOB_FAILED, error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_transcription_job(job_id: str, db: AsyncSession = Depends(get_async_db)):
+    job = await aget_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_to_dict(job)
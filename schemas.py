@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, Field
+from typing import Optional, List, Literal
 from datetime import datetime
 
 
@@ -125,3 +125,51 @@ class ReportGenerateResponse(BaseModel):
     task_id: str
     report_url: str
     message: str
+
+
+# ==========================
+# Structured Report Schemas
+# (Gemini response_schema in REPORT_OUTPUT_FORMAT=json)
+# ==========================
+class HRReport(BaseModel):
+    introduction: str
+    communication: str
+    behavioral_insights: str
+    strengths: str
+    concerns: str
+    follow_up_questions: List[str]
+    recommendation: str
+
+
+class TechnicalReport(BaseModel):
+    summary: str
+    strengths: str
+    areas_for_improvement: str
+    communication: str
+    follow_up_questions: List[str]
+    recommendation: str
+    technical_score: int = Field(ge=0, le=100)
+    grammar_score: int = Field(ge=0, le=100)
+    confidence: Literal["High", "Medium", "Low"]
+
+
+class CulturalReport(BaseModel):
+    report: str
+    communication_score: int = Field(ge=0, le=10)
+    teamwork_score: int = Field(ge=0, le=10)
+    culture_alignment_score: int = Field(ge=0, le=10)
+    recommendation: str
+
+
+# ==========================
+# Background Job Schemas
+# ==========================
+class JobStatusResponse(BaseModel):
+    job_id: str
+    kind: str
+    dedup_key: Optional[str] = None
+    status: str
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
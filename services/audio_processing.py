@@ -1,21 +1,22 @@
 import os
 import re
+import random
+import asyncio
+import logging
 import subprocess
+import threading
 import json
+from collections import Counter
+from contextlib import asynccontextmanager
 import ffmpeg
 from google.cloud import speech
-from google.api_core.exceptions import GoogleAPICallError, RetryError
+from google.api_core.exceptions import GoogleAPICallError, RetryError, ResourceExhausted, ServiceUnavailable
 import vertexai
-from vertexai.preview.generative_models import GenerativeModel
+from pydantic import BaseModel, ValidationError
+
+from services.gcp_clients import get_speech_client, get_report_model, report_model_name
+from services.llm_cache import get_llm_cache, llm_cache_key
 
-# ==============================================================
-# Initialize Gemini 2.0 Model
-# ==============================================================
-try:
-    model = GenerativeModel("gemini-2.0-flash-001")
-except Exception as e:
-    print(f"⚠️ Warning: Gemini model initialization failed: {e}")
-    model = None
 
 # ==============================================================
 # Helper: Determine form type from task_id
@@ -60,22 +61,51 @@ def compress_video_wrapper(input_path, output_path, resolution="640x480", bitrat
         print(f"❌ FFmpeg error: {e}")
         raise
 
+# ==============================================================
+# Audio Output Formats
+# ==============================================================
+# All formats are 16 kHz mono; each maps to the matching STT encoding.
+AUDIO_FORMATS = {
+    "wav": {
+        "ffmpeg_args": ["-f", "wav", "-acodec", "pcm_s16le"],
+        "extension": "wav",
+        "content_type": "audio/wav",
+        "encoding": speech.RecognitionConfig.AudioEncoding.LINEAR16,
+    },
+    "flac": {
+        "ffmpeg_args": ["-f", "flac", "-acodec", "flac"],
+        "extension": "flac",
+        "content_type": "audio/flac",
+        "encoding": speech.RecognitionConfig.AudioEncoding.FLAC,
+    },
+    "ogg_opus": {
+        "ffmpeg_args": ["-f", "ogg", "-acodec", "libopus", "-b:a", "24k"],
+        "extension": "ogg",
+        "content_type": "audio/ogg",
+        "encoding": speech.RecognitionConfig.AudioEncoding.OGG_OPUS,
+    },
+}
+AUDIO_SAMPLE_RATE = 16000
+
+AUDIO_CODEC = os.getenv("AUDIO_CODEC", "wav").lower()
+if AUDIO_CODEC not in AUDIO_FORMATS:
+    raise ValueError(f"❌ Unsupported AUDIO_CODEC '{AUDIO_CODEC}', expected one of {list(AUDIO_FORMATS)}")
+
 # ==============================================================
 # Audio Extraction
 # ==============================================================
-def extract_audio_from_compressed_video(video_path, audio_path):
+def extract_audio_from_compressed_video(video_path, audio_path, audio_format=AUDIO_CODEC):
     """
-    Extracts WAV audio from a given MP4/WebM video file using ffmpeg.
+    Extracts 16 kHz mono audio (WAV, FLAC or OGG/Opus) from a given MP4/WebM video file using ffmpeg.
     """
     try:
         command = [
             "ffmpeg",
             "-i", video_path,
             "-ac", "1",
-            "-ar", "16000",
+            "-ar", str(AUDIO_SAMPLE_RATE),
             "-vn",
-            "-f", "wav",
-            "-acodec", "pcm_s16le",
+            *AUDIO_FORMATS[audio_format]["ffmpeg_args"],
             audio_path
         ]
         subprocess.run(command, check=True, capture_output=True, text=True)
@@ -85,57 +115,516 @@ def extract_audio_from_compressed_video(video_path, audio_path):
         print(f"❌ FFmpeg error while extracting audio: {e}")
         raise
 
+# ==============================================================
+# Streaming Audio Extraction (no temp files)
+# ==============================================================
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+def streaming_audio_format(audio_format=AUDIO_CODEC) -> str:
+    """
+    WAV headers cannot be finalised on a pipe, so streaming falls back to FLAC.
+    """
+    return "flac" if audio_format == "wav" else audio_format
+
+
+def stream_audio_extraction(video_stream, audio_writer, chunk_size=STREAM_CHUNK_SIZE, audio_format="flac"):
+    """
+    Pipes a video stream through ffmpeg and writes 16 kHz mono audio to audio_writer.
+    The input is fed to ffmpeg's stdin from a helper thread while stdout is
+    copied to the writer, so neither the video nor the audio touches disk.
+    Returns the number of audio bytes written.
+    """
+    command = [
+        "ffmpeg",
+        "-loglevel", "error",
+        "-i", "pipe:0",
+        "-ac", "1",
+        "-ar", str(AUDIO_SAMPLE_RATE),
+        "-vn",
+        *AUDIO_FORMATS[audio_format]["ffmpeg_args"],
+        "pipe:1"
+    ]
+    process = subprocess.Popen(
+        command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    stderr_chunks = []
+
+    def feed_stdin():
+        try:
+            while True:
+                chunk = video_stream.read(chunk_size)
+                if not chunk:
+                    break
+                process.stdin.write(chunk)
+        except (BrokenPipeError, ValueError):
+            # ffmpeg exited early; the return code below reports why
+            pass
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+
+    def drain_stderr():
+        stderr_chunks.append(process.stderr.read())
+
+    feeder = threading.Thread(target=feed_stdin, daemon=True)
+    drainer = threading.Thread(target=drain_stderr, daemon=True)
+    feeder.start()
+    drainer.start()
+
+    written = 0
+    try:
+        while True:
+            chunk = process.stdout.read(chunk_size)
+            if not chunk:
+                break
+            audio_writer.write(chunk)
+            written += len(chunk)
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+        feeder.join()
+        drainer.join()
+
+    if returncode != 0:
+        stderr = b"".join(stderr_chunks).decode(errors="replace")
+        print(f"❌ FFmpeg error while streaming audio: {stderr}")
+        raise subprocess.CalledProcessError(returncode, command, stderr=stderr)
+
+    print(f"✅ Streamed {written} bytes of {audio_format} audio")
+    return written
+
+# ==============================================================
+# Audio Duration Probe
+# ==============================================================
+def probe_audio_duration(audio_path):
+    """
+    Returns the clip length in seconds using ffprobe, or None if it cannot be determined.
+    """
+    command = [
+        "ffprobe",
+        "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        audio_path
+    ]
+    try:
+        result = subprocess.run(command, check=True, capture_output=True, text=True)
+        return float(result.stdout.strip())
+    except (subprocess.CalledProcessError, ValueError, OSError) as e:
+        print(f"⚠️ Could not probe duration of {audio_path}: {e}")
+        return None
+
 # ==============================================================
 # Google Cloud Speech-to-Text
 # ==============================================================
-def transcribe_with_vertex_ai(gcs_uri, language_code='en-IN'):
+STT_LANGUAGE_CODE = "en-IN"
+STT_MODEL = "default"
+
+
+def is_failed_transcript(transcript: str) -> bool:
+    """
+    The STT helpers return error markers instead of raising; these must not be cached.
+    """
+    return transcript.startswith("[Error:") or transcript.startswith("[Transcription failed:")
+
+def transcribe_with_vertex_ai(gcs_uri, language_code=STT_LANGUAGE_CODE, audio_format=None):
     """
     Transcribes audio using Google Cloud Speech-to-Text API.
-    Auto-detects sample rate so we don't get empty results.
+    When audio_format is given the matching encoding and sample rate are sent;
+    otherwise the sample rate is auto-detected so we don't get empty results.
     """
     try:
         print(f"🔁 Sending to GCP STT: {gcs_uri}")
-        client = speech.SpeechClient()
+        client = get_speech_client()
 
         audio = speech.RecognitionAudio(uri=gcs_uri)
         config = speech.RecognitionConfig(
             encoding=speech.RecognitionConfig.AudioEncoding.ENCODING_UNSPECIFIED,
             language_code=language_code,
             enable_automatic_punctuation=True,
-            model="default"
+            model=STT_MODEL
         )
+        if audio_format:
+            config.encoding = AUDIO_FORMATS[audio_format]["encoding"]
+            config.sample_rate_hertz = AUDIO_SAMPLE_RATE
 
         operation = client.long_running_recognize(config=config, audio=audio)
         print("⏳ Waiting for transcription to complete...")
         response = operation.result(timeout=600)
         print("✅ Transcription completed successfully.")
 
-        if not response.results:
-            print("⚠️ No transcription results returned.")
-            return "No speech detected."
+        return _join_transcript(response)
+
+    except (GoogleAPICallError, RetryError) as api_err:
+        print("❌ Google API Error:", api_err)
+        return f"[Error: {api_err}]"
 
-        transcript = []
-        for result in response.results:
-            if result.alternatives:
-                transcript.append(result.alternatives[0].transcript)
+    except Exception as e:
+        print("❌ Unexpected error during transcription:", e)
+        return f"[Transcription failed: {str(e)}]"
 
-        return "\n".join(transcript).strip()
+
+# Synchronous recognize() accepts at most ~1 minute / 10 MB of inline audio
+SYNC_RECOGNIZE_MAX_SECONDS = float(os.getenv("SYNC_RECOGNIZE_MAX_SECONDS", "55"))
+SYNC_RECOGNIZE_MAX_BYTES = 10 * 1024 * 1024
+
+
+def can_transcribe_inline(audio_path, duration) -> bool:
+    """
+    True when a clip is short and small enough for the synchronous recognize() call.
+    """
+    return (
+        duration is not None
+        and duration < SYNC_RECOGNIZE_MAX_SECONDS
+        and os.path.getsize(audio_path) < SYNC_RECOGNIZE_MAX_BYTES
+    )
+
+
+def transcribe_inline_with_vertex_ai(audio_path, language_code=STT_LANGUAGE_CODE, audio_format=None):
+    """
+    Transcribes a short local clip with the synchronous recognize() API,
+    sending the audio inline instead of via GCS + long_running_recognize.
+    """
+    try:
+        print(f"🔁 Sending inline audio to GCP STT: {audio_path}")
+        client = get_speech_client()
+
+        with open(audio_path, "rb") as f:
+            audio = speech.RecognitionAudio(content=f.read())
+
+        config = speech.RecognitionConfig(
+            encoding=speech.RecognitionConfig.AudioEncoding.ENCODING_UNSPECIFIED,
+            language_code=language_code,
+            enable_automatic_punctuation=True,
+            model=STT_MODEL
+        )
+        if audio_format:
+            config.encoding = AUDIO_FORMATS[audio_format]["encoding"]
+            config.sample_rate_hertz = AUDIO_SAMPLE_RATE
+
+        response = client.recognize(config=config, audio=audio)
+        print("✅ Inline transcription completed successfully.")
+
+        return _join_transcript(response)
 
     except (GoogleAPICallError, RetryError) as api_err:
         print("❌ Google API Error:", api_err)
         return f"[Error: {api_err}]"
 
     except Exception as e:
-        print("❌ Unexpected error during transcription:", e)
+        print("❌ Unexpected error during inline transcription:", e)
         return f"[Transcription failed: {str(e)}]"
 
+
+def _join_transcript(response) -> str:
+    if not response.results:
+        print("⚠️ No transcription results returned.")
+        return "No speech detected."
+
+    transcript = []
+    for result in response.results:
+        if result.alternatives:
+            transcript.append(result.alternatives[0].transcript)
+
+    return "\n".join(transcript).strip()
+
 # ==============================================================
-# Gemini Report Generators
+# Gemini Execution (bounded concurrency, timeouts, retries)
 # ==============================================================
+# Max Gemini calls in flight per process; further calls queue
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+
+# Per-attempt timeout (seconds)
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "120"))
 
-def generate_hr_report_with_gemini(qa_pairs: list[dict]) -> str:
+# Attempts per call when Vertex answers 429 / 503, with full-jitter exponential backoff
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "4"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "1.0"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "30"))
+
+RETRYABLE_LLM_ERRORS = (ResourceExhausted, ServiceUnavailable)
+
+
+class LLMExecutor:
     """
-    Generates a professional HR interview evaluation report using Gemini.
+    Runs model calls on a private event loop thread via generate_content_async.
+    At most `max_concurrency` calls are in flight; the rest wait in a queue
+    whose depth is reported by stats(). One loop means the async gRPC channel
+    is always used from the loop that created it, whichever thread calls in.
+    """
+
+    def __init__(self, max_concurrency: int = LLM_MAX_CONCURRENCY, timeout: float = LLM_TIMEOUT_SECONDS,
+                 max_attempts: int = LLM_MAX_ATTEMPTS, base_delay: float = LLM_RETRY_BASE_DELAY,
+                 max_delay: float = LLM_RETRY_MAX_DELAY):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self.queued = 0
+        self.in_flight = 0
+        self.counters = Counter()
+
+        self._loop = None
+        self._semaphore = None
+        self._lock = threading.Lock()
+
+    # ----------------------------------------------------------
+    # Loop thread
+    # ----------------------------------------------------------
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                    threading.Thread(target=loop.run_forever, name="llm-executor", daemon=True).start()
+                    self._loop = loop
+        return self._loop
+
+    def stop(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+
+    # ----------------------------------------------------------
+    # Calls
+    # ----------------------------------------------------------
+    async def _invoke(self, model, prompt: str, generation_config: dict):
+        if hasattr(model, "generate_content_async"):
+            return await model.generate_content_async(prompt, generation_config=generation_config)
+        # Sync-only models still respect the cap, but a timeout cannot interrupt them
+        return await asyncio.get_running_loop().run_in_executor(
+            None, lambda: model.generate_content(prompt, generation_config=generation_config)
+        )
+
+    @asynccontextmanager
+    async def _slot(self):
+        self.counters["calls"] += 1
+        self.queued += 1
+        if self._semaphore.locked():
+            logging.info(f"⏳ Gemini call queued ({self.queued} waiting, {self.in_flight} in flight)")
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    async def _should_retry(self, error: Exception, attempt: int) -> bool:
+        """
+        Sleeps and returns True for a retryable error with attempts left.
+        Backoff happens while holding the slot: retries should not add load on a throttled quota.
+        """
+        if not isinstance(error, RETRYABLE_LLM_ERRORS) or attempt == self.max_attempts:
+            self.counters["failures"] += 1
+            return False
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        self.counters["retries"] += 1
+        logging.warning(f"⚠️ Gemini {type(error).__name__} (attempt {attempt}/{self.max_attempts}), retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+        return True
+
+    async def _generate(self, model, prompt: str, generation_config: dict):
+        async with self._slot():
+            for attempt in range(1, self.max_attempts + 1):
+                try:
+                    return await asyncio.wait_for(self._invoke(model, prompt, generation_config), self.timeout)
+                except asyncio.TimeoutError:
+                    self.counters["timeouts"] += 1
+                    raise TimeoutError(f"Gemini call timed out after {self.timeout:g}s") from None
+                except Exception as e:
+                    if not await self._should_retry(e, attempt):
+                        raise
+
+    async def _stream(self, model, prompt: str, generation_config: dict, emit) -> None:
+        """
+        Streams text chunks to emit(). The timeout applies to each chunk, and
+        errors are only retried before the first chunk went out.
+        """
+        async with self._slot():
+            for attempt in range(1, self.max_attempts + 1):
+                started = False
+                try:
+                    if not hasattr(model, "generate_content_async"):
+                        # No async streaming: deliver the whole answer as one chunk
+                        response = await self._invoke(model, prompt, generation_config)
+                        emit(response.text)
+                        return
+                    stream = await asyncio.wait_for(
+                        model.generate_content_async(prompt, generation_config=generation_config, stream=True),
+                        self.timeout
+                    )
+                    chunks = stream.__aiter__()
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(chunks.__anext__(), self.timeout)
+                        except StopAsyncIteration:
+                            return
+                        text = _chunk_text(chunk)
+                        if text:
+                            started = True
+                            emit(text)
+                except asyncio.TimeoutError:
+                    self.counters["timeouts"] += 1
+                    raise TimeoutError(f"Gemini stream stalled for {self.timeout:g}s") from None
+                except Exception as e:
+                    if started or not await self._should_retry(e, attempt):
+                        raise
+
+    def run(self, model, prompt: str, generation_config: dict):
+        """
+        Blocking call for worker threads (job handlers, run_in_threadpool).
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self._generate(model, prompt, generation_config), self._ensure_loop()
+        )
+        return future.result()
+
+    async def arun(self, model, prompt: str, generation_config: dict):
+        future = asyncio.run_coroutine_threadsafe(
+            self._generate(model, prompt, generation_config), self._ensure_loop()
+        )
+        return await asyncio.wrap_future(future)
+
+    async def astream(self, model, prompt: str, generation_config: dict):
+        """
+        Async generator of text chunks for the caller's event loop. Closing it
+        early (e.g. the client went away) cancels the Gemini call.
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        end = object()
+
+        def emit(item) -> None:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                pass  # the caller's loop is gone
+
+        future = asyncio.run_coroutine_threadsafe(
+            self._stream(model, prompt, generation_config, emit), self._ensure_loop()
+        )
+        future.add_done_callback(lambda _: emit(end))
+        try:
+            while (item := await queue.get()) is not end:
+                yield item
+            future.result()
+        finally:
+            future.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queued,
+            **{key: self.counters[key] for key in ("calls", "retries", "timeouts", "failures")}
+        }
+
+
+def _chunk_text(chunk) -> str:
+    # Stream chunks without candidates (e.g. a trailing safety / usage chunk) have no text
+    try:
+        return chunk.text
+    except (ValueError, AttributeError):
+        return ""
+
+
+llm_executor = LLMExecutor()
+
+
+def generate_with_llm(prompt: str, generation_config: dict, model=None,
+                      template_version: str = None, formatted_input: str = None,
+                      force_refresh: bool = False) -> str:
+    """
+    Runs one Gemini call through the shared executor (blocking) and returns its text.
+    With a template version and formatted input the answer is served from / saved
+    to the LLM response cache; force_refresh skips the lookup but still saves.
+    """
+    cache = get_llm_cache() if template_version and model is None else None
+    key = None
+    if cache is not None:
+        key = llm_cache_key(report_model_name(), template_version, generation_config, formatted_input)
+        if not force_refresh:
+            cached = cache.get(key)
+            if cached is not None:
+                logging.info(f"⚡ Gemini answer served from cache ({template_version})")
+                return cached
+
+    text = llm_executor.run(model or get_report_model(), prompt, generation_config).text
+    if cache is not None and text.strip():
+        cache.set(key, text, report_model_name())
+    return text
+
+
+async def astream_with_llm(prompt: str, generation_config: dict, template_version: str = None,
+                           formatted_input: str = None, force_refresh: bool = False):
+    """
+    Async generator of the answer's text chunks as Gemini produces them.
+    A cached answer is sent as a single chunk; a completed stream is cached.
+    """
+    cache = get_llm_cache() if template_version else None
+    key = None
+    if cache is not None:
+        key = llm_cache_key(report_model_name(), template_version, generation_config, formatted_input)
+        if not force_refresh:
+            cached = await asyncio.to_thread(cache.get, key)
+            if cached is not None:
+                logging.info(f"⚡ Gemini answer served from cache ({template_version})")
+                yield cached
+                return
+
+    chunks = []
+    async for chunk in llm_executor.astream(get_report_model(), prompt, generation_config):
+        chunks.append(chunk)
+        yield chunk
+
+    text = "".join(chunks)
+    if cache is not None and text.strip():
+        await asyncio.to_thread(cache.set, key, text, report_model_name())
+
+# ==============================================================
+# Gemini Report Generators
+# ==============================================================
+# Part of the LLM cache key: bump when a generator's prompt wording changes
+HR_REPORT_PROMPT_VERSION = "hr-v1"
+TECHNICAL_REPORT_PROMPT_VERSION = "technical-v1"
+CULTURAL_REPORT_PROMPT_VERSION = "cultural-v2"
+
+HR_GENERATION_CONFIG = {
+    "max_output_tokens": 2048,
+    "temperature": 0.6,
+    "top_p": 0.8,
+    "top_k": 40
+}
+TECHNICAL_GENERATION_CONFIG = {
+    "max_output_tokens": 2048,
+    "temperature": 0.5,
+    "top_p": 0.85,
+    "top_k": 40
+}
+CULTURAL_GENERATION_CONFIG = {
+    "max_output_tokens": 2048,
+    "temperature": 0.6,
+    "top_p": 0.8,
+    "top_k": 40
+}
+
+
+def hr_report_request(qa_pairs: list[dict]) -> dict:
+    """
+    Prompt, generation config and cache identity of an HR report
+    (keyword arguments for generate_with_llm / astream_with_llm).
     """
     formatted_transcript = "\n\n".join(
         f"Q: {pair['question']}\nA: {pair['transcript']}" for pair in qa_pairs
@@ -159,24 +648,15 @@ Sections:
 Transcript:
 \"\"\"{formatted_transcript}\"\"\"
 """
-
-    response = model.generate_content(
-        prompt,
-        generation_config={
-            "max_output_tokens": 2048,
-            "temperature": 0.6,
-            "top_p": 0.8,
-            "top_k": 40
-        }
-    )
-
-    return response.text.replace("*", "").strip()
+    return {
+        "prompt": prompt,
+        "generation_config": HR_GENERATION_CONFIG,
+        "template_version": HR_REPORT_PROMPT_VERSION,
+        "formatted_input": formatted_transcript
+    }
 
 
-def generate_technical_report_with_gemini(qa_pairs, model=model):
-    """
-    Generates a structured technical interview evaluation report.
-    """
+def technical_report_request(qa_pairs: list[dict]) -> dict:
     formatted_qa = "\n\n".join([
         f"Q{i+1}: {pair['question']}\nExpected Answer: {pair['correct_answer']}\nCandidate Answer: {pair['transcript']}"
         for i, pair in enumerate(qa_pairs)
@@ -200,60 +680,61 @@ Generate a structured report with sections:
 Interview Data:
 \"\"\"{formatted_qa}\"\"\"
 """
-
-    try:
-        response = model.generate_content(
-            prompt,
-            generation_config={
-                "max_output_tokens": 2048,
-                "temperature": 0.5,
-                "top_p": 0.85,
-                "top_k": 40
-            }
-        )
-        return response.text.replace("*", "").strip()
-    except Exception as e:
-        return f"[Error generating report: {e}]"
+    return {
+        "prompt": prompt,
+        "generation_config": TECHNICAL_GENERATION_CONFIG,
+        "template_version": TECHNICAL_REPORT_PROMPT_VERSION,
+        "formatted_input": formatted_qa
+    }
 
 
-def generate_cultural_report_with_gemini(qa_pairs: list[dict]) -> dict:
-    """
-    Generates a professional Cultural Fit interview evaluation report using Gemini.
-    """
+def cultural_report_request(qa_pairs: list[dict]) -> dict:
     formatted_transcript = "\n\n".join(
         f"Q: {pair['question']}\nA: {pair['transcript']}" for pair in qa_pairs
     )
 
     prompt = f"""
 You are an AI-powered cultural fit evaluation assistant.
-Generate:
-1. A detailed cultural fit evaluation report.
-2. A JSON object with scores:
+Generate a detailed cultural fit evaluation report.
+
+Do NOT use asterisks. Use clean section headings.
+
+Sections:
+1. Cultural Fit Summary
+2. Values & Motivation
+3. Teamwork & Collaboration
+4. Communication Style
+5. Adaptability & Growth Mindset
+6. Potential Concerns
+7. Suggested Follow-up Questions
+8. Final Recommendation
+
+After the report, add a JSON object with scores:
    - communication_score
    - teamwork_score
    - culture_alignment_score
    - final_recommendation
 
-Do NOT use asterisks. Use clean section headings.
-
 Transcript:
 {formatted_transcript}
 """
+    return {
+        "prompt": prompt,
+        "generation_config": CULTURAL_GENERATION_CONFIG,
+        "template_version": CULTURAL_REPORT_PROMPT_VERSION,
+        "formatted_input": formatted_transcript
+    }
 
-    try:
-        response = model.generate_content(
-            prompt,
-            generation_config={
-                "max_output_tokens": 2048,
-                "temperature": 0.6,
-                "top_p": 0.8,
-                "top_k": 40
-            }
-        )
-    except Exception as e:
-        return {"report": "", "scores": {}, "error": f"Model generation failed: {e}"}
 
-    cleaned_output = response.text.strip()
+def clean_report_text(text: str) -> str:
+    return text.replace("*", "").strip()
+
+
+def parse_cultural_output(text: str) -> dict:
+    """
+    Splits the cultural model output into report text and the scores JSON.
+    """
+    cleaned_output = text.strip()
     json_match = re.search(r'\{.*?"communication_score".*?\}', cleaned_output, re.DOTALL)
     scores = {}
     report_text = cleaned_output
@@ -271,24 +752,183 @@ Transcript:
 
     return {"report": report_text, "scores": scores, "error": error}
 
+
+def generate_hr_report_with_gemini(qa_pairs: list[dict], force_refresh: bool = False) -> str:
+    """
+    Generates a professional HR interview evaluation report using Gemini.
+    """
+    text = generate_with_llm(**hr_report_request(qa_pairs), force_refresh=force_refresh)
+    return clean_report_text(text)
+
+
+def generate_technical_report_with_gemini(qa_pairs, model=None, force_refresh: bool = False):
+    """
+    Generates a structured technical interview evaluation report.
+    """
+    text = generate_with_llm(**technical_report_request(qa_pairs), model=model, force_refresh=force_refresh)
+    return clean_report_text(text)
+
+
+def generate_cultural_report_with_gemini(qa_pairs: list[dict], force_refresh: bool = False) -> dict:
+    """
+    Generates a professional Cultural Fit interview evaluation report using Gemini.
+    """
+    text = generate_with_llm(**cultural_report_request(qa_pairs), force_refresh=force_refresh)
+    return parse_cultural_output(text)
+
 # ==============================================================
-# Report Section Parser
+# Structured (JSON) Report Output
 # ==============================================================
-def parse_report_sections(text: str) -> dict:
-    def extract(label_pattern: str) -> str:
-        pattern = rf"{label_pattern}\s*\n(.*?)(?=\n\d+[\.\s]+|$)"
-        match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-        return match.group(1).strip() if match else ""
+# "text": free-form reports parsed with regexes; "json": Gemini fills a response
+# schema and the result is validated into the report models in schemas.py
+REPORT_OUTPUT_FORMAT = os.getenv("REPORT_OUTPUT_FORMAT", "text").lower()
 
-    def extract_list(label_pattern: str) -> list:
-        return [q.strip() for q in extract(label_pattern).split("\n") if q.strip()]
+STRUCTURED_OUTPUT_INSTRUCTION = """
+Return the report as JSON matching the response schema. Write every text field as plain
+prose without headings or asterisks, and put each follow-up question in its own list item.
+"""
+
+
+def gemini_response_schema(schema: type[BaseModel]) -> dict:
+    """
+    Pydantic JSON schema reduced to the Schema proto subset Gemini accepts.
+    """
+    def convert(node: dict) -> dict:
+        out = {key: node[key] for key in ("enum", "description", "minimum", "maximum", "required") if key in node}
+        if "type" in node:
+            out["type"] = node["type"].upper()
+        if "properties" in node:
+            out["properties"] = {name: convert(prop) for name, prop in node["properties"].items()}
+            out["property_ordering"] = list(node["properties"])
+        if "items" in node:
+            out["items"] = convert(node["items"])
+        return out
 
+    return convert(schema.model_json_schema())
+
+
+def structured_report_request(request: dict, schema: type[BaseModel]) -> dict:
+    """
+    Turns a report request (see hr_report_request) into its JSON-mode variant.
+    """
     return {
-        "introduction": extract(r"1[.\s]+Candidate Introduction"),
-        "communication": extract(r"2[.\s]+Communication.*Soft Skills"),
-        "behavioral_insights": extract(r"3[.\s]+Behavioral Insights"),
-        "strengths": extract(r"4[.\s]+Strengths.*"),
-        "concerns": extract(r"5[.\s]+Areas.*Improvement"),
-        "follow_up_questions": extract_list(r"6[.\s]+Suggested Follow-up Questions"),
-        "recommendation": extract(r"7[.\s]+Final Recommendation")
+        **request,
+        "prompt": request["prompt"] + STRUCTURED_OUTPUT_INSTRUCTION,
+        "generation_config": {
+            **request["generation_config"],
+            "response_mime_type": "application/json",
+            "response_schema": gemini_response_schema(schema)
+        },
+        "template_version": f"{request['template_version']}-json"
     }
+
+
+def parse_structured_report(text: str, schema: type[BaseModel]) -> BaseModel:
+    try:
+        return schema.model_validate_json(text)
+    except ValidationError as e:
+        raise ValueError(f"Gemini returned an invalid {schema.__name__}: {e}") from e
+
+# ==============================================================
+# Report Section Parser
+# ==============================================================
+# Section keys per round, with the heading title (after the number) that opens them
+REPORT_SECTION_LAYOUTS = {
+    "hr": [
+        ("introduction", r"candidate introduction"),
+        ("communication", r"communication.*soft skills"),
+        ("behavioral_insights", r"behavioral insights"),
+        ("strengths", r"strengths"),
+        ("concerns", r"areas.*(?:concern|improvement)"),
+        ("follow_up_questions", r"suggested follow-up questions"),
+        ("recommendation", r"final recommendation"),
+    ],
+    "technical": [
+        ("summary", r"interview summary"),
+        ("strengths", r"strengths"),
+        ("areas_for_improvement", r"areas for improvement"),
+        ("communication", r"communication.*confidence"),
+        ("follow_up_questions", r"suggested follow-up questions"),
+        ("recommendation", r"final assessment"),
+        ("technical_score", r"technical score"),
+        ("grammar_score", r"grammar.*fluency"),
+        ("confidence", r"confidence interval"),
+    ],
+    "cultural": [
+        ("summary", r"cultural fit summary"),
+        ("values", r"values.*motivation"),
+        ("teamwork", r"teamwork.*collaboration"),
+        ("communication", r"communication style"),
+        ("adaptability", r"adaptability"),
+        ("concerns", r"(?:potential )?concerns"),
+        ("follow_up_questions", r"suggested follow-up questions"),
+        ("recommendation", r"final recommendation"),
+    ],
+}
+REPORT_LIST_SECTIONS = {"follow_up_questions"}
+
+# One numbered heading per line: "3. Behavioral Insights", "## 7) Technical Score (out of 100): 50"
+_HEADING_RE = re.compile(r"^[ \t]*(?:#{1,6}[ \t]*)?\d{1,2}[.)][ \t]+([^\n]*?)[ \t]*$", re.MULTILINE)
+
+# Per round, one alternation that names the section a heading title opens,
+# plus any value written on the heading line itself
+_SECTION_TITLE_RES = {
+    round_type: re.compile(
+        "(?:" + "|".join(f"(?P<{key}>{pattern})" for key, pattern in layout) + r")[^:]*(?::[ \t]*(?P<_value>.*))?",
+        re.IGNORECASE
+    )
+    for round_type, layout in REPORT_SECTION_LAYOUTS.items()
+}
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+def _heading_key(round_type: str, title: str):
+    """
+    (section key, inline value) for a heading title, or None if it is not a
+    section heading (e.g. a numbered follow-up question). Rounds without a
+    fixed layout use the slugged title as key.
+    """
+    title_re = _SECTION_TITLE_RES.get(round_type)
+    if title_re is None:
+        label, _, value = title.partition(":")
+        key = _SLUG_RE.sub("_", label.lower()).strip("_")
+        return (key, value.strip()) if key else None
+
+    match = title_re.match(title)
+    if match is None:
+        return None
+    groups = match.groupdict()
+    key = next(k for k, v in groups.items() if v is not None and k != "_value")
+    return key, (groups["_value"] or "").strip()
+
+
+def parse_report_sections(text: str, round_type: str = "hr") -> dict:
+    """
+    Splits a report into its sections in one pass over the numbered headings.
+    Every section of the round's layout is present (empty when missing);
+    follow-up questions come back as a list of lines.
+    """
+    layout = REPORT_SECTION_LAYOUTS.get(round_type, [])
+    sections = {key: [] if key in REPORT_LIST_SECTIONS else "" for key, _ in layout}
+
+    def close(key: str, inline: str, body_start: int, body_end: int) -> None:
+        body = text[body_start:body_end].strip()
+        if inline:
+            body = f"{inline}\n{body}" if body else inline
+        if key in REPORT_LIST_SECTIONS:
+            sections[key] = [line.strip() for line in body.split("\n") if line.strip()]
+        else:
+            sections[key] = body
+
+    current = None
+    for heading in _HEADING_RE.finditer(text):
+        found = _heading_key(round_type, heading.group(1))
+        if found is None:
+            continue
+        if current is not None:
+            close(*current, heading.start())
+        current = (*found, heading.end())
+
+    if current is not None:
+        close(*current, len(text))
+    return sections
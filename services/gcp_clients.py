@@ -0,0 +1,117 @@
+import os
+import logging
+import threading
+
+from google.cloud import storage, speech
+from dotenv import load_dotenv
+
+# ==============================================================
+# Configuration
+# ==============================================================
+load_dotenv()
+
+# Use in-memory fakes instead of Google APIs (offline development / tests)
+GCP_FAKE_BACKEND = os.getenv("GCP_FAKE_BACKEND", "false").lower() == "true"
+
+# Max keep-alive HTTP connections the shared storage client keeps per host
+GCS_HTTP_POOL_SIZE = int(os.getenv("GCS_HTTP_POOL_SIZE", "32"))
+
+# Point the storage client at a local emulator instead of GCS (read by google-cloud-storage too)
+STORAGE_EMULATOR_HOST = os.getenv("STORAGE_EMULATOR_HOST")
+
+# Gemini model used for the interview reports
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-001")
+
+# Artificial latency of the fake Gemini model (seconds), to exercise slow-report paths offline
+FAKE_MODEL_LATENCY = float(os.getenv("FAKE_MODEL_LATENCY", "0"))
+
+_clients = {}
+_lock = threading.Lock()
+
+# ==============================================================
+# Registry
+# ==============================================================
+def _get_or_create(name: str, factory):
+    """
+    Returns the process-wide client called `name`, creating it on first use.
+    Double-checked locking keeps the fast path lock-free.
+    """
+    client = _clients.get(name)
+    if client is None:
+        with _lock:
+            client = _clients.get(name)
+            if client is None:
+                client = factory()
+                _clients[name] = client
+                logging.info(f"🔌 Initialised shared {name} client")
+    return client
+
+
+def reset_clients() -> None:
+    """
+    Drops all cached clients (e.g. after a fork or when switching backends).
+    """
+    with _lock:
+        _clients.clear()
+
+# ==============================================================
+# Factories
+# ==============================================================
+def _create_storage_client() -> storage.Client:
+    if GCP_FAKE_BACKEND:
+        from services.gcp_fakes import FakeStorageClient
+        return FakeStorageClient()
+
+    import google.auth
+    from google.auth.transport.requests import AuthorizedSession
+    from requests.adapters import HTTPAdapter
+
+    if STORAGE_EMULATOR_HOST:
+        # Local GCS emulator (plain HTTP, no auth), e.g. benchmarks/gcs_transfers.py
+        from google.auth.credentials import AnonymousCredentials
+        credentials, project = AnonymousCredentials(), os.getenv("GOOGLE_CLOUD_PROJECT", "local")
+    else:
+        credentials, project = google.auth.default(scopes=storage.Client.SCOPE)
+
+    # One authorised session with a larger connection pool, shared by all threads
+    session = AuthorizedSession(credentials)
+    adapter = HTTPAdapter(pool_connections=GCS_HTTP_POOL_SIZE, pool_maxsize=GCS_HTTP_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return storage.Client(project=project, credentials=credentials, _http=session)
+
+
+def _create_speech_client() -> speech.SpeechClient:
+    if GCP_FAKE_BACKEND:
+        from services.gcp_fakes import FakeSpeechClient
+        return FakeSpeechClient()
+
+    # The gRPC channel inside the client is thread-safe and reused for every call
+    return speech.SpeechClient()
+
+def _create_report_model():
+    if GCP_FAKE_BACKEND:
+        from services.gcp_fakes import FakeGenerativeModel
+        return FakeGenerativeModel(latency=FAKE_MODEL_LATENCY)
+
+    from vertexai.preview.generative_models import GenerativeModel
+    return GenerativeModel(GEMINI_MODEL)
+
+# ==============================================================
+# Public accessors
+# ==============================================================
+def get_storage_client() -> storage.Client:
+    return _get_or_create("storage", _create_storage_client)
+
+
+def get_speech_client() -> speech.SpeechClient:
+    return _get_or_create("speech", _create_speech_client)
+
+
+def get_report_model():
+    return _get_or_create("gemini", _create_report_model)
+
+
+def report_model_name() -> str:
+    return "fake" if GCP_FAKE_BACKEND else GEMINI_MODEL
@@ -0,0 +1,231 @@
+import io
+import asyncio
+from collections import deque
+import re
+import json
+import time
+import threading
+
+from google.cloud import speech
+from google.api_core.exceptions import NotFound
+
+# ==============================================================
+# In-memory stand-ins for the Google clients (GCP_FAKE_BACKEND=true)
+# ==============================================================
+FAKE_TRANSCRIPT = "This is a fake transcript."
+
+
+class FakeBlobWriter(io.BytesIO):
+    """
+    Buffers writes and stores the object when closed, like a resumable upload.
+    """
+
+    def __init__(self, blob):
+        super().__init__()
+        self._blob = blob
+
+    def close(self):
+        if not self.closed:
+            self._blob._store(self.getvalue())
+        super().close()
+
+    def terminate(self):
+        # Cancelled upload: nothing is stored
+        super().close()
+
+
+class FakeBlob:
+    def __init__(self, bucket, name: str):
+        self.bucket = bucket
+        self.name = name
+
+    def _store(self, data: bytes) -> None:
+        with self.bucket.client._lock:
+            self.bucket.client.objects[(self.bucket.name, self.name)] = data
+
+    def _load(self) -> bytes:
+        try:
+            return self.bucket.client.objects[(self.bucket.name, self.name)]
+        except KeyError:
+            raise NotFound(f"No such object: {self.bucket.name}/{self.name}")
+
+    def exists(self, **kwargs) -> bool:
+        return (self.bucket.name, self.name) in self.bucket.client.objects
+
+    def upload_from_filename(self, filename: str, **kwargs) -> None:
+        with open(filename, "rb") as f:
+            self._store(f.read())
+
+    def upload_from_string(self, data, **kwargs) -> None:
+        self._store(data.encode() if isinstance(data, str) else data)
+
+    def download_to_filename(self, filename: str, **kwargs) -> None:
+        data = self._load()
+        with open(filename, "wb") as f:
+            f.write(data)
+
+    def download_as_bytes(self, **kwargs) -> bytes:
+        return self._load()
+
+    def download_as_text(self, **kwargs) -> str:
+        return self._load().decode("utf-8")
+
+    def delete(self, **kwargs) -> None:
+        self._load()
+        with self.bucket.client._lock:
+            del self.bucket.client.objects[(self.bucket.name, self.name)]
+
+    def open(self, mode: str = "rb", **kwargs):
+        if "w" in mode:
+            return FakeBlobWriter(self)
+        return io.BytesIO(self._load())
+
+
+class FakeBucket:
+    def __init__(self, client, name: str):
+        self.client = client
+        self.name = name
+
+    def blob(self, name: str, **kwargs) -> FakeBlob:
+        return FakeBlob(self, name)
+
+
+class FakeStorageClient:
+    def __init__(self):
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, name: str) -> FakeBucket:
+        return FakeBucket(self, name)
+
+
+class FakeOperation:
+    def __init__(self, response):
+        self._response = response
+
+    def result(self, timeout=None):
+        return self._response
+
+
+class FakeSpeechClient:
+    """
+    Returns a fixed transcript for every request.
+    """
+
+    def __init__(self, transcript: str = FAKE_TRANSCRIPT):
+        self.transcript = transcript
+
+    def _response(self, response_type):
+        return response_type(results=[
+            speech.SpeechRecognitionResult(alternatives=[
+                speech.SpeechRecognitionAlternative(transcript=self.transcript)
+            ])
+        ])
+
+    def recognize(self, config=None, audio=None, **kwargs):
+        return self._response(speech.RecognizeResponse)
+
+    def long_running_recognize(self, config=None, audio=None, **kwargs):
+        return FakeOperation(self._response(speech.LongRunningRecognizeResponse))
+
+
+class FakeModelResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+def _placeholder_value(schema: dict):
+    """
+    A value satisfying a Gemini response schema (JSON mode of the fake model).
+    """
+    kind = schema.get("type", "STRING").upper()
+    if kind == "OBJECT":
+        return {name: _placeholder_value(prop) for name, prop in schema.get("properties", {}).items()}
+    if kind == "ARRAY":
+        return [_placeholder_value(schema.get("items", {}))]
+    if kind in ("INTEGER", "NUMBER"):
+        low, high = schema.get("minimum", 0), schema.get("maximum", 100)
+        return int(low + (high - low) * 0.7)
+    if kind == "BOOLEAN":
+        return True
+    if "enum" in schema:
+        return schema["enum"][0]
+    return "Placeholder content."
+
+
+class FakeGenerativeModel:
+    """
+    Answers report prompts with placeholder text under each numbered section
+    heading found in the prompt, plus a scores JSON when the prompt asks for one.
+    `failures` are raised (in order) by the first calls, to exercise retries;
+    `active` / `max_active` track concurrent calls.
+    """
+
+    def __init__(self, latency: float = 0.0, failures=None):
+        self.latency = latency
+        self.failures = deque(failures or [])
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def _enter(self) -> None:
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            failure = self.failures.popleft() if self.failures else None
+        if failure is not None:
+            self._exit()
+            raise failure
+
+    def _exit(self) -> None:
+        with self._lock:
+            self.active -= 1
+
+    def generate_content(self, prompt: str, generation_config=None, **kwargs) -> FakeModelResponse:
+        self._enter()
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            return self._respond(prompt, generation_config)
+        finally:
+            self._exit()
+
+    async def generate_content_async(self, prompt: str, generation_config=None, stream: bool = False, **kwargs):
+        self._enter()
+        if stream:
+            return self._astream(prompt, generation_config)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            return self._respond(prompt, generation_config)
+        finally:
+            self._exit()
+
+    async def _astream(self, prompt: str, generation_config=None):
+        # The latency is spread over the chunks (one per line), like a token stream
+        try:
+            lines = self._respond(prompt, generation_config).text.splitlines(keepends=True)
+            for line in lines:
+                if self.latency:
+                    await asyncio.sleep(self.latency / len(lines))
+                yield FakeModelResponse(line)
+        finally:
+            self._exit()
+
+    def _respond(self, prompt: str, generation_config=None) -> FakeModelResponse:
+        schema = (generation_config or {}).get("response_schema")
+        if schema:
+            return FakeModelResponse(json.dumps(_placeholder_value(schema), indent=2))
+
+        headings = re.findall(r"^\s*(\d+\.\s+[^\n]+)$", prompt, re.MULTILINE)
+        sections = [f"{heading.strip()}\nPlaceholder content." for heading in headings]
+        if "communication_score" in prompt:
+            sections.append(json.dumps({
+                "communication_score": 7,
+                "teamwork_score": 7,
+                "culture_alignment_score": 7,
+                "final_recommendation": "Proceed"
+            }))
+        return FakeModelResponse("\n\n".join(sections))
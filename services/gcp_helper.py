@@ -1,48 +1,98 @@
 import os
+import uuid
+from typing import Optional
 from google.cloud import storage
+from google.cloud.storage import transfer_manager
+from google.cloud.storage.retry import DEFAULT_RETRY
 from google.api_core.exceptions import GoogleAPICallError, NotFound
 from dotenv import load_dotenv
 import logging
 
+from services.gcp_clients import GCP_FAKE_BACKEND, get_storage_client
+
 # ==============================================================
 # Load environment variables
 # ==============================================================
 load_dotenv()
 
-bucket_name = os.getenv("GCP_BUCKET_NAME")
+bucket_name = os.getenv("GCP_BUCKET_NAME") or ("fake-bucket" if GCP_FAKE_BACKEND else None)
 
 if not bucket_name:
     raise ValueError("❌ GCP_BUCKET_NAME not set in .env file")
 
+# ==============================================================
+# Transfer tuning
+# ==============================================================
+# Files above this size go up as resumable uploads in chunks of this size
+# (a failed chunk is retried instead of the whole file). Multiple of 256 KB.
+GCS_UPLOAD_CHUNK_SIZE = int(os.getenv("GCS_UPLOAD_CHUNK_SIZE", str(8 * 1024 * 1024)))
+
+# Files at or above this size are transferred as parallel slices (transfer manager)
+GCS_PARALLEL_THRESHOLD = int(os.getenv("GCS_PARALLEL_THRESHOLD", str(64 * 1024 * 1024)))
+
+# Slice size and worker threads per parallel transfer
+GCS_SLICE_SIZE = int(os.getenv("GCS_SLICE_SIZE", str(16 * 1024 * 1024)))
+GCS_TRANSFER_WORKERS = int(os.getenv("GCS_TRANSFER_WORKERS", "8"))
+
+# Parallel downloads need the object size first (one extra metadata request)
+GCS_PARALLEL_DOWNLOAD = os.getenv("GCS_PARALLEL_DOWNLOAD", "false").lower() == "true"
+
+# Total time budget for retrying a transient upload / download failure (seconds)
+GCS_RETRY_DEADLINE = float(os.getenv("GCS_RETRY_DEADLINE", "300"))
+
+GCS_RETRY = DEFAULT_RETRY.with_timeout(GCS_RETRY_DEADLINE)
+
 # ==============================================================
 # GCS Client Helper
 # ==============================================================
 def get_gcs_client() -> storage.Client:
     """
-    Creates and returns a Google Cloud Storage client.
+    Returns the shared, process-wide Google Cloud Storage client.
     The GOOGLE_APPLICATION_CREDENTIALS environment variable must point to your JSON key.
     """
     try:
-        client = storage.Client()
-        return client
+        return get_storage_client()
     except Exception as e:
         logging.error(f"❌ Failed to initialize GCS client: {e}")
         raise
 
+def _parallel_workers(client, size: int, max_workers: Optional[int]) -> int:
+    """
+    Number of slice workers for a transfer of `size` bytes; 0 means single stream.
+    The in-memory fake client has no transfer manager support.
+    """
+    workers = GCS_TRANSFER_WORKERS if max_workers is None else max_workers
+    if workers <= 1 or size < GCS_PARALLEL_THRESHOLD or not isinstance(client, storage.Client):
+        return 0
+    return workers
+
 # ==============================================================
 # Upload File
 # ==============================================================
-def upload_to_gcp_bucket(local_path: str, bucket_path: str) -> str:
+def upload_to_gcp_bucket(local_path: str, bucket_path: str, max_workers: Optional[int] = None) -> str:
     """
     Uploads a file from local path to the specified path in GCS.
-    Makes the file public and returns its public URL.
+    Large files are sent as parallel slices, mid-sized ones as a chunked
+    resumable upload; transient errors are retried. Returns the public URL.
     """
     try:
         client = get_gcs_client()
         bucket = client.bucket(bucket_name)
         blob = bucket.blob(bucket_path)
+        size = os.path.getsize(local_path)
 
-        blob.upload_from_filename(local_path)
+        workers = _parallel_workers(client, size, max_workers)
+        if workers:
+            transfer_manager.upload_chunks_concurrently(
+                local_path, blob,
+                chunk_size=GCS_SLICE_SIZE,
+                worker_type=transfer_manager.THREAD,
+                max_workers=workers,
+                retry=GCS_RETRY
+            )
+        else:
+            blob.chunk_size = GCS_UPLOAD_CHUNK_SIZE if size > GCS_UPLOAD_CHUNK_SIZE else None
+            blob.upload_from_filename(local_path, retry=GCS_RETRY)
         #blob.make_public()
 
         public_url = f"https://storage.googleapis.com/{bucket_name}/{bucket_path}"
@@ -57,55 +107,129 @@ def upload_to_gcp_bucket(local_path: str, bucket_path: str) -> str:
         raise
 
 # ==============================================================
-# Download File
+# Streaming (resumable) Upload
 # ==============================================================
-def download_from_gcp_bucket(bucket_path: str, local_path: str) -> None:
+# Must be a multiple of 256 KB for resumable uploads
+GCS_STREAM_CHUNK_SIZE = int(os.getenv("GCS_STREAM_CHUNK_SIZE", str(4 * 1024 * 1024)))
+
+
+def open_gcp_blob_writer(bucket_path: str, content_type: str = "application/octet-stream"):
     """
-    Downloads a file from GCS to local path.
+    Opens a file-like writer backed by a resumable GCS upload.
+    Data is sent in GCS_STREAM_CHUNK_SIZE pieces as it is written; the object
+    is only finalised when the writer is closed. Callers that do not want the
+    object (failed producer, duplicate data) must abort_gcp_blob_writer() instead.
     """
     try:
         client = get_gcs_client()
         bucket = client.bucket(bucket_name)
         blob = bucket.blob(bucket_path)
+        return blob.open("wb", chunk_size=GCS_STREAM_CHUNK_SIZE, content_type=content_type, retry=GCS_RETRY)
 
-        if not blob.exists():
-            raise FileNotFoundError(f"File {bucket_path} not found in GCS bucket {bucket_name}")
+    except GoogleAPICallError as e:
+        logging.error(f"❌ GCS API error while opening resumable upload: {e}")
+        raise
 
-        blob.download_to_filename(local_path)
+
+def abort_gcp_blob_writer(writer) -> None:
+    """
+    Cancels the resumable session behind a writer from open_gcp_blob_writer()
+    (DELETE on the session URI) and discards its buffer, so nothing is
+    finalised or left open. Never raises.
+    """
+    try:
+        # The session is only started once the first chunk is full. BlobWriter has no
+        # public cancel (3.x terminate() sends its DELETE to the initiation URL).
+        upload_and_transport = getattr(writer, "_upload_and_transport", None)
+        if upload_and_transport:
+            upload, transport = upload_and_transport
+            writer._upload_and_transport = None
+            if upload.resumable_url:
+                transport.delete(upload.resumable_url)
+    except Exception as e:
+        logging.warning(f"⚠️ Could not cancel resumable upload: {e}")
+
+    try:
+        if hasattr(writer, "terminate"):
+            writer.terminate()
+        else:
+            # 2.x BlobWriter: close() (also run on garbage collection) would
+            # finalise the object, so close only the buffer
+            writer._buffer.close()
+    except Exception as e:
+        logging.warning(f"⚠️ Could not discard resumable upload buffer: {e}")
+
+# ==============================================================
+# Download File
+# ==============================================================
+def download_from_gcp_bucket(bucket_path: str, local_path: str, max_workers: Optional[int] = None) -> None:
+    """
+    Downloads a file from GCS to local path (one request). With
+    GCS_PARALLEL_DOWNLOAD, large objects are fetched as parallel ranged reads.
+    The object is written to a temp file that replaces local_path only on success,
+    so a failed download never touches an existing file.
+    Raises FileNotFoundError when the object does not exist.
+    """
+    tmp_path = f"{local_path}.{uuid.uuid4().hex[:8]}.part"
+    try:
+        client = get_gcs_client()
+        bucket = client.bucket(bucket_name)
+
+        blob = None
+        if GCS_PARALLEL_DOWNLOAD and isinstance(client, storage.Client):
+            blob = bucket.get_blob(bucket_path, retry=GCS_RETRY)
+            if blob is None:
+                raise NotFound(f"{bucket_path} does not exist")
+
+        workers = _parallel_workers(client, blob.size, max_workers) if blob is not None else 0
+        if workers:
+            transfer_manager.download_chunks_concurrently(
+                blob, tmp_path,
+                chunk_size=GCS_SLICE_SIZE,
+                download_kwargs={"retry": GCS_RETRY},
+                worker_type=transfer_manager.THREAD,
+                max_workers=workers
+            )
+        else:
+            blob = blob or bucket.blob(bucket_path)
+            blob.download_to_filename(tmp_path, retry=GCS_RETRY)
+        os.replace(tmp_path, local_path)
         logging.info(f"✅ Downloaded gs://{bucket_name}/{bucket_path} → {local_path}")
 
-    except NotFound:
+    except NotFound as e:
         logging.error(f"❌ File not found: {bucket_path}")
-        raise
+        raise FileNotFoundError(f"File {bucket_path} not found in GCS bucket {bucket_name}") from e
     except GoogleAPICallError as e:
         logging.error(f"❌ GCS API error while downloading: {e}")
         raise
     except Exception as e:
         logging.error(f"❌ Unexpected error downloading from GCS: {e}")
         raise
+    finally:
+        # Don't leave a partial/empty file behind
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
 # ==============================================================
 # Read Text File
 # ==============================================================
 def read_text_from_gcp_bucket(bucket_path: str) -> str:
     """
-    Reads a text file directly from GCS and returns its content as a string.
+    Reads a text file directly from GCS and returns its content as a string (one request).
+    Raises FileNotFoundError when the object does not exist.
     """
     try:
         client = get_gcs_client()
         bucket = client.bucket(bucket_name)
         blob = bucket.blob(bucket_path)
 
-        if not blob.exists():
-            raise FileNotFoundError(f"File {bucket_path} not found in GCS bucket {bucket_name}")
-
         text_data = blob.download_as_text()
         logging.info(f"✅ Read text from gs://{bucket_name}/{bucket_path}")
         return text_data
 
-    except NotFound:
+    except NotFound as e:
         logging.error(f"❌ File not found: {bucket_path}")
-        raise
+        raise FileNotFoundError(f"File {bucket_path} not found in GCS bucket {bucket_name}") from e
     except GoogleAPICallError as e:
         logging.error(f"❌ GCS API error while reading text: {e}")
         raise
@@ -118,22 +242,21 @@ def read_text_from_gcp_bucket(bucket_path: str) -> str:
 # ==============================================================
 def delete_from_gcp_bucket(bucket_path: str) -> bool:
     """
-    Deletes a file from GCS bucket.
-    Returns True if deleted successfully.
+    Deletes a file from GCS bucket (one request).
+    Returns True if deleted, False if it did not exist.
     """
     try:
         client = get_gcs_client()
         bucket = client.bucket(bucket_name)
         blob = bucket.blob(bucket_path)
 
-        if not blob.exists():
-            logging.warning(f"⚠️ File not found in bucket: {bucket_path}")
-            return False
-
         blob.delete()
         logging.info(f"🗑️ Deleted gs://{bucket_name}/{bucket_path}")
         return True
 
+    except NotFound:
+        logging.warning(f"⚠️ File not found in bucket: {bucket_path}")
+        return False
     except Exception as e:
         logging.error(f"❌ Failed to delete file from GCS: {e}")
         raise
@@ -0,0 +1,139 @@
+import os
+import logging
+from typing import Optional
+
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models import TaskQuestion, HrRound, CulturalFit
+from services.response_queries import RESPONSE_MODELS
+from services.question_bank import QUESTION_BANK_CACHE, get_question_bank
+from services.report_generation import schedule_report, aschedule_report
+
+# ==============================================================
+# Configuration
+# ==============================================================
+# Queue the round's report as soon as its last expected answer is stored
+AUTO_REPORT_ON_COMPLETE = os.getenv("AUTO_REPORT_ON_COMPLETE", "true").lower() == "true"
+
+# HR and cultural candidates get the whole bank when no set was recorded for the task
+BANK_ROUND_MODELS = {"hr": HrRound, "cultural": CulturalFit}
+
+# ==============================================================
+# Issued question sets
+# ==============================================================
+def _issued_rows(task_id: str, round_type: str, question_ids: list[int]) -> list[TaskQuestion]:
+    return [
+        TaskQuestion(task_id=task_id, round_type=round_type, question_id=qid)
+        for qid in dict.fromkeys(question_ids)
+    ]
+
+
+async def arecord_issued_questions(db: AsyncSession, task_id: str, round_type: str, question_ids: list[int]) -> None:
+    """
+    Remembers which questions a task was given. A re-issue replaces the previous set.
+    """
+    round_type = round_type.lower()
+    await db.execute(
+        delete(TaskQuestion).where(TaskQuestion.task_id == task_id, TaskQuestion.round_type == round_type)
+    )
+    db.add_all(_issued_rows(task_id, round_type, question_ids))
+    await db.commit()
+
+
+def _issued_query(task_id: str, round_type: str):
+    return select(TaskQuestion.question_id).where(
+        TaskQuestion.task_id == task_id, TaskQuestion.round_type == round_type
+    )
+
+
+def _answered_query(task_id: str, round_type: str):
+    model = RESPONSE_MODELS[round_type]
+    return select(model.question_id).where(model.task_id == task_id)
+
+
+def _bank_question_ids(round_type: str) -> Optional[set[int]]:
+    if QUESTION_BANK_CACHE:
+        bank = get_question_bank()
+        questions = bank.hr if round_type == "hr" else bank.cultural
+        return {q.id for q in questions}
+    return None
+
+
+def _is_complete(expected: set[int], answered: set[int]) -> bool:
+    return bool(expected) and expected <= answered
+
+# ==============================================================
+# Completion check → report scheduling
+# ==============================================================
+def expected_question_ids(db: Session, task_id: str, round_type: str) -> set[int]:
+    """
+    The issued set for the task, else the whole bank for HR / cultural rounds.
+    An empty set means "unknown" (e.g. technical questions fetched without task_id).
+    """
+    expected = set(db.execute(_issued_query(task_id, round_type)).scalars())
+    if expected or round_type not in BANK_ROUND_MODELS:
+        return expected
+
+    bank_ids = _bank_question_ids(round_type)
+    if bank_ids is None:
+        model = BANK_ROUND_MODELS[round_type]
+        bank_ids = set(db.execute(select(model.id)).scalars())
+    return bank_ids
+
+
+async def aexpected_question_ids(db: AsyncSession, task_id: str, round_type: str) -> set[int]:
+    expected = set((await db.execute(_issued_query(task_id, round_type))).scalars())
+    if expected or round_type not in BANK_ROUND_MODELS:
+        return expected
+
+    bank_ids = _bank_question_ids(round_type)
+    if bank_ids is None:
+        model = BANK_ROUND_MODELS[round_type]
+        bank_ids = set((await db.execute(select(model.id))).scalars())
+    return bank_ids
+
+
+def maybe_schedule_report(db: Session, task_id: str, round_type: str) -> bool:
+    """
+    Queues the round's report when every expected answer of the task is stored.
+    Never raises: the stored transcript must not be affected by a scheduling problem.
+    """
+    if not AUTO_REPORT_ON_COMPLETE:
+        return False
+
+    round_type = round_type.lower()
+    try:
+        expected = expected_question_ids(db, task_id, round_type)
+        answered = set(db.execute(_answered_query(task_id, round_type)).scalars())
+        if not _is_complete(expected, answered):
+            return False
+
+        job = schedule_report(db, round_type, task_id)
+        logging.info(f"📝 All {len(expected)} {round_type} answers in for {task_id}, report job {job.id} queued")
+        return True
+    except Exception as e:
+        db.rollback()
+        logging.error(f"❌ Could not schedule {round_type} report for {task_id}: {e}")
+        return False
+
+
+async def amaybe_schedule_report(db: AsyncSession, task_id: str, round_type: str) -> bool:
+    if not AUTO_REPORT_ON_COMPLETE:
+        return False
+
+    round_type = round_type.lower()
+    try:
+        expected = await aexpected_question_ids(db, task_id, round_type)
+        answered = set((await db.execute(_answered_query(task_id, round_type))).scalars())
+        if not _is_complete(expected, answered):
+            return False
+
+        job = await aschedule_report(db, round_type, task_id)
+        logging.info(f"📝 All {len(expected)} {round_type} answers in for {task_id}, report job {job.id} queued")
+        return True
+    except Exception as e:
+        await db.rollback()
+        logging.error(f"❌ Could not schedule {round_type} report for {task_id}: {e}")
+        return False
@@ -0,0 +1,404 @@
+import os
+import json
+import asyncio
+import uuid
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, engine
+from models import BackgroundJob
+
+# ==============================================================
+# Configuration
+# ==============================================================
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "1800"))
+
+# How often stale "running" jobs are swept back into the queue while workers run (seconds)
+JOB_STALE_SWEEP_INTERVAL = float(os.getenv("JOB_STALE_SWEEP_INTERVAL", "60"))
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+_handlers: dict[str, Callable[[dict], dict]] = {}
+_workers: list[threading.Thread] = []
+_stop_event = threading.Event()
+_sweeper: Optional[threading.Thread] = None
+
+# One wakeup event per job kind, shared by the worker pool that serves it,
+# so a new report job does not wake the transcription workers (and vice versa)
+_wakeups: dict[str, threading.Event] = {}
+
+# ==============================================================
+# Setup
+# ==============================================================
+def register_handler(kind: str, handler: Callable[[dict], dict]) -> None:
+    """
+    Registers the function that processes jobs of the given kind.
+    The handler receives the job payload and returns a JSON-serialisable result.
+    """
+    _handlers[kind] = handler
+
+
+def _notify(kind: str) -> None:
+    event = _wakeups.get(kind)
+    if event is not None:
+        event.set()
+
+
+def ensure_job_table() -> None:
+    """
+    Creates the background_jobs table if it is missing (handy for local SQLite runs).
+    """
+    BackgroundJob.__table__.create(bind=engine, checkfirst=True)
+
+# ==============================================================
+# Producer API
+# ==============================================================
+def _new_job(kind: str, payload: dict, dedup_key: str, status: str) -> BackgroundJob:
+    return BackgroundJob(
+        id=str(uuid.uuid4()),
+        kind=kind,
+        status=status,
+        dedup_key=dedup_key,
+        payload=json.dumps(payload)
+    )
+
+
+def _reset_job(job: BackgroundJob, payload: dict, status: str) -> None:
+    job.status = status
+    job.payload = json.dumps(payload)
+    job.result = None
+    job.error = None
+
+
+def _finish_values(status: str, result: dict = None, error: str = None) -> dict:
+    return {
+        "status": status,
+        "result": json.dumps(result) if result is not None else None,
+        "error": error
+    }
+
+# --------------------------------------------------------------
+# Sync sessions (worker threads, thread-pool pipelines)
+# --------------------------------------------------------------
+def create_job(
+    db: Session, kind: str, payload: dict, dedup_key: str = None, status: str = JOB_QUEUED
+) -> tuple[BackgroundJob, bool]:
+    """
+    Inserts a job row. When dedup_key is already taken the existing job is
+    returned instead, so retries join the original job.
+    Returns (job, created).
+    """
+    job = _new_job(kind, payload, dedup_key, status)
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        existing = get_job_by_key(db, dedup_key)
+        if existing is None:
+            raise
+        return existing, False
+
+    db.refresh(job)
+    if status == JOB_QUEUED:
+        _notify(kind)
+    return job, True
+
+
+def enqueue_job(db: Session, kind: str, payload: dict, dedup_key: str = None) -> BackgroundJob:
+    """
+    Persists a new queued job and wakes up the local workers.
+    A failed job with the same dedup_key is re-queued with the new payload.
+    """
+    job, created = create_job(db, kind, payload, dedup_key)
+    if not created and job.status == JOB_FAILED:
+        job = restart_job(db, job, payload, JOB_QUEUED)
+    return job
+
+
+def restart_job(db: Session, job: BackgroundJob, payload: dict, status: str) -> BackgroundJob:
+    _reset_job(job, payload, status)
+    db.commit()
+    db.refresh(job)
+
+    if status == JOB_QUEUED:
+        _notify(job.kind)
+    return job
+
+
+def get_job(db: Session, job_id: str) -> Optional[BackgroundJob]:
+    return db.get(BackgroundJob, job_id)
+
+
+def get_job_by_key(db: Session, dedup_key: str) -> Optional[BackgroundJob]:
+    if dedup_key is None:
+        return None
+    return db.execute(select(BackgroundJob).where(BackgroundJob.dedup_key == dedup_key)).scalars().first()
+
+
+def finish_job(db: Session, job_id: str, status: str, result: dict = None, error: str = None) -> None:
+    db.execute(
+        update(BackgroundJob)
+        .where(BackgroundJob.id == job_id)
+        .values(**_finish_values(status, result, error))
+    )
+    db.commit()
+
+def resolve_failed_job(db: Session, dedup_key: str, result: dict) -> None:
+    """
+    Marks a failed job as done when its work later succeeded outside the queue
+    (e.g. an inline request), so its status no longer reports the old failure.
+    """
+    db.execute(
+        update(BackgroundJob)
+        .where(BackgroundJob.dedup_key == dedup_key, BackgroundJob.status == JOB_FAILED)
+        .values(**_finish_values(JOB_DONE, result))
+    )
+    db.commit()
+
+# --------------------------------------------------------------
+# Async sessions (request handlers)
+# --------------------------------------------------------------
+async def acreate_job(
+    db: AsyncSession, kind: str, payload: dict, dedup_key: str = None, status: str = JOB_QUEUED
+) -> tuple[BackgroundJob, bool]:
+    job = _new_job(kind, payload, dedup_key, status)
+    db.add(job)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        existing = await aget_job_by_key(db, dedup_key)
+        if existing is None:
+            raise
+        return existing, False
+
+    await db.refresh(job)
+    if status == JOB_QUEUED:
+        _notify(kind)
+    return job, True
+
+
+async def aenqueue_job(db: AsyncSession, kind: str, payload: dict, dedup_key: str = None) -> BackgroundJob:
+    job, created = await acreate_job(db, kind, payload, dedup_key)
+    if not created and job.status == JOB_FAILED:
+        job = await arestart_job(db, job, payload, JOB_QUEUED)
+    return job
+
+
+async def arestart_job(db: AsyncSession, job: BackgroundJob, payload: dict, status: str) -> BackgroundJob:
+    _reset_job(job, payload, status)
+    await db.commit()
+    await db.refresh(job)
+
+    if status == JOB_QUEUED:
+        _notify(job.kind)
+    return job
+
+
+async def aget_job(db: AsyncSession, job_id: str) -> Optional[BackgroundJob]:
+    return await db.get(BackgroundJob, job_id, populate_existing=True)
+
+
+async def aget_job_by_key(db: AsyncSession, dedup_key: str) -> Optional[BackgroundJob]:
+    if dedup_key is None:
+        return None
+    result = await db.execute(select(BackgroundJob).where(BackgroundJob.dedup_key == dedup_key))
+    return result.scalars().first()
+
+
+async def afinish_job(db: AsyncSession, job_id: str, status: str, result: dict = None, error: str = None) -> None:
+    await db.execute(
+        update(BackgroundJob)
+        .where(BackgroundJob.id == job_id)
+        .values(**_finish_values(status, result, error))
+    )
+    await db.commit()
+
+
+async def wait_for_job(db: AsyncSession, job_id: str, timeout: float, interval: float = 0.5) -> Optional[BackgroundJob]:
+    """
+    Polls until the job is done or failed, or the timeout expires.
+    Returns the latest state of the job.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        job = await aget_job(db, job_id)
+        if job is None or job.status in (JOB_DONE, JOB_FAILED) or loop.time() >= deadline:
+            return job
+        await asyncio.sleep(interval)
+
+
+def job_to_dict(job: BackgroundJob) -> dict:
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "dedup_key": job.dedup_key,
+        "status": job.status,
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at
+    }
+
+# ==============================================================
+# Worker Side
+# ==============================================================
+def claim_next_job(db: Session, kinds: list[str]) -> Optional[BackgroundJob]:
+    """
+    Atomically moves the oldest queued job to "running".
+    On Postgres the candidate row is locked with SKIP LOCKED so concurrent
+    workers never pick the same job; on SQLite the conditional UPDATE does it.
+    """
+    query = (
+        db.query(BackgroundJob.id)
+        .filter(BackgroundJob.status == JOB_QUEUED, BackgroundJob.kind.in_(kinds))
+        .order_by(BackgroundJob.created_at)
+    )
+    if db.bind.dialect.name == "postgresql":
+        query = query.with_for_update(skip_locked=True)
+
+    row = query.first()
+    if not row:
+        db.rollback()
+        return None
+
+    claimed = (
+        db.query(BackgroundJob)
+        .filter(BackgroundJob.id == row.id, BackgroundJob.status == JOB_QUEUED)
+        .update({"status": JOB_RUNNING}, synchronize_session=False)
+    )
+    db.commit()
+
+    if claimed != 1:
+        return None
+    return get_job(db, row.id)
+
+
+def requeue_stale_jobs() -> int:
+    """
+    Puts jobs that have been "running" for too long (e.g. the worker died) back in the queue.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=JOB_STALE_SECONDS)
+    db = SessionLocal()
+    try:
+        count = (
+            db.query(BackgroundJob)
+            .filter(BackgroundJob.status == JOB_RUNNING, BackgroundJob.updated_at < cutoff)
+            .update({"status": JOB_QUEUED}, synchronize_session=False)
+        )
+        db.commit()
+        return count
+    finally:
+        db.close()
+
+
+def run_one_job(kinds: list[str]) -> bool:
+    """
+    Claims and processes a single job. Returns False when the queue is empty.
+    """
+    db = SessionLocal()
+    try:
+        job = claim_next_job(db, kinds)
+        if not job:
+            return False
+
+        handler = _handlers[job.kind]
+        try:
+            result = handler(json.loads(job.payload))
+            finish_job(db, job.id, JOB_DONE, result=result)
+            logging.info(f"✅ Job {job.id} ({job.kind}) done")
+        except Exception as e:
+            db.rollback()
+            logging.error(f"❌ Job {job.id} ({job.kind}) failed: {e}")
+            finish_job(db, job.id, JOB_FAILED, error=str(e))
+        return True
+    finally:
+        db.close()
+
+
+def _worker_loop(kinds: list[str], wakeup: threading.Event) -> None:
+    while not _stop_event.is_set():
+        try:
+            if run_one_job(kinds):
+                continue
+        except Exception as e:
+            logging.error(f"❌ Job worker error: {e}")
+
+        wakeup.wait(JOB_POLL_INTERVAL)
+        wakeup.clear()
+
+
+def _sweep_loop() -> None:
+    """
+    Re-queues stale jobs every JOB_STALE_SWEEP_INTERVAL seconds, so a job whose
+    worker died is picked up again without waiting for a restart.
+    """
+    while not _stop_event.wait(JOB_STALE_SWEEP_INTERVAL):
+        try:
+            count = requeue_stale_jobs()
+        except Exception as e:
+            logging.error(f"❌ Stale job sweep failed: {e}")
+            continue
+
+        if count:
+            logging.warning(f"⚠️ Re-queued {count} stale job(s)")
+            for event in _wakeups.values():
+                event.set()
+
+
+def start_workers(kinds: list[str] = None, count: int = JOB_WORKERS) -> None:
+    """
+    Starts `count` daemon threads that process jobs of the given kinds
+    (all registered kinds by default), plus the process-wide stale job sweeper.
+    """
+    global _sweeper
+    kinds = kinds or list(_handlers)
+    ensure_job_table()
+    requeue_stale_jobs()
+    _stop_event.clear()
+
+    wakeup = threading.Event()
+    for kind in kinds:
+        _wakeups[kind] = wakeup
+
+    for i in range(count):
+        worker = threading.Thread(
+            target=_worker_loop, args=(kinds, wakeup), name=f"job-worker-{'-'.join(kinds)}-{i}", daemon=True
+        )
+        worker.start()
+        _workers.append(worker)
+
+    if _sweeper is None:
+        _sweeper = threading.Thread(target=_sweep_loop, name="job-sweeper", daemon=True)
+        _sweeper.start()
+
+    logging.info(f"🚀 Started {count} job worker(s) for {kinds}")
+
+
+def stop_workers(timeout: float = 5.0) -> None:
+    global _sweeper
+    _stop_event.set()
+    for event in _wakeups.values():
+        event.set()
+    for worker in _workers:
+        worker.join(timeout)
+    _workers.clear()
+
+    if _sweeper is not None:
+        _sweeper.join(timeout)
+        _sweeper = None
+    _wakeups.clear()
@@ -0,0 +1,231 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from models import LlmCacheEntry
+from services.disk_lru import DiskLruCache
+
+# ==============================================================
+# Configuration
+# ==============================================================
+# Persistent tier: "disk" (local LRU directory), "db" (llm_cache table),
+# "memory" (in-process LRU only) or "none" (no caching)
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "disk").lower()
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", "cache/llm")
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Entries older than this are ignored and replaced (seconds, default 7 days)
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# Per-process in-memory LRU in front of the persistent tier
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "256"))
+
+# ==============================================================
+# Keys
+# ==============================================================
+def llm_cache_key(model_name: str, template_version: str, generation_config: dict, formatted_input: str) -> str:
+    """
+    SHA-256 of everything that shapes the model's answer. Bump the template
+    version whenever the prompt wording of a generator changes.
+    """
+    material = json.dumps(
+        [model_name, template_version, generation_config, formatted_input],
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+# ==============================================================
+# Memory tier (LRU with TTL)
+# ==============================================================
+class MemoryLlmCache:
+    def __init__(self, max_entries: int = LLM_CACHE_MEMORY_ENTRIES, ttl: int = LLM_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()    # key -> (expires_at monotonic, text)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, text = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return text
+
+    def set(self, key: str, text: str, ttl: Optional[float] = None) -> None:
+        if self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+# ==============================================================
+# Disk tier (size-bounded LRU)
+# ==============================================================
+class DiskLlmCache(DiskLruCache):
+    """
+    One JSON file per key in a size-bounded LRU directory, like the transcript cache.
+    """
+
+    def __init__(self, directory: str = LLM_CACHE_DIR, max_bytes: int = LLM_CACHE_MAX_BYTES,
+                 ttl: int = LLM_CACHE_TTL_SECONDS):
+        super().__init__(directory, max_bytes)
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[tuple[str, float]]:
+        """
+        Returns (text, seconds left to live), or None when missing or expired.
+        """
+        entry = self.read(key)
+        if entry is None:
+            return None
+
+        remaining = entry["created_at"] + self.ttl - time.time()
+        if remaining <= 0:
+            self.remove(key)
+            return None
+
+        self.touch(key)
+        return entry["text"], remaining
+
+    def set(self, key: str, text: str, model_name: str) -> None:
+        self.write(key, {"text": text, "model": model_name, "created_at": time.time()})
+
+# ==============================================================
+# Postgres tier
+# ==============================================================
+class DbLlmCache:
+    """
+    Stores responses in the llm_cache table, shared by all workers.
+    """
+
+    def __init__(self, ttl: int = LLM_CACHE_TTL_SECONDS):
+        # Imported here so the report generators do not need a database for the other tiers
+        from database import SessionLocal, engine
+        self.ttl = ttl
+        self._sessions = SessionLocal
+        LlmCacheEntry.__table__.create(bind=engine, checkfirst=True)
+
+    def get(self, key: str) -> Optional[tuple[str, float]]:
+        db = self._sessions()
+        try:
+            entry = db.get(LlmCacheEntry, key)
+            if not entry:
+                return None
+            # SQLite hands back naive datetimes
+            expires_at = entry.expires_at if entry.expires_at.tzinfo else entry.expires_at.replace(tzinfo=timezone.utc)
+            remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
+            if remaining <= 0:
+                db.delete(entry)
+                db.commit()
+                return None
+            return entry.response, remaining
+        finally:
+            db.close()
+
+    def set(self, key: str, text: str, model_name: str) -> None:
+        db = self._sessions()
+        try:
+            now = datetime.now(timezone.utc)
+            db.merge(LlmCacheEntry(
+                cache_key=key,
+                model=model_name,
+                response=text,
+                created_at=now,
+                expires_at=now + timedelta(seconds=self.ttl)
+            ))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logging.warning(f"⚠️ Could not store LLM response in cache: {e}")
+        finally:
+            db.close()
+
+# ==============================================================
+# Two-tier cache
+# ==============================================================
+class LlmResponseCache:
+    """
+    Memory LRU in front of a persistent tier. Persistent hits are promoted
+    to memory for the rest of their lifetime.
+    """
+
+    def __init__(self, memory: MemoryLlmCache, persistent=None):
+        self.memory = memory
+        self.persistent = persistent
+        self.counters = Counter()
+
+    def get(self, key: str) -> Optional[str]:
+        text = self.memory.get(key)
+        if text is not None:
+            self.counters["memory_hits"] += 1
+            return text
+
+        if self.persistent is not None:
+            try:
+                hit = self.persistent.get(key)
+            except Exception as e:
+                logging.warning(f"⚠️ LLM cache lookup failed: {e}")
+                hit = None
+            if hit is not None:
+                text, remaining = hit
+                self.memory.set(key, text, ttl=remaining)
+                self.counters["persistent_hits"] += 1
+                return text
+
+        self.counters["misses"] += 1
+        return None
+
+    def set(self, key: str, text: str, model_name: str) -> None:
+        self.memory.set(key, text)
+        if self.persistent is not None:
+            try:
+                self.persistent.set(key, text, model_name)
+            except Exception as e:
+                logging.warning(f"⚠️ Could not store LLM response in cache: {e}")
+
+    def stats(self) -> dict:
+        return {key: self.counters[key] for key in ("memory_hits", "persistent_hits", "misses")}
+
+# ==============================================================
+# Backend selection
+# ==============================================================
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LlmResponseCache]:
+    """
+    Returns the configured two-tier cache, or None when caching is disabled.
+    """
+    global _cache
+    if LLM_CACHE_BACKEND == "none":
+        return None
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                persistent = None
+                if LLM_CACHE_BACKEND == "db":
+                    persistent = DbLlmCache()
+                elif LLM_CACHE_BACKEND == "disk":
+                    persistent = DiskLlmCache()
+                _cache = LlmResponseCache(MemoryLlmCache(), persistent)
+    return _cache
@@ -0,0 +1,245 @@
+import os
+import select
+import logging
+import threading
+from array import array
+from collections import namedtuple
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select as sa_select, update
+
+from database import SessionLocal, engine
+from models import HrRound, CulturalFit, TechnicalRound, QuestionBankVersion
+
+# ==============================================================
+# Configuration
+# ==============================================================
+# When false, the question routes query the database on every request
+QUESTION_BANK_CACHE = os.getenv("QUESTION_BANK_CACHE", "true").lower() == "true"
+
+# How often the watcher checks question_bank_version (Postgres also wakes up on NOTIFY)
+QUESTION_BANK_POLL_SECONDS = float(os.getenv("QUESTION_BANK_POLL_SECONDS", "30"))
+
+QUESTION_BANK_CHANNEL = "question_bank"
+
+HrQuestionRow = namedtuple("HrQuestionRow", "id question_text")
+TechnicalQuestionRow = namedtuple("TechnicalQuestionRow", "id question answer skill difficulty")
+
+
+def normalize_key(value: Optional[str]) -> str:
+    return (value or "").strip().lower()
+
+# ==============================================================
+# Snapshot
+# ==============================================================
+class QuestionBank:
+    """
+    Immutable snapshot of every question, built once per version.
+
+    technical_ids[skill][difficulty] is an array of question ids, with skill and
+    difficulty normalised to lower case ("" when missing).
+    """
+    __slots__ = ("version", "hr", "cultural", "technical", "technical_ids")
+
+    def __init__(self, version: int, hr: tuple, cultural: tuple, technical: dict, technical_ids: dict):
+        self.version = version
+        self.hr = hr
+        self.cultural = cultural
+        self.technical = technical
+        self.technical_ids = technical_ids
+
+    def skills_matching(self, skill: str, partial: bool) -> list[str]:
+        """
+        Normalised skills equal to (or, when partial, containing) the requested skill.
+        Scans the distinct skills only, not the questions.
+        """
+        if not partial:
+            return [skill] if skill in self.technical_ids else []
+        return [s for s in self.technical_ids if skill in s]
+
+    def technical_questions(self, skills: list[str], partial: bool) -> list[TechnicalQuestionRow]:
+        matched = {s for skill in skills for s in self.skills_matching(skill, partial)}
+        return [
+            self.technical[qid]
+            for s in sorted(matched)
+            for ids in self.technical_ids[s].values()
+            for qid in ids
+        ]
+
+
+def build_question_bank(db, version: int) -> QuestionBank:
+    hr = tuple(
+        HrQuestionRow(*row)
+        for row in db.execute(sa_select(HrRound.id, HrRound.question_text).order_by(HrRound.id))
+    )
+    cultural = tuple(
+        HrQuestionRow(*row)
+        for row in db.execute(sa_select(CulturalFit.id, CulturalFit.question_text).order_by(CulturalFit.id))
+    )
+
+    technical = {}
+    technical_ids = {}
+    rows = db.execute(
+        sa_select(
+            TechnicalRound.id, TechnicalRound.question, TechnicalRound.answer,
+            TechnicalRound.skill, TechnicalRound.difficulty
+        ).order_by(TechnicalRound.id)
+    )
+    for row in rows:
+        question = TechnicalQuestionRow(*row)
+        technical[question.id] = question
+        by_difficulty = technical_ids.setdefault(normalize_key(question.skill), {})
+        by_difficulty.setdefault(normalize_key(question.difficulty), array("l")).append(question.id)
+
+    return QuestionBank(version, hr, cultural, technical, technical_ids)
+
+# ==============================================================
+# Version counter
+# ==============================================================
+def ensure_version_table() -> None:
+    """
+    Creates question_bank_version with its single row if missing (handy for local SQLite runs).
+    On Postgres the triggers in database.sql keep it up to date.
+    """
+    QuestionBankVersion.__table__.create(bind=engine, checkfirst=True)
+    db = SessionLocal()
+    try:
+        if db.get(QuestionBankVersion, 1) is None:
+            db.add(QuestionBankVersion(id=1, version=0))
+            db.commit()
+    finally:
+        db.close()
+
+
+def read_version(db) -> int:
+    return db.execute(sa_select(QuestionBankVersion.version).where(QuestionBankVersion.id == 1)).scalar() or 0
+
+
+def bump_question_bank_version(db) -> None:
+    """
+    Marks the question bank as changed. Needed after writes on databases
+    without the Postgres triggers; harmless (an extra reload) on Postgres.
+    """
+    db.execute(
+        update(QuestionBankVersion)
+        .where(QuestionBankVersion.id == 1)
+        .values(version=QuestionBankVersion.version + 1)
+    )
+    db.commit()
+
+# ==============================================================
+# Process-local cache
+# ==============================================================
+_bank: Optional[QuestionBank] = None
+_load_lock = threading.Lock()
+_watcher: Optional[threading.Thread] = None
+_stop_event = threading.Event()
+
+
+def refresh_question_bank(force: bool = False) -> QuestionBank:
+    """
+    Reloads the snapshot when the stored version differs from the cached one.
+    """
+    global _bank
+    with _load_lock:
+        db = SessionLocal()
+        try:
+            version = read_version(db)
+            if force or _bank is None or _bank.version != version:
+                _bank = build_question_bank(db, version)
+                logging.info(
+                    f"📚 Question bank v{version} loaded: {len(_bank.hr)} HR, "
+                    f"{len(_bank.cultural)} cultural, {len(_bank.technical)} technical"
+                )
+            return _bank
+        finally:
+            db.rollback()
+            db.close()
+
+
+def get_question_bank() -> QuestionBank:
+    return _bank or refresh_question_bank()
+
+
+async def aget_question_bank() -> QuestionBank:
+    # Only the very first call (before the watcher has loaded it) blocks on the database
+    return _bank or await run_in_threadpool(refresh_question_bank)
+
+# ==============================================================
+# Watcher thread
+# ==============================================================
+def _listen_connection():
+    """
+    Raw psycopg2 connection subscribed to the NOTIFY channel, or None when not on Postgres.
+    """
+    if engine.dialect.name != "postgresql":
+        return None
+    try:
+        conn = engine.raw_connection()
+        conn.driver_connection.autocommit = True
+        with conn.driver_connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {QUESTION_BANK_CHANNEL}")
+        return conn
+    except Exception as e:
+        logging.warning(f"⚠️ LISTEN {QUESTION_BANK_CHANNEL} unavailable, polling only: {e}")
+        return None
+
+
+def _wait_for_change(conn) -> None:
+    if conn is None:
+        _stop_event.wait(QUESTION_BANK_POLL_SECONDS)
+        return
+
+    driver_conn = conn.driver_connection
+    select.select([driver_conn], [], [], QUESTION_BANK_POLL_SECONDS)
+    driver_conn.poll()
+    driver_conn.notifies.clear()
+
+
+def _watch_loop() -> None:
+    conn = _listen_connection()
+    try:
+        while not _stop_event.is_set():
+            try:
+                _wait_for_change(conn)
+            except Exception as e:
+                logging.warning(f"⚠️ Question bank listener lost, reconnecting: {e}")
+                conn.invalidate()
+                conn = _listen_connection()
+                _stop_event.wait(QUESTION_BANK_POLL_SECONDS)
+
+            if _stop_event.is_set():
+                break
+            try:
+                refresh_question_bank()
+            except Exception as e:
+                logging.error(f"❌ Question bank refresh failed: {e}")
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+def start_question_bank_watcher() -> None:
+    """
+    Loads the bank and starts a daemon thread that reloads it whenever
+    question_bank_version changes.
+    """
+    global _watcher
+    if not QUESTION_BANK_CACHE or _watcher is not None:
+        return
+
+    ensure_version_table()
+    refresh_question_bank(force=True)
+
+    _stop_event.clear()
+    _watcher = threading.Thread(target=_watch_loop, name="question-bank-watcher", daemon=True)
+    _watcher.start()
+
+
+def stop_question_bank_watcher(timeout: float = 5.0) -> None:
+    global _watcher
+    _stop_event.set()
+    if _watcher is not None:
+        _watcher.join(timeout)
+        _watcher = None
@@ -0,0 +1,312 @@
+"""
+Bulk import / export of the question bank (CSV or JSONL).
+
+Usage:
+    python -m services.question_io import technical questions.csv
+    python -m services.question_io import hr hr_questions.jsonl --batch-size 20000
+    python -m services.question_io export technical technical.csv
+    python -m services.question_io export cultural -          # JSONL to stdout
+
+CSV files need a header row. Technical rows use question, answer, skill, difficulty;
+HR and cultural rows use question_text (or question).
+"""
+import io
+import re
+import csv
+import sys
+import json
+import time
+import argparse
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import select, update, insert, bindparam
+
+from database import SessionLocal, engine
+from models import TechnicalRound, HrRound, CulturalFit
+from services.question_bank import bump_question_bank_version
+
+IMPORT_BATCH_SIZE = 10000
+
+# Per round: model, text column, other columns, columns updated when the question already exists
+ROUNDS = {
+    "technical": (TechnicalRound, "question", ["answer", "skill", "difficulty"], ["answer", "difficulty"]),
+    "hr": (HrRound, "question_text", [], []),
+    "cultural": (CulturalFit, "question_text", [], []),
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Must match the unique indexes in database.sql and models.py
+PG_TEXT_KEY = "lower(regexp_replace(btrim({column}), '\\s+', ' ', 'g'))"
+
+# ==============================================================
+# Normalisation / dedup
+# ==============================================================
+def normalize_text(text: str) -> str:
+    return _WHITESPACE.sub(" ", text.strip()).lower()
+
+
+def question_key(round_type: str, row: dict) -> tuple:
+    """
+    Technical questions are unique per skill; HR and cultural questions by text alone.
+    """
+    _, text_column, _, _ = ROUNDS[round_type]
+    key = (normalize_text(row[text_column]),)
+    if round_type == "technical":
+        key += ((row.get("skill") or "").lower(),)
+    return key
+
+# ==============================================================
+# Readers
+# ==============================================================
+def read_rows(stream, fmt: str) -> Iterator[dict]:
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+        return
+
+    for line_no, line in enumerate(stream, 1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Line {line_no}: {e}")
+
+
+def clean_row(round_type: str, raw: dict) -> Optional[dict]:
+    """
+    Maps an input record onto the table's columns. Returns None when the question text is missing.
+    """
+    _, text_column, columns, _ = ROUNDS[round_type]
+    text = raw.get(text_column) or raw.get("question") or raw.get("question_text")
+    if not text or not str(text).strip():
+        return None
+
+    row = {text_column: str(text).strip()}
+    for column in columns:
+        value = raw.get(column)
+        row[column] = str(value).strip() if value not in (None, "") else None
+    return row
+
+
+def _batches(rows: Iterable, size: int) -> Iterator[list]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+# ==============================================================
+# Writers
+# ==============================================================
+def _copy_upsert(conn, round_type: str, batch: list[dict]) -> tuple[int, int]:
+    """
+    Postgres: COPY the batch into a temp staging table, then one INSERT ... ON CONFLICT.
+    """
+    model, text_column, columns, updatable = ROUNDS[round_type]
+    table = model.__tablename__
+    all_columns = [text_column] + columns
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in batch:
+        writer.writerow([row[c] if row[c] is not None else "\\N" for c in all_columns])
+    buffer.seek(0)
+
+    column_list = ", ".join(all_columns)
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {table}_staging ON COMMIT DELETE ROWS "
+            f"AS SELECT {column_list} FROM {table} WITH NO DATA"
+        )
+        cursor.copy_expert(
+            f"COPY {table}_staging ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buffer
+        )
+
+        conflict_target = [PG_TEXT_KEY.format(column=text_column)]
+        if round_type == "technical":
+            conflict_target.append("lower(coalesce(skill, ''))")
+        if updatable:
+            action = "DO UPDATE SET " + ", ".join(f"{c} = EXCLUDED.{c}" for c in updatable)
+        else:
+            action = "DO NOTHING"
+
+        # Python and Postgres can normalise Unicode whitespace / case differently, so
+        # the staged rows are made unique on the index key too (first copied row wins):
+        # one INSERT may not touch the same row twice. xmax = 0 only for freshly inserted rows
+        index_key = ", ".join(conflict_target)
+        cursor.execute(
+            f"INSERT INTO {table} ({column_list}) "
+            f"SELECT DISTINCT ON ({index_key}) {column_list} FROM {table}_staging ORDER BY {index_key}, ctid "
+            f"ON CONFLICT ({', '.join(f'({t})' for t in conflict_target)}) {action} "
+            f"RETURNING (xmax = 0)"
+        )
+        outcomes = [inserted for (inserted,) in cursor.fetchall()]
+    conn.commit()
+
+    inserted = sum(1 for o in outcomes if o)
+    return inserted, len(outcomes) - inserted
+
+
+def _load_existing_ids(db, round_type: str) -> dict[tuple, int]:
+    model, text_column, _, _ = ROUNDS[round_type]
+    columns = [model.id, getattr(model, text_column)]
+    if round_type == "technical":
+        columns.append(model.skill)
+
+    existing = {}
+    for row in db.execute(select(*columns).execution_options(yield_per=IMPORT_BATCH_SIZE)):
+        record = {text_column: row[1], "skill": row[2] if round_type == "technical" else None}
+        existing[question_key(round_type, record)] = row[0]
+    return existing
+
+
+def _executemany_upsert(db, round_type: str, batch: list[dict], existing: dict[tuple, int]) -> tuple[int, int]:
+    """
+    Other databases: split against the known keys, then one executemany per statement.
+    """
+    model, _, _, updatable = ROUNDS[round_type]
+    new_rows, updates = [], []
+    for row in batch:
+        question_id = existing.get(question_key(round_type, row))
+        if question_id is None:
+            new_rows.append(row)
+        elif updatable:
+            updates.append({"question_id": question_id, **{f"new_{c}": row[c] for c in updatable}})
+
+    if new_rows:
+        db.execute(insert(model), new_rows)
+    if updates:
+        db.execute(
+            update(model.__table__)
+            .where(model.__table__.c.id == bindparam("question_id"))
+            .values({c: bindparam(f"new_{c}") for c in updatable}),
+            updates
+        )
+    db.commit()
+    return len(new_rows), len(updates)
+
+# ==============================================================
+# Import / export
+# ==============================================================
+def import_questions(round_type: str, stream, fmt: str, batch_size: int = IMPORT_BATCH_SIZE, progress=sys.stderr) -> dict:
+    """
+    Streams records into the round's table in batches. Duplicate questions within
+    the file are dropped (first one wins); questions already in the table are updated.
+    """
+    stats = {"read": 0, "inserted": 0, "updated": 0, "duplicates": 0, "invalid": 0}
+    seen = set()
+    start = time.perf_counter()
+
+    def unique_rows():
+        for raw in read_rows(stream, fmt):
+            stats["read"] += 1
+            row = clean_row(round_type, raw)
+            if row is None:
+                stats["invalid"] += 1
+                continue
+            key = question_key(round_type, row)
+            if key in seen:
+                stats["duplicates"] += 1
+                continue
+            seen.add(key)
+            yield row
+
+    use_copy = engine.dialect.name == "postgresql"
+    db = SessionLocal()
+    raw_conn = engine.raw_connection() if use_copy else None
+    try:
+        existing = None if use_copy else _load_existing_ids(db, round_type)
+
+        for batch in _batches(unique_rows(), batch_size):
+            if use_copy:
+                inserted, updated = _copy_upsert(raw_conn.driver_connection, round_type, batch)
+            else:
+                inserted, updated = _executemany_upsert(db, round_type, batch, existing)
+            stats["inserted"] += inserted
+            stats["updated"] += updated
+
+            if progress:
+                elapsed = time.perf_counter() - start
+                print(
+                    f"📥 {stats['read']} read, {stats['inserted']} inserted, {stats['updated']} updated, "
+                    f"{stats['duplicates']} duplicates, {stats['invalid']} invalid "
+                    f"({stats['read'] / elapsed:,.0f} rows/s)",
+                    file=progress
+                )
+
+        bump_question_bank_version(db)
+    finally:
+        if raw_conn is not None:
+            raw_conn.close()
+        db.close()
+
+    stats["seconds"] = round(time.perf_counter() - start, 2)
+    return stats
+
+
+def export_questions(round_type: str, stream, fmt: str) -> int:
+    """
+    Streams the round's questions out in id order without loading the table into memory.
+    """
+    model, text_column, columns, _ = ROUNDS[round_type]
+    all_columns = ["id", text_column] + columns
+    query = select(*[getattr(model, c) for c in all_columns]).order_by(model.id)
+
+    writer = None
+    if fmt == "csv":
+        writer = csv.writer(stream)
+        writer.writerow(all_columns)
+
+    count = 0
+    with engine.connect() as conn:
+        for row in conn.execution_options(stream_results=True, yield_per=IMPORT_BATCH_SIZE).execute(query):
+            if writer:
+                writer.writerow(row)
+            else:
+                stream.write(json.dumps(dict(zip(all_columns, row))) + "\n")
+            count += 1
+    return count
+
+# ==============================================================
+# CLI
+# ==============================================================
+def _detect_format(path: str, fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("round_type", choices=list(ROUNDS))
+    parser.add_argument("path", help='input/output file, or "-" for stdin/stdout')
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="defaults to the file extension (jsonl for -)")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    fmt = _detect_format(args.path, args.format)
+
+    if args.command == "import":
+        stream = sys.stdin if args.path == "-" else open(args.path, "r", encoding="utf-8", newline="")
+        try:
+            stats = import_questions(args.round_type, stream, fmt, args.batch_size)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        print(f"✅ Import finished: {stats}", file=sys.stderr)
+    else:
+        stream = sys.stdout if args.path == "-" else open(args.path, "w", encoding="utf-8", newline="")
+        try:
+            count = export_questions(args.round_type, stream, fmt)
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+        print(f"✅ Exported {count} {args.round_type} questions", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import os
+import random
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Optional
+
+from services.question_bank import QuestionBank, TechnicalQuestionRow, normalize_key
+
+# ==============================================================
+# Configuration
+# ==============================================================
+# Default difficulty mix for technical interviews, e.g. "easy:40,medium:40,hard:20".
+# Empty means no stratification (uniform over every difficulty).
+QUESTION_DIFFICULTY_MIX = os.getenv("QUESTION_DIFFICULTY_MIX", "")
+
+# ==============================================================
+# Difficulty mix
+# ==============================================================
+def parse_difficulty_mix(mix: Optional[str]) -> dict[str, float]:
+    """
+    "easy:40,medium:40,hard:20" → {"easy": 0.4, "medium": 0.4, "hard": 0.2}.
+    Weights may be percentages or fractions; they are normalised to sum to 1.
+    """
+    if not mix:
+        return {}
+
+    weights = {}
+    for part in mix.split(","):
+        if not part.strip():
+            continue
+        difficulty, sep, weight = part.partition(":")
+        if not sep:
+            raise ValueError(f"Expected difficulty:weight, got '{part.strip()}'")
+        value = float(weight)
+        if value < 0:
+            raise ValueError(f"Negative weight for '{difficulty.strip()}'")
+        weights[normalize_key(difficulty)] = weights.get(normalize_key(difficulty), 0.0) + value
+
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Difficulty mix weights must add up to more than 0")
+    return {d: w / total for d, w in weights.items() if w > 0}
+
+
+def allocate_counts(n: int, mix: dict[str, float], available: dict[str, int]) -> dict[str, int]:
+    """
+    Splits n questions across difficulties by largest remainder.
+    A difficulty short on questions hands its shortfall to the others, in mix order.
+    """
+    quotas = {d: n * w for d, w in mix.items()}
+    counts = {d: int(q) for d, q in quotas.items()}
+    by_remainder = sorted(mix, key=lambda d: quotas[d] - counts[d], reverse=True)
+    for d in by_remainder[:n - sum(counts.values())]:
+        counts[d] += 1
+
+    counts = {d: min(c, available.get(d, 0)) for d, c in counts.items()}
+    shortfall = n - sum(counts.values())
+    for d in sorted(mix, key=mix.get, reverse=True):
+        if shortfall <= 0:
+            break
+        extra = min(shortfall, available.get(d, 0) - counts[d])
+        counts[d] += extra
+        shortfall -= extra
+    return counts
+
+# ==============================================================
+# Sampling
+# ==============================================================
+def task_seed(task_id: str, skill: str, n: int, mix: Optional[str]) -> str:
+    # String seeds are hashed with SHA-512 by random.Random, so they are stable across processes
+    return f"{task_id}|{skill}|{n}|{mix or ''}"
+
+
+def _sample_pools(rng: random.Random, pools: list, k: int) -> list[int]:
+    """
+    Picks k distinct ids from several id arrays without concatenating them:
+    sample k positions in the combined range, then map each back with bisect.
+    """
+    ends = list(accumulate(len(p) for p in pools))
+    total = ends[-1] if ends else 0
+    picked = []
+    for position in rng.sample(range(total), min(k, total)):
+        i = bisect_right(ends, position)
+        start = ends[i - 1] if i else 0
+        picked.append(pools[i][position - start])
+    return picked
+
+
+def sample_questions(
+    bank: QuestionBank,
+    skills: list[str],
+    n: int,
+    mix: Optional[dict[str, float]] = None,
+    seed: Optional[str] = None,
+    partial: bool = True
+) -> list[TechnicalQuestionRow]:
+    """
+    Returns up to n technical questions across the given skills, stratified by
+    difficulty when a mix is given. Costs O(n + number of skills), independent
+    of the bank size. The same seed and bank version always give the same questions.
+    """
+    rng = random.Random(seed)
+    matched = sorted({s for skill in skills for s in bank.skills_matching(skill, partial)})
+    if n <= 0 or not matched:
+        return []
+
+    pools_by_difficulty = {}
+    for s in matched:
+        for difficulty, ids in sorted(bank.technical_ids[s].items()):
+            pools_by_difficulty.setdefault(difficulty, []).append(ids)
+
+    if mix:
+        available = {d: sum(len(p) for p in pools_by_difficulty.get(d, [])) for d in mix}
+        counts = allocate_counts(n, mix, available)
+        ids = [
+            qid
+            for d, k in counts.items() if k
+            for qid in _sample_pools(rng, pools_by_difficulty[d], k)
+        ]
+    else:
+        all_pools = [p for d in sorted(pools_by_difficulty) for p in pools_by_difficulty[d]]
+        ids = _sample_pools(rng, all_pools, n)
+
+    rng.shuffle(ids)
+    return [bank.technical[qid] for qid in ids]
@@ -0,0 +1,231 @@
+import os
+import json
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from services.gcp_helper import upload_to_gcp_bucket, bucket_name
+from services.audio_processing import (
+    generate_hr_report_with_gemini,
+    generate_technical_report_with_gemini,
+    generate_cultural_report_with_gemini,
+    hr_report_request,
+    technical_report_request,
+    cultural_report_request,
+    clean_report_text,
+    parse_cultural_output,
+    generate_with_llm,
+    astream_with_llm,
+    REPORT_OUTPUT_FORMAT,
+    structured_report_request,
+    parse_structured_report
+)
+from schemas import HRReport, TechnicalReport, CulturalReport
+from services.response_queries import load_responses_with_questions_sync, build_qa_pairs
+from services.report_store import store_report
+from services.job_queue import (
+    JOB_QUEUED, JOB_RUNNING, create_job, restart_job, resolve_failed_job, acreate_job, arestart_job
+)
+
+# ==============================================================
+# Configuration
+# ==============================================================
+REPORT_JOB = "report"
+
+# When true, POST /reports/* enqueues the report and returns 202 (overridable per request)
+REPORT_JOB_MODE = os.getenv("REPORT_JOB_MODE", "false").lower() == "true"
+
+# Worker threads per process building reports (bounds concurrent Gemini calls)
+REPORT_JOB_WORKERS = int(os.getenv("REPORT_JOB_WORKERS", "2"))
+
+REPORT_DIR = "Reports"
+
+# generator: blocking end-to-end call; request / finish: prompt builder and
+# post-processing of the raw model text, used by the streaming variant;
+# schema: report model of the structured (REPORT_OUTPUT_FORMAT=json) mode
+REPORT_ROUNDS = {
+    "hr": {
+        "label": "HR",
+        "generator": generate_hr_report_with_gemini,
+        "request": hr_report_request,
+        "finish": clean_report_text,
+        "schema": HRReport
+    },
+    "technical": {
+        "label": "Technical",
+        "generator": generate_technical_report_with_gemini,
+        "request": technical_report_request,
+        "finish": clean_report_text,
+        "schema": TechnicalReport
+    },
+    "cultural": {
+        "label": "Cultural",
+        "generator": generate_cultural_report_with_gemini,
+        "request": cultural_report_request,
+        "finish": parse_cultural_output,
+        "schema": CulturalReport
+    },
+}
+
+# ==============================================================
+# Paths
+# ==============================================================
+def report_bucket_path(round_type: str, task_id: str) -> str:
+    return f"reports/{task_id}_{round_type}.txt"
+
+
+def report_url(round_type: str, task_id: str) -> str:
+    return f"https://storage.googleapis.com/{bucket_name}/{report_bucket_path(round_type, task_id)}"
+
+
+def report_dedup_key(round_type: str, task_id: str) -> str:
+    return f"report:{round_type}:{task_id}"
+
+# ==============================================================
+# Generation
+# ==============================================================
+def report_text(report) -> str:
+    # Structured results (the cultural generator returns a dict) are stored as JSON
+    if isinstance(report, str):
+        return report
+    return json.dumps(report, indent=2, ensure_ascii=False)
+
+
+def save_report(local_path: str, report: str, bucket_path: str) -> None:
+    """
+    Writes the report locally and uploads it to GCS (blocking).
+    """
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    with open(local_path, "w", encoding="utf-8") as f:
+        f.write(report)
+
+    upload_to_gcp_bucket(local_path, bucket_path)
+
+
+def structured_output() -> bool:
+    return REPORT_OUTPUT_FORMAT == "json"
+
+
+def report_request(round_type: str, qa_pairs: list[dict]) -> dict:
+    spec = REPORT_ROUNDS[round_type]
+    request = spec["request"](qa_pairs)
+    return structured_report_request(request, spec["schema"]) if structured_output() else request
+
+
+def finish_report(round_type: str, text: str) -> tuple:
+    """
+    Raw model text → (stored report text, structured report or None).
+    """
+    spec = REPORT_ROUNDS[round_type]
+    if structured_output():
+        structured = parse_structured_report(text, spec["schema"])
+        return structured.model_dump_json(indent=2), structured
+    return report_text(spec["finish"](text)), None
+
+
+def persist_report(round_type: str, task_id: str, report: str, structured=None) -> dict:
+    """
+    Saves a finished report to Reports/, GCS and the report store (blocking).
+    """
+    local_path = f"{REPORT_DIR}/{task_id}_{round_type}.txt"
+    save_report(local_path, report, report_bucket_path(round_type, task_id))
+    store_report(round_type, task_id, report, structured)
+
+    # OPTIONAL: delete local copy
+    # os.remove(local_path)
+
+    result = {
+        "task_id": task_id,
+        "report_url": report_url(round_type, task_id),
+        "message": f"{REPORT_ROUNDS[round_type]['label']} report generated"
+    }
+    _clear_failed_build(round_type, task_id, result)
+    return result
+
+
+def _clear_failed_build(round_type: str, task_id: str, result: dict) -> None:
+    # A report built inline or streamed supersedes an earlier failed background build
+    db = SessionLocal()
+    try:
+        resolve_failed_job(db, report_dedup_key(round_type, task_id), result)
+    except Exception as e:
+        db.rollback()
+        logging.warning(f"⚠️ Could not clear failed {round_type} report job for {task_id}: {e}")
+    finally:
+        db.close()
+
+
+def generate_report(round_type: str, task_id: str, qa_pairs: list[dict], force_refresh: bool = False) -> dict:
+    """
+    Runs the Gemini generator for the round and stores the result (blocking).
+    force_refresh bypasses the LLM response cache.
+    """
+    if structured_output():
+        text = generate_with_llm(**report_request(round_type, qa_pairs), force_refresh=force_refresh)
+        report, structured = finish_report(round_type, text)
+        return persist_report(round_type, task_id, report, structured)
+
+    spec = REPORT_ROUNDS[round_type]
+    report = report_text(spec["generator"](qa_pairs, force_refresh=force_refresh))
+    return persist_report(round_type, task_id, report)
+
+
+async def astream_report(round_type: str, task_id: str, qa_pairs: list[dict], force_refresh: bool = False):
+    """
+    Yields the report's raw text chunks as Gemini writes them, then persists the
+    finished report like generate_report. Nothing is saved if the stream fails or
+    the consumer stops early.
+    """
+    chunks = []
+    async for chunk in astream_with_llm(**report_request(round_type, qa_pairs), force_refresh=force_refresh):
+        chunks.append(chunk)
+        yield chunk
+
+    report, structured = finish_report(round_type, "".join(chunks))
+    await asyncio.to_thread(persist_report, round_type, task_id, report, structured)
+
+
+def run_report_job(payload: dict) -> dict:
+    """
+    Job handler: loads the task's answers and builds the report.
+    """
+    round_type = payload["round_type"]
+    task_id = payload["task_id"]
+
+    db = SessionLocal()
+    try:
+        responses = load_responses_with_questions_sync(db, round_type, task_id)
+        qa_pairs = build_qa_pairs(round_type, responses)
+    finally:
+        db.close()
+
+    if not qa_pairs:
+        raise LookupError(f"No {round_type} responses for task {task_id}")
+
+    logging.info(f"📝 Building {round_type} report for {task_id} ({len(qa_pairs)} answers)")
+    return generate_report(round_type, task_id, qa_pairs, payload.get("force_refresh", False))
+
+# ==============================================================
+# Scheduling
+# ==============================================================
+def schedule_report(db: Session, round_type: str, task_id: str, force_refresh: bool = False):
+    """
+    Queues a report build. A build that is already queued or running for the
+    same task and round is joined; a finished or failed one is queued again.
+    """
+    payload = {"round_type": round_type, "task_id": task_id, "force_refresh": force_refresh}
+    job, created = create_job(db, REPORT_JOB, payload, report_dedup_key(round_type, task_id))
+    if not created and job.status not in (JOB_QUEUED, JOB_RUNNING):
+        job = restart_job(db, job, payload, JOB_QUEUED)
+    return job
+
+
+async def aschedule_report(db: AsyncSession, round_type: str, task_id: str, force_refresh: bool = False):
+    payload = {"round_type": round_type, "task_id": task_id, "force_refresh": force_refresh}
+    job, created = await acreate_job(db, REPORT_JOB, payload, report_dedup_key(round_type, task_id))
+    if not created and job.status not in (JOB_QUEUED, JOB_RUNNING):
+        job = await arestart_job(db, job, payload, JOB_QUEUED)
+    return job
@@ -0,0 +1,144 @@
+import json
+import hashlib
+import logging
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from pydantic import BaseModel
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import SessionLocal
+from models import InterviewReport
+from services.audio_processing import parse_report_sections
+
+# Structured report fields that also get their own column
+REPORT_SCORE_COLUMNS = (
+    "technical_score", "grammar_score", "confidence",
+    "communication_score", "teamwork_score", "culture_alignment_score", "recommendation"
+)
+_NON_SECTION_FIELDS = set(REPORT_SCORE_COLUMNS) - {"recommendation"}
+
+# ==============================================================
+# Records
+# ==============================================================
+def _report_sections(round_type: str, content: str) -> Optional[str]:
+    if round_type == "cultural":
+        # Text-mode cultural reports are stored as {"report", "scores", "error"} JSON
+        try:
+            content = json.loads(content).get("report") or ""
+        except (ValueError, AttributeError):
+            pass
+    sections = parse_report_sections(content, round_type)
+    return json.dumps(sections) if sections else None
+
+
+def _structured_columns(structured: BaseModel) -> dict:
+    data = structured.model_dump()
+    return {
+        "sections": json.dumps({k: v for k, v in data.items() if k not in _NON_SECTION_FIELDS}),
+        **{k: v for k, v in data.items() if k in REPORT_SCORE_COLUMNS}
+    }
+
+
+def build_report_record(round_type: str, task_id: str, content: str,
+                        structured: Optional[BaseModel] = None) -> InterviewReport:
+    """
+    Text reports get their sections parsed; structured ones fill sections and
+    score columns from the model. Unused score columns are reset to NULL.
+    """
+    columns = {column: None for column in REPORT_SCORE_COLUMNS}
+    if structured is not None:
+        columns.update(_structured_columns(structured))
+    else:
+        columns["sections"] = _report_sections(round_type, content)
+
+    return InterviewReport(
+        task_id=task_id,
+        round_type=round_type,
+        content=content,
+        etag=hashlib.sha256(content.encode("utf-8")).hexdigest()[:32],
+        updated_at=datetime.now(timezone.utc).replace(microsecond=0),
+        **columns
+    )
+
+
+def report_scores(record: InterviewReport) -> Optional[dict]:
+    scores = {column: getattr(record, column) for column in REPORT_SCORE_COLUMNS}
+    return {k: v for k, v in scores.items() if v is not None} or None
+
+
+def store_report(round_type: str, task_id: str, content: str, structured: Optional[BaseModel] = None) -> None:
+    """
+    Saves (or replaces) the report text. GCS stays the source of truth: when the
+    write fails the previous row is dropped, so the GET falls back to GCS instead
+    of serving the stale report and its old ETag.
+    """
+    db = SessionLocal()
+    try:
+        db.merge(build_report_record(round_type, task_id, content, structured))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logging.warning(f"⚠️ Could not store {round_type} report for {task_id}: {e}")
+        _invalidate_report(db, round_type, task_id)
+    finally:
+        db.close()
+
+
+def _invalidate_report(db, round_type: str, task_id: str) -> None:
+    try:
+        db.execute(delete(InterviewReport).where(
+            InterviewReport.task_id == task_id, InterviewReport.round_type == round_type
+        ))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logging.error(f"❌ Stale {round_type} report for {task_id} could not be removed from the store: {e}")
+
+
+async def aget_stored_report(db: AsyncSession, round_type: str, task_id: str) -> Optional[InterviewReport]:
+    return await db.get(InterviewReport, (task_id, round_type))
+
+
+async def astore_report(db: AsyncSession, round_type: str, task_id: str, content: str) -> InterviewReport:
+    record = await db.merge(build_report_record(round_type, task_id, content))
+    await db.commit()
+    return record
+
+# ==============================================================
+# HTTP validators
+# ==============================================================
+def report_etag(record: InterviewReport) -> str:
+    return f'"{record.etag}"'
+
+
+def _updated_at_utc(record: InterviewReport) -> datetime:
+    # SQLite hands back naive datetimes
+    updated_at = record.updated_at
+    return updated_at if updated_at.tzinfo else updated_at.replace(tzinfo=timezone.utc)
+
+
+def report_last_modified(record: InterviewReport) -> str:
+    return format_datetime(_updated_at_utc(record), usegmt=True)
+
+
+def is_not_modified(record: InterviewReport, if_none_match: Optional[str], if_modified_since: Optional[str]) -> bool:
+    """
+    Conditional GET check. If-None-Match wins over If-Modified-Since (RFC 9110).
+    """
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or report_etag(record) in tags
+
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return _updated_at_utc(record).replace(microsecond=0) <= since
+
+    return False
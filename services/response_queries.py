@@ -0,0 +1,59 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+
+from models import HrRoundResponse, TechnicalRoundResponse, CulturalRoundResponse
+
+RESPONSE_MODELS = {
+    "technical": TechnicalRoundResponse,
+    "hr": HrRoundResponse,
+    "cultural": CulturalRoundResponse
+}
+
+# ==============================================================
+# Responses + questions in one round-trip
+# ==============================================================
+def responses_with_questions_query(round_type: str, task_id: str):
+    """
+    Loads a task's responses together with their questions (single JOIN),
+    ordered by question so reports list answers in interview order.
+    """
+    model = RESPONSE_MODELS[round_type.lower()]
+    return (
+        select(model)
+        .options(joinedload(model.question, innerjoin=True))
+        .where(model.task_id == task_id)
+        .order_by(model.question_id, model.id)
+    )
+
+
+async def load_responses_with_questions(db: AsyncSession, round_type: str, task_id: str) -> list:
+    result = await db.execute(responses_with_questions_query(round_type, task_id))
+    return result.scalars().all()
+
+
+def load_responses_with_questions_sync(db: Session, round_type: str, task_id: str) -> list:
+    return db.execute(responses_with_questions_query(round_type, task_id)).scalars().all()
+
+# ==============================================================
+# Shapes used by the report prompts and /responses routes
+# ==============================================================
+def build_qa_pairs(round_type: str, responses: list) -> list[dict]:
+    """
+    Question/answer pairs for the Gemini report prompts.
+    Technical pairs also carry the expected answer.
+    """
+    if round_type.lower() == "technical":
+        return [
+            {
+                "question": r.question.question,
+                "transcript": r.transcript,
+                "correct_answer": r.question.answer
+            }
+            for r in responses
+        ]
+
+    return [
+        {"question": r.question.question_text, "transcript": r.transcript}
+        for r in responses
+    ]
@@ -0,0 +1,127 @@
+import os
+import hashlib
+import logging
+import threading
+from typing import Optional
+
+from database import SessionLocal, engine
+from models import TranscriptCacheEntry
+from services.disk_lru import DiskLruCache
+
+# ==============================================================
+# Configuration
+# ==============================================================
+# "disk" (local LRU directory), "db" (transcript_cache table) or "none"
+TRANSCRIPT_CACHE_BACKEND = os.getenv("TRANSCRIPT_CACHE_BACKEND", "disk").lower()
+TRANSCRIPT_CACHE_DIR = os.getenv("TRANSCRIPT_CACHE_DIR", "cache/transcripts")
+TRANSCRIPT_CACHE_MAX_BYTES = int(os.getenv("TRANSCRIPT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# ==============================================================
+# Keys
+# ==============================================================
+def hash_audio_file(audio_path: str) -> str:
+    """
+    SHA-256 of the extracted audio bytes, read in chunks.
+    """
+    digest = hashlib.sha256()
+    with open(audio_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def transcript_cache_key(audio_hash: str, audio_format: str, language_code: str, model: str) -> str:
+    return hashlib.sha256(f"{audio_hash}|{audio_format}|{language_code}|{model}".encode()).hexdigest()
+
+
+class HashingWriter:
+    """
+    Wraps a writer and hashes everything that passes through it,
+    so streamed audio can be keyed without a second read.
+    """
+
+    def __init__(self, writer):
+        self._writer = writer
+        self._digest = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self._digest.update(data)
+        return self._writer.write(data)
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+# ==============================================================
+# Disk backend (size-bounded LRU)
+# ==============================================================
+class DiskTranscriptCache(DiskLruCache):
+    """
+    One small JSON file per key in a size-bounded LRU directory.
+    """
+
+    def __init__(self, directory: str = TRANSCRIPT_CACHE_DIR, max_bytes: int = TRANSCRIPT_CACHE_MAX_BYTES):
+        super().__init__(directory, max_bytes)
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self.read(key)
+        if entry is not None:
+            self.touch(key)
+        return entry
+
+    def set(self, key: str, transcript: str, audio_url: Optional[str]) -> None:
+        self.write(key, {"transcript": transcript, "audio_url": audio_url})
+
+# ==============================================================
+# Postgres backend
+# ==============================================================
+class DbTranscriptCache:
+    """
+    Stores transcripts in the transcript_cache table, shared by all workers.
+    """
+
+    def __init__(self):
+        TranscriptCacheEntry.__table__.create(bind=engine, checkfirst=True)
+
+    def get(self, key: str) -> Optional[dict]:
+        db = SessionLocal()
+        try:
+            entry = db.get(TranscriptCacheEntry, key)
+            if not entry:
+                return None
+            return {"transcript": entry.transcript, "audio_url": entry.audio_url}
+        finally:
+            db.close()
+
+    def set(self, key: str, transcript: str, audio_url: Optional[str]) -> None:
+        db = SessionLocal()
+        try:
+            db.merge(TranscriptCacheEntry(cache_key=key, transcript=transcript, audio_url=audio_url))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logging.warning(f"⚠️ Could not store transcript in cache: {e}")
+        finally:
+            db.close()
+
+# ==============================================================
+# Backend selection
+# ==============================================================
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_transcript_cache():
+    """
+    Returns the configured cache backend, or None when caching is disabled.
+    """
+    global _cache
+    if TRANSCRIPT_CACHE_BACKEND == "none":
+        return None
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = DbTranscriptCache() if TRANSCRIPT_CACHE_BACKEND == "db" else DiskTranscriptCache()
+    return _cache
@@ -0,0 +1,380 @@
+import os
+import shutil
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import HrRoundResponse, TechnicalRoundResponse, CulturalRoundResponse
+from services.response_queries import RESPONSE_MODELS
+from services.interview_progress import maybe_schedule_report, amaybe_schedule_report
+from services.audio_processing import (
+    AUDIO_CODEC, AUDIO_FORMATS,
+    extract_audio_from_compressed_video, stream_audio_extraction, streaming_audio_format,
+    probe_audio_duration, can_transcribe_inline, is_failed_transcript,
+    transcribe_with_vertex_ai, transcribe_inline_with_vertex_ai,
+    STT_LANGUAGE_CODE, STT_MODEL
+)
+from services.transcript_cache import (
+    get_transcript_cache, hash_audio_file, transcript_cache_key, HashingWriter
+)
+from services.gcp_helper import (
+    upload_to_gcp_bucket, download_from_gcp_bucket, open_gcp_blob_writer, abort_gcp_blob_writer, bucket_name
+)
+
+UPLOAD_DIR = "uploads"
+ROUND_TYPES = ("technical", "hr", "cultural")
+
+TRANSCRIPTION_JOB = "transcription"
+
+# Shared pool that bounds how many answers of batch uploads are processed at once
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "4"))
+_batch_executor = ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS, thread_name_prefix="batch-transcribe")
+
+# ==============================================================
+# Helpers
+# ==============================================================
+def save_upload(file_obj, video_path: str) -> None:
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    with open(video_path, "wb") as f:
+        shutil.copyfileobj(file_obj, f)
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def derive_dedup_key(round_type: str, task_id: str, question_id: int) -> str:
+    """
+    Default idempotency key when the client sends no Idempotency-Key header.
+    """
+    return f"{TRANSCRIPTION_JOB}:{round_type.lower()}:{task_id}:{question_id}"
+
+
+def _existing_response_query(round_type: str, task_id: str, question_id: int):
+    model = RESPONSE_MODELS[round_type.lower()]
+    return (
+        select(model)
+        .where(model.task_id == task_id, model.question_id == question_id)
+        .order_by(model.id)
+        .limit(1)
+    )
+
+
+async def afind_existing_response(db: AsyncSession, round_type: str, task_id: str, question_id: int):
+    result = await db.execute(_existing_response_query(round_type, task_id, question_id))
+    return result.scalars().first()
+
+
+async def afind_answered_questions(db: AsyncSession, round_type: str, task_id: str, question_ids: list[int]) -> set[int]:
+    """
+    The subset of question_ids that already have a stored response, in one query.
+    """
+    model = RESPONSE_MODELS[round_type.lower()]
+    result = await db.execute(
+        select(model.question_id)
+        .where(model.task_id == task_id, model.question_id.in_(question_ids))
+        .distinct()
+    )
+    return set(result.scalars().all())
+
+
+def build_response_record(round_type: str, task_id: str, question_id: int, transcript: str, skill: str = None):
+    """
+    Builds the ORM row for the response table that matches the round type.
+    """
+    round_type_lower = round_type.lower()
+
+    if round_type_lower == "technical":
+        return TechnicalRoundResponse(
+            task_id=task_id,
+            question_id=question_id,
+            transcript=transcript,
+            skill=skill  # ONLY technical has skill
+        )
+    elif round_type_lower == "hr":
+        return HrRoundResponse(
+            task_id=task_id,
+            question_id=question_id,
+            transcript=transcript
+        )
+    elif round_type_lower == "cultural":
+        return CulturalRoundResponse(
+            task_id=task_id,
+            question_id=question_id,
+            transcript=transcript
+        )
+
+    raise ValueError(f"Invalid round type: {round_type}")
+
+
+def _cache_lookup(audio_hash: str, audio_format: str):
+    """
+    Returns (cache, key, entry); entry is None on a miss or when caching is off.
+    A failing cache backend counts as a miss, so it never fails the transcription.
+    """
+    try:
+        cache = get_transcript_cache()
+        if cache is None:
+            return None, None, None
+
+        key = transcript_cache_key(audio_hash, audio_format, STT_LANGUAGE_CODE, STT_MODEL)
+        entry = cache.get(key)
+    except Exception as e:
+        logging.warning(f"⚠️ Transcript cache lookup failed: {e}")
+        return None, None, None
+
+    if entry:
+        logging.info(f"♻️ Transcript cache hit for {audio_hash[:12]}")
+    return cache, key, entry
+
+
+def _cache_store(cache, key: str, transcript: str, gcs_uri) -> None:
+    if cache is None or is_failed_transcript(transcript):
+        return
+    try:
+        cache.set(key, transcript, gcs_uri)
+    except Exception as e:
+        logging.warning(f"⚠️ Could not store transcript in cache: {e}")
+
+# ==============================================================
+# Pipeline
+# ==============================================================
+def transcribe_video_file(video_path: str, base: str) -> tuple[str, str]:
+    """
+    Extracts audio from a saved video and transcribes it.
+    Short clips go straight to the synchronous recognize() API; longer ones
+    are uploaded to GCS and sent to long_running_recognize().
+    Returns (transcript, gcs_uri); gcs_uri is None for the inline path.
+    The local audio file is always removed.
+    """
+    extension = AUDIO_FORMATS[AUDIO_CODEC]["extension"]
+    audio_path = f"{UPLOAD_DIR}/{base}.{extension}"
+    try:
+        extract_audio_from_compressed_video(video_path, audio_path, AUDIO_CODEC)
+
+        # Re-submitted recordings skip the upload and the paid STT call
+        cache, cache_key, cached = _cache_lookup(hash_audio_file(audio_path), AUDIO_CODEC)
+        if cached:
+            return cached["transcript"], cached["audio_url"]
+
+        duration = probe_audio_duration(audio_path)
+        if can_transcribe_inline(audio_path, duration):
+            transcript = transcribe_inline_with_vertex_ai(audio_path, audio_format=AUDIO_CODEC)
+            _cache_store(cache, cache_key, transcript, None)
+            return transcript, None
+
+        gcp_audio_path = f"audios/{base}.{extension}"
+        upload_to_gcp_bucket(audio_path, gcp_audio_path)
+
+        gcs_uri = f"gs://{bucket_name}/{gcp_audio_path}"
+        transcript = transcribe_with_vertex_ai(gcs_uri, audio_format=AUDIO_CODEC)
+        _cache_store(cache, cache_key, transcript, gcs_uri)
+        return transcript, gcs_uri
+    finally:
+        _remove_quietly(audio_path)
+
+
+def transcribe_uploaded_video(video_path: str, base: str) -> tuple[str, str]:
+    """
+    transcribe_video_file() for a saved upload; the upload is removed afterwards.
+    """
+    try:
+        return transcribe_video_file(video_path, base)
+    finally:
+        _remove_quietly(video_path)
+
+
+def run_transcription_pipeline(
+    db: Session,
+    video_path: str,
+    base: str,
+    task_id: str,
+    question_id: int,
+    round_type: str,
+    skill: str = None
+) -> dict:
+    """
+    Full blocking pipeline: ffmpeg → GCS → STT → response row.
+    The uploaded video is removed once processing finishes or fails.
+    """
+    transcript, gcs_uri = transcribe_uploaded_video(video_path, base)
+    return store_transcript(db, task_id, question_id, round_type, skill, transcript, gcs_uri)
+
+
+def transcribe_video_stream(video_stream, base: str) -> tuple[str, str]:
+    """
+    Streams the upload through ffmpeg straight into a resumable GCS upload
+    and transcribes the result. Nothing is written to the local disk.
+    The audio is hashed on the way through, so a cache hit skips STT; the
+    upload is cancelled on a cache hit or when ffmpeg fails.
+    """
+    audio_format = streaming_audio_format(AUDIO_CODEC)
+    spec = AUDIO_FORMATS[audio_format]
+
+    gcp_audio_path = f"audios/{base}.{spec['extension']}"
+    writer = open_gcp_blob_writer(gcp_audio_path, content_type=spec["content_type"])
+    hashing_writer = HashingWriter(writer)
+
+    # Only finalise the GCS object once ffmpeg has succeeded
+    try:
+        stream_audio_extraction(video_stream, hashing_writer, audio_format=audio_format)
+        cache, cache_key, cached = _cache_lookup(hashing_writer.hexdigest(), audio_format)
+    except BaseException:
+        abort_gcp_blob_writer(writer)
+        raise
+
+    if cached:
+        # The duplicate audio is not needed; don't leave its session open
+        abort_gcp_blob_writer(writer)
+        return cached["transcript"], cached["audio_url"]
+
+    writer.close()
+
+    gcs_uri = f"gs://{bucket_name}/{gcp_audio_path}"
+    transcript = transcribe_with_vertex_ai(gcs_uri, audio_format=audio_format)
+    _cache_store(cache, cache_key, transcript, gcs_uri)
+    return transcript, gcs_uri
+
+
+def _require_transcript(transcript: str) -> None:
+    """
+    STT helpers report failures as "[Error: ...]" text. Those must not be stored
+    as the answer (or finish the dedup job as done), so a retry runs STT again.
+    """
+    if is_failed_transcript(transcript):
+        raise RuntimeError(f"Speech-to-Text failed: {transcript}")
+
+
+def _stored_result(transcript: str, gcs_uri: str) -> dict:
+    return {
+        "message": "Processed successfully",
+        "transcript": transcript,
+        "audio_url": gcs_uri
+    }
+
+
+def store_transcript(
+    db: Session,
+    task_id: str,
+    question_id: int,
+    round_type: str,
+    skill: str,
+    transcript: str,
+    gcs_uri: str
+) -> dict:
+    _require_transcript(transcript)
+    record = build_response_record(round_type, task_id, question_id, transcript, skill)
+    db.add(record)
+    db.commit()
+
+    maybe_schedule_report(db, task_id, round_type)
+    return _stored_result(transcript, gcs_uri)
+
+
+async def astore_transcript(
+    db: AsyncSession,
+    task_id: str,
+    question_id: int,
+    round_type: str,
+    skill: str,
+    transcript: str,
+    gcs_uri: str
+) -> dict:
+    _require_transcript(transcript)
+    record = build_response_record(round_type, task_id, question_id, transcript, skill)
+    db.add(record)
+    await db.commit()
+
+    await amaybe_schedule_report(db, task_id, round_type)
+    return _stored_result(transcript, gcs_uri)
+
+# ==============================================================
+# Batch (all answers of a task in one request)
+# ==============================================================
+def _transcribe_batch_item(item: dict) -> dict:
+    """
+    Transcribes one batch entry. Entries either point at a saved upload
+    (video_path) or at an object already in the bucket (gcs_path).
+    """
+    try:
+        if item.get("gcs_path"):
+            os.makedirs(UPLOAD_DIR, exist_ok=True)
+            download_from_gcp_bucket(item["gcs_path"], item["video_path"])
+
+        transcript, gcs_uri = transcribe_video_file(item["video_path"], item["base"])
+        _require_transcript(transcript)
+        return {**item, "transcript": transcript, "audio_url": gcs_uri, "error": None}
+    except Exception as e:
+        logging.error(f"Batch transcription failed for question {item['question_id']}: {e}")
+        return {**item, "transcript": None, "audio_url": None, "error": str(e)}
+    finally:
+        _remove_quietly(item["video_path"])
+
+
+def transcribe_batch(items: list[dict]) -> list[dict]:
+    """
+    Fans the answers out over the shared batch pool. Each result carries
+    either transcript/audio_url or an error.
+    """
+    return list(_batch_executor.map(_transcribe_batch_item, items))
+
+
+def build_batch_records(task_id: str, round_type: str, results: list[dict]) -> list:
+    return [
+        build_response_record(round_type, task_id, r["question_id"], r["transcript"], r.get("skill"))
+        for r in results if r["error"] is None
+    ]
+
+
+def batch_item_result(result: dict) -> dict:
+    # Stored as the per-question job result, like a single /transcribe response
+    return _stored_result(result["transcript"], result["audio_url"])
+
+
+def summarize_batch(task_id: str, results: list[dict]) -> dict:
+    succeeded = [r for r in results if r["error"] is None]
+    return {
+        "task_id": task_id,
+        "message": f"Processed {len(succeeded)} of {len(results)} answers",
+        "results": [
+            {"question_id": r["question_id"], "transcript": r["transcript"], "audio_url": r["audio_url"]}
+            for r in succeeded
+        ],
+        "failed": [
+            {"question_id": r["question_id"], "error": r["error"]}
+            for r in results if r["error"] is not None
+        ]
+    }
+
+
+def run_transcription_job(payload: dict) -> dict:
+    """
+    Job-queue handler for the "transcription" job kind.
+    """
+    if payload.get("inline"):
+        # Inline requests are tracked as jobs for idempotency but run in the request
+        raise RuntimeError("Inline transcription was interrupted; please retry the upload")
+
+    db = SessionLocal()
+    try:
+        return run_transcription_pipeline(
+            db,
+            payload["video_path"],
+            payload["base"],
+            payload["task_id"],
+            payload["question_id"],
+            payload["round_type"],
+            payload.get("skill")
+        )
+    except Exception as e:
+        logging.error(f"Transcription job failed: {e}")
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,94 @@
+import os
+
+# The services read these at import time; tests build their own engines and clients
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("GCP_BUCKET_NAME", "test-bucket")
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, event, insert, select, func
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models import Base, UserTask, TechnicalRound, HrRound, CulturalFit
+from services.response_queries import RESPONSE_MODELS
+
+QUESTION_MODELS = {
+    "technical": TechnicalRound,
+    "hr": HrRound,
+    "cultural": CulturalFit
+}
+
+
+@pytest.fixture
+def engine():
+    """
+    Throwaway in-memory SQLite database with the full schema.
+    """
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine)
+
+
+@contextmanager
+def _count_queries(engine):
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+
+
+@pytest.fixture
+def count_queries():
+    """
+    `with count_queries(engine) as statements:` collects every SQL statement
+    sent to the database inside the block (pass engine.sync_engine for async engines).
+    """
+    return _count_queries
+
+
+def _seed_task(conn, round_type: str, task_id: str, answers: int, skill: str = "python") -> None:
+    """
+    One question per answer, so every response points at a distinct question row.
+    Questions are inserted in reverse so ids do not follow insertion order by accident.
+    """
+    question_model = QUESTION_MODELS[round_type]
+    conn.execute(insert(UserTask), [{"u_id": "test", "type": round_type, "task_id": task_id}])
+
+    first_id = conn.execute(select(func.coalesce(func.max(question_model.id), 0))).scalar() + 1
+    if round_type == "technical":
+        questions = [{"question": f"Q{i}", "answer": f"A{i}", "skill": skill, "difficulty": "easy"}
+                     for i in range(answers)]
+    else:
+        questions = [{"question_text": f"Q{i}"} for i in range(answers)]
+    conn.execute(insert(question_model), questions)
+
+    responses = []
+    for i in reversed(range(answers)):
+        row = {"task_id": task_id, "question_id": first_id + i, "transcript": f"answer {i}"}
+        if round_type == "technical":
+            row["skill"] = skill
+        responses.append(row)
+    conn.execute(insert(RESPONSE_MODELS[round_type]), responses)
+
+
+@pytest.fixture
+def seed_task():
+    """
+    seed_task(conn, round_type, task_id, answers) inserts a task with `answers`
+    answered questions through a Core connection (sync, or via run_sync).
+    """
+    return _seed_task
@@ -0,0 +1,68 @@
+"""
+The size-bounded disk LRU shared by the transcript and LLM response caches.
+"""
+import os
+import time
+
+from services.disk_lru import DiskLruCache
+from services.llm_cache import DiskLlmCache
+from services.transcript_cache import DiskTranscriptCache
+
+
+def entry_size(tmp_path) -> int:
+    probe = DiskLruCache(str(tmp_path / "probe"), max_bytes=10**9)
+    probe.write("k", {"value": "x" * 100})
+    return os.path.getsize(probe._path("k"))
+
+
+def test_write_read_remove(tmp_path):
+    cache = DiskLruCache(str(tmp_path), max_bytes=10**6)
+
+    cache.write("a", {"value": 1})
+    assert cache.read("a") == {"value": 1}
+    assert [name for name in os.listdir(tmp_path)] == ["a.json"]
+
+    cache.remove("a")
+    cache.remove("a")
+    assert cache.read("a") is None
+
+
+def test_evicts_least_recently_used(tmp_path):
+    size = entry_size(tmp_path)
+    cache = DiskLruCache(str(tmp_path / "lru"), max_bytes=size * 2)
+
+    cache.write("old", {"value": "x" * 100})
+    cache.write("new", {"value": "x" * 100})
+    past = time.time() - 60
+    os.utime(cache._path("new"), (past, past))
+    os.utime(cache._path("old"), (past - 60, past - 60))
+    cache.touch("old")
+
+    cache.write("third", {"value": "x" * 100})
+
+    assert cache.read("old") is not None
+    assert cache.read("new") is None
+    assert cache.read("third") is not None
+
+
+def test_corrupt_entry_reads_as_missing(tmp_path):
+    cache = DiskLruCache(str(tmp_path), max_bytes=10**6)
+    with open(cache._path("bad"), "w") as f:
+        f.write("{not json")
+
+    assert cache.read("bad") is None
+
+
+def test_both_caches_use_the_shared_store(tmp_path):
+    transcripts = DiskTranscriptCache(str(tmp_path / "transcripts"), max_bytes=10**6)
+    transcripts.set("t", "hello", None)
+    assert transcripts.get("t") == {"transcript": "hello", "audio_url": None}
+
+    responses = DiskLlmCache(str(tmp_path / "llm"), max_bytes=10**6, ttl=60)
+    responses.set("r", "report", "model")
+    text, remaining = responses.get("r")
+    assert text == "report" and 0 < remaining <= 60
+
+    responses.ttl = 0
+    assert responses.get("r") is None
+    assert not os.path.exists(responses._path("r"))
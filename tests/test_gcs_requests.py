@@ -0,0 +1,334 @@
+"""
+Counts the HTTP requests each services.gcp_helper operation sends through a real
+storage.Client. The client's requests session is served by an in-memory transport
+adapter, so every call the library makes (metadata lookups, retries) is seen.
+"""
+import io
+import json
+import base64
+import hashlib
+import threading
+from email.parser import BytesParser
+from urllib.parse import urlsplit, unquote, parse_qs
+
+import google_crc32c
+import pytest
+from google.auth.credentials import AnonymousCredentials
+from google.auth.transport.requests import AuthorizedSession
+from google.cloud import storage
+from google.cloud.storage.fileio import BlobWriter
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3 import HTTPResponse
+
+from services import gcp_helper, transcription
+
+
+class InMemoryGcsAdapter(BaseAdapter):
+    """
+    Just enough of the JSON API for small objects: multipart and resumable
+    upload, media download and delete. Records (method, path) of every object
+    request; the bucket metadata the client looks up in background threads is
+    kept apart. Resumable sessions stay in `sessions` until finalised or cancelled.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.objects = {}
+        self.sessions = {}
+        self.session_count = 0
+        self.requests = []
+        self.bucket_lookups = []
+        self.bucket_fetched = threading.Event()
+
+    def send(self, request, **kwargs):
+        path = unquote(urlsplit(request.url).path)
+        if request.method == "GET" and path == f"/storage/v1/b/{gcp_helper.bucket_name}":
+            self.bucket_lookups.append(path)
+            self.bucket_fetched.set()
+            resource = {"name": gcp_helper.bucket_name, "location": "US", "locationType": "multi-region"}
+            return self._response(request, 200, json.dumps(resource).encode(), {"Content-Type": "application/json"})
+
+        self.requests.append((request.method, path))
+        upload_id = parse_qs(urlsplit(request.url).query).get("upload_id", [None])[0]
+        if upload_id is not None:
+            return self._resumable_chunk(request, upload_id)
+        if request.method == "POST" and "uploadType=resumable" in request.url:
+            return self._start_resumable(request)
+        if request.method == "POST" and path.startswith("/upload/storage/v1/b/"):
+            return self._upload(request)
+        if request.method == "GET" and path.startswith("/download/storage/v1/b/"):
+            data = self.objects.get(self._object_name(path))
+            if data is None:
+                return self._not_found(request)
+            crc32c, md5 = self._hashes(data)
+            return self._response(request, 200, data, {
+                "Content-Type": "application/octet-stream",
+                "x-goog-hash": f"crc32c={crc32c},md5={md5}",
+                "x-goog-generation": "1",
+            })
+        if request.method == "DELETE" and path.startswith("/storage/v1/b/"):
+            if self.objects.pop(self._object_name(path), None) is None:
+                return self._not_found(request)
+            return self._response(request, 204, b"")
+        return self._response(request, 501, b"")
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def _object_name(path: str) -> str:
+        return path.split("/o/", 1)[1]
+
+    @staticmethod
+    def _hashes(data: bytes) -> tuple[str, str]:
+        crc32c = base64.b64encode(google_crc32c.Checksum(data).digest()).decode()
+        md5 = base64.b64encode(hashlib.md5(data).digest()).decode()
+        return crc32c, md5
+
+    def _upload(self, request):
+        content_type = request.headers["Content-Type"]
+        if isinstance(content_type, str):
+            content_type = content_type.encode()
+        message = BytesParser().parsebytes(b"Content-Type: " + content_type + b"\r\n\r\n" + request.body)
+        metadata_part, media_part = message.get_payload()
+        metadata = json.loads(metadata_part.get_payload())
+        data = media_part.get_payload(decode=True)
+        self.objects[metadata["name"]] = data
+
+        crc32c, md5 = self._hashes(data)
+        resource = {
+            "name": metadata["name"], "bucket": gcp_helper.bucket_name, "generation": "1",
+            "size": str(len(data)), "crc32c": crc32c, "md5Hash": md5,
+        }
+        return self._response(request, 200, json.dumps(resource).encode(), {"Content-Type": "application/json"})
+
+    def _start_resumable(self, request):
+        self.session_count += 1
+        upload_id = str(self.session_count)
+        self.sessions[upload_id] = {"name": json.loads(request.body)["name"], "data": bytearray()}
+        location = f"{request.url}&upload_id={upload_id}"
+        return self._response(request, 200, b"", {"Location": location})
+
+    def _resumable_chunk(self, request, upload_id: str):
+        if request.method == "DELETE":
+            # Cancelled session; GCS answers 499
+            self.sessions.pop(upload_id, None)
+            return self._response(request, 499, b"")
+
+        session = self.sessions[upload_id]
+        session["data"] += request.body or b""
+        total = request.headers["Content-Range"].rsplit("/", 1)[1]
+        if total == "*":
+            return self._response(request, 308, b"", {"Range": f"bytes=0-{len(session['data']) - 1}"})
+
+        del self.sessions[upload_id]
+        data = bytes(session["data"])
+        self.objects[session["name"]] = data
+        crc32c, md5 = self._hashes(data)
+        resource = {
+            "name": session["name"], "bucket": gcp_helper.bucket_name, "generation": "1",
+            "size": str(len(data)), "crc32c": crc32c, "md5Hash": md5,
+        }
+        return self._response(request, 200, json.dumps(resource).encode(), {"Content-Type": "application/json"})
+
+    def _not_found(self, request):
+        error = {"error": {"code": 404, "message": "No such object"}}
+        return self._response(request, 404, json.dumps(error).encode(), {"Content-Type": "application/json"})
+
+    @staticmethod
+    def _response(request, status: int, body: bytes, headers: dict = None):
+        raw = HTTPResponse(body=io.BytesIO(body), headers=headers or {}, status=status, preload_content=False)
+        return HTTPAdapter().build_response(request, raw)
+
+
+def make_client(adapter: InMemoryGcsAdapter) -> storage.Client:
+    credentials = AnonymousCredentials()
+    # Same session type as services.gcp_clients, with the transport swapped out
+    session = AuthorizedSession(credentials)
+    session.mount("https://", adapter)
+    return storage.Client(project="test", credentials=credentials, _http=session)
+
+
+@pytest.fixture(scope="module")
+def warm_transport(tmp_path_factory):
+    """
+    One client for the module, past its one-off background bucket metadata fetch.
+    """
+    adapter = InMemoryGcsAdapter()
+    client = make_client(adapter)
+    source = tmp_path_factory.mktemp("warm-up") / "warm-up.txt"
+    source.write_text("warm-up")
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(gcp_helper, "get_gcs_client", lambda: client)
+        patch.setattr(gcp_helper, "GCS_PARALLEL_DOWNLOAD", False)
+        gcp_helper.upload_to_gcp_bucket(str(source), "warm-up.txt")
+        adapter.bucket_fetched.wait(timeout=2)
+        yield adapter
+
+
+@pytest.fixture
+def transport(warm_transport):
+    warm_transport.objects.clear()
+    warm_transport.sessions.clear()
+    warm_transport.requests.clear()
+    return warm_transport
+
+
+def sent(transport, operation, *args):
+    transport.requests.clear()
+    result = operation(*args)
+    return result, list(transport.requests)
+
+
+def test_upload_is_one_request(transport, tmp_path):
+    source = tmp_path / "report.txt"
+    source.write_text("hello")
+
+    url, requests_sent = sent(transport, gcp_helper.upload_to_gcp_bucket, str(source), "reports/r.txt")
+
+    assert len(requests_sent) == 1
+    assert url.endswith("/reports/r.txt")
+    assert transport.objects["reports/r.txt"] == b"hello"
+
+
+def test_download_and_read_are_one_request(transport, tmp_path):
+    transport.objects["reports/r.txt"] = b"hello"
+    target = tmp_path / "copy.txt"
+
+    _, requests_sent = sent(transport, gcp_helper.download_from_gcp_bucket, "reports/r.txt", str(target))
+    assert requests_sent == [("GET", "/download/storage/v1/b/test-bucket/o/reports/r.txt")]
+    assert target.read_bytes() == b"hello"
+
+    text, requests_sent = sent(transport, gcp_helper.read_text_from_gcp_bucket, "reports/r.txt")
+    assert len(requests_sent) == 1
+    assert text == "hello"
+
+
+def test_delete_is_one_request(transport):
+    transport.objects["reports/r.txt"] = b"hello"
+
+    deleted, requests_sent = sent(transport, gcp_helper.delete_from_gcp_bucket, "reports/r.txt")
+    assert deleted is True
+    assert requests_sent == [("DELETE", "/storage/v1/b/test-bucket/o/reports/r.txt")]
+
+    deleted, requests_sent = sent(transport, gcp_helper.delete_from_gcp_bucket, "reports/r.txt")
+    assert deleted is False
+    assert len(requests_sent) == 1
+
+
+def test_missing_object_is_one_request_and_keeps_existing_file(transport, tmp_path):
+    target = tmp_path / "copy.txt"
+    target.write_text("mine")
+
+    with pytest.raises(FileNotFoundError):
+        sent(transport, gcp_helper.download_from_gcp_bucket, "reports/missing.txt", str(target))
+    assert len(transport.requests) == 1
+    assert target.read_text() == "mine"
+    assert list(tmp_path.iterdir()) == [target]
+
+    transport.requests.clear()
+    with pytest.raises(FileNotFoundError):
+        gcp_helper.read_text_from_gcp_bucket("reports/missing.txt")
+    assert len(transport.requests) == 1
+
+
+def test_bucket_metadata_is_not_looked_up_per_operation(monkeypatch, tmp_path):
+    adapter = InMemoryGcsAdapter()
+    client = make_client(adapter)
+    monkeypatch.setattr(gcp_helper, "get_gcs_client", lambda: client)
+    monkeypatch.setattr(gcp_helper, "GCS_PARALLEL_DOWNLOAD", False)
+    source = tmp_path / "report.txt"
+    source.write_text("hello")
+
+    for i in range(5):
+        gcp_helper.upload_to_gcp_bucket(str(source), f"reports/{i}.txt")
+        gcp_helper.read_text_from_gcp_bucket(f"reports/{i}.txt")
+    adapter.bucket_fetched.wait(timeout=2)
+
+    assert len(adapter.requests) == 10
+    assert len(adapter.bucket_lookups) <= 1
+
+
+# ==============================================================
+# Streamed (resumable) uploads
+# ==============================================================
+AUDIO = b"\x00" * (600 * 1024)
+
+
+@pytest.fixture
+def streaming(transport, monkeypatch):
+    """
+    transcribe_video_stream() against the in-memory transport, with ffmpeg replaced
+    by a writer of AUDIO and 256 KB chunks so the resumable session starts mid-stream.
+    """
+    monkeypatch.setattr(gcp_helper, "GCS_STREAM_CHUNK_SIZE", 256 * 1024)
+    monkeypatch.setattr(transcription, "streaming_audio_format", lambda codec: "flac")
+    monkeypatch.setattr(transcription, "stream_audio_extraction",
+                        lambda stream, writer, audio_format: writer.write(AUDIO))
+    monkeypatch.setattr(transcription, "transcribe_with_vertex_ai", lambda uri, audio_format: "fresh")
+    monkeypatch.setattr(transcription, "_cache_lookup", lambda audio_hash, audio_format: (None, None, None))
+    return transport
+
+
+def test_streamed_upload_is_finalised(streaming):
+    transcript, gcs_uri = transcription.transcribe_video_stream(io.BytesIO(), "answer")
+
+    assert (transcript, gcs_uri) == ("fresh", "gs://test-bucket/audios/answer.flac")
+    assert streaming.objects["audios/answer.flac"] == AUDIO
+    assert streaming.sessions == {}
+
+
+def test_cache_hit_cancels_the_streamed_upload(streaming, monkeypatch):
+    hit = {"transcript": "cached", "audio_url": "gs://test-bucket/audios/first.flac"}
+    monkeypatch.setattr(transcription, "_cache_lookup", lambda audio_hash, audio_format: (None, None, hit))
+
+    transcript, gcs_uri = transcription.transcribe_video_stream(io.BytesIO(), "answer")
+
+    assert (transcript, gcs_uri) == ("cached", "gs://test-bucket/audios/first.flac")
+    assert streaming.requests[-1][0] == "DELETE"
+    assert streaming.sessions == {}
+    assert streaming.objects == {}
+
+
+def test_ffmpeg_failure_cancels_the_streamed_upload(streaming, monkeypatch):
+    def failing_extraction(stream, writer, audio_format):
+        writer.write(AUDIO)
+        raise RuntimeError("ffmpeg failed")
+
+    monkeypatch.setattr(transcription, "stream_audio_extraction", failing_extraction)
+
+    with pytest.raises(RuntimeError):
+        transcription.transcribe_video_stream(io.BytesIO(), "answer")
+
+    assert streaming.requests[-1][0] == "DELETE"
+    assert streaming.sessions == {}
+    assert streaming.objects == {}
+
+
+@pytest.mark.parametrize("has_terminate", [True, False])
+def test_abort_cancels_the_session_and_discards_the_writer(streaming, monkeypatch, has_terminate):
+    if not has_terminate:
+        # google-cloud-storage 2.x has no BlobWriter.terminate()
+        monkeypatch.delattr(BlobWriter, "terminate")
+
+    writer = gcp_helper.open_gcp_blob_writer("audios/answer.flac")
+    writer.write(AUDIO)
+    assert streaming.sessions
+
+    gcp_helper.abort_gcp_blob_writer(writer)
+
+    # Closed without finalising, so garbage collection cannot upload it later
+    assert writer.closed
+    assert streaming.requests[-1][0] == "DELETE"
+    assert streaming.sessions == {}
+    assert streaming.objects == {}
+
+
+def test_abort_before_the_session_starts_sends_nothing(streaming):
+    writer = gcp_helper.open_gcp_blob_writer("audios/answer.flac")
+    writer.write(b"short")
+
+    gcp_helper.abort_gcp_blob_writer(writer)
+
+    assert writer.closed
+    assert streaming.requests == []
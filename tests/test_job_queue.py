@@ -0,0 +1,80 @@
+"""
+Worker pools only wake for their own job kinds, and stale "running" jobs are
+swept back into the queue while the workers run, not just at startup.
+"""
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from models import BackgroundJob
+from services import job_queue
+
+
+@pytest.fixture
+def queue(engine, session_factory, monkeypatch):
+    monkeypatch.setattr(job_queue, "engine", engine)
+    monkeypatch.setattr(job_queue, "SessionLocal", session_factory)
+    monkeypatch.setattr(job_queue, "_wakeups", {})
+    monkeypatch.setattr(job_queue, "_handlers", {})
+    yield session_factory
+    job_queue.stop_workers()
+
+
+def test_new_job_wakes_only_its_own_pool(queue, monkeypatch):
+    transcription, report = threading.Event(), threading.Event()
+    monkeypatch.setattr(job_queue, "_wakeups", {"transcription": transcription, "report": report})
+
+    with queue() as db:
+        job, _ = job_queue.create_job(db, "report", {"task_id": "t1"})
+        assert not transcription.is_set()
+        assert report.is_set()
+
+        report.clear()
+        job_queue.finish_job(db, job.id, job_queue.JOB_FAILED, error="boom")
+        db.refresh(job)
+        job_queue.restart_job(db, job, {"task_id": "t1"}, job_queue.JOB_QUEUED)
+        assert not transcription.is_set()
+        assert report.is_set()
+
+
+def test_pools_get_separate_events(queue):
+    job_queue.register_handler("a", lambda payload: {})
+    job_queue.register_handler("b", lambda payload: {})
+    job_queue.start_workers(["a"], count=1)
+    job_queue.start_workers(["b"], count=1)
+
+    assert job_queue._wakeups["a"] is not job_queue._wakeups["b"]
+
+
+def test_stale_jobs_are_swept_while_workers_run(queue, monkeypatch):
+    monkeypatch.setattr(job_queue, "JOB_STALE_SECONDS", 60)
+    monkeypatch.setattr(job_queue, "JOB_STALE_SWEEP_INTERVAL", 0.05)
+    monkeypatch.setattr(job_queue, "JOB_POLL_INTERVAL", 60)
+
+    processed = threading.Event()
+
+    def handler(payload):
+        processed.set()
+        return {"ok": True}
+
+    job_queue.register_handler("sweep-test", handler)
+    job_queue.start_workers(["sweep-test"], count=1)
+
+    # A job whose worker died an hour ago, after this process started
+    with queue() as db:
+        job, _ = job_queue.create_job(db, "sweep-test", {}, status=job_queue.JOB_RUNNING)
+        job_id = job.id
+        db.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.id == job_id)
+            .values(updated_at=datetime.utcnow() - timedelta(hours=1))
+        )
+        db.commit()
+
+    assert processed.wait(timeout=5)
+    job_queue.stop_workers()
+
+    with queue() as db:
+        assert job_queue.get_job(db, job_id).status == job_queue.JOB_DONE
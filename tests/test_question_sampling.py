@@ -0,0 +1,114 @@
+"""
+GET /technical-round/questions/{skill}/{numQuestions} applies the difficulty mix and
+the task_id seed whether questions come from the cached bank or are sampled in SQL.
+"""
+import asyncio
+from collections import Counter
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import routers.technical_round as technical_round
+from models import Base, TechnicalRound
+from services.question_bank import build_question_bank
+
+DIFFICULTIES = {"easy": 30, "medium": 20, "hard": 10}
+
+
+def _seed_questions(conn) -> None:
+    rows = [
+        {"question": f"{skill} {difficulty} {i}", "answer": "A", "skill": skill, "difficulty": difficulty}
+        for skill in ("Python", "PySpark", "Java")
+        for difficulty, count in DIFFICULTIES.items()
+        for i in range(count)
+    ]
+    conn.execute(insert(TechnicalRound), rows)
+
+
+@pytest.fixture
+def question_db():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    async def seed():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_seed_questions)
+
+    async def build_bank():
+        async with engine.connect() as conn:
+            return await conn.run_sync(lambda c: build_question_bank(Session(bind=c), 1))
+
+    asyncio.run(seed())
+    bank = asyncio.run(build_bank())
+    yield async_sessionmaker(engine, expire_on_commit=False), bank
+    asyncio.run(engine.dispose())
+
+
+def fetch(monkeypatch, question_db, use_cache: bool, skill: str, n: int, **params):
+    Session, bank = question_db
+
+    async def aget_question_bank():
+        return bank
+
+    monkeypatch.setattr(technical_round, "QUESTION_BANK_CACHE", use_cache)
+    monkeypatch.setattr(technical_round, "aget_question_bank", aget_question_bank)
+
+    async def run():
+        async with Session() as db:
+            questions = await technical_round.get_technical_questions(
+                skill, n, difficulty_mix=params.get("difficulty_mix"), task_id=params.get("task_id"), db=db
+            )
+            return [(q["id"], q["difficulty"]) if isinstance(q, dict) else (q.id, q.difficulty)
+                    for q in questions]
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("use_cache", [True, False])
+def test_mix_is_respected(monkeypatch, question_db, use_cache):
+    questions = fetch(monkeypatch, question_db, use_cache, "py", 10, difficulty_mix="easy:50,medium:30,hard:20")
+
+    assert len({qid for qid, _ in questions}) == 10
+    assert Counter(d for _, d in questions) == {"easy": 5, "medium": 3, "hard": 2}
+
+
+@pytest.mark.parametrize("use_cache", [True, False])
+def test_task_id_is_deterministic(monkeypatch, question_db, use_cache):
+    first = fetch(monkeypatch, question_db, use_cache, "python", 8, task_id="task-1")
+    again = fetch(monkeypatch, question_db, use_cache, "python", 8, task_id="task-1")
+    other = fetch(monkeypatch, question_db, use_cache, "python", 8, task_id="task-2")
+
+    assert first == again
+    assert first != other
+
+
+@pytest.mark.parametrize("mix, queries", [(None, 1), ("easy:50,medium:30,hard:20", 2)])
+def test_database_path_samples_in_sql(monkeypatch, question_db, count_queries, mix, queries):
+    Session, _ = question_db
+    engine = Session.kw["bind"]
+
+    with count_queries(engine.sync_engine) as statements:
+        questions = fetch(monkeypatch, question_db, False, "py", 10, difficulty_mix=mix)
+
+    # A fixed number of queries, and only the selected rows come back
+    assert len(questions) == 10
+    assert len(statements) == queries
+    assert "LIMIT" in statements[-1] or "row_number()" in statements[-1]
+
+
+@pytest.mark.parametrize("use_cache", [True, False])
+def test_mix_falls_back_when_a_difficulty_runs_short(monkeypatch, question_db, use_cache):
+    # 27 hard questions wanted, 10 exist: the shortfall goes to easy
+    questions = fetch(monkeypatch, question_db, use_cache, "java", 30, difficulty_mix="easy:10,hard:90")
+
+    assert Counter(d for _, d in questions) == {"hard": 10, "easy": 20}
+
+
+@pytest.mark.parametrize("use_cache", [True, False])
+def test_invalid_mix_is_rejected(monkeypatch, question_db, use_cache):
+    with pytest.raises(HTTPException) as exc:
+        fetch(monkeypatch, question_db, use_cache, "python", 5, difficulty_mix="easy:abc")
+    assert exc.value.status_code == 400
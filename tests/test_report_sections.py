@@ -0,0 +1,98 @@
+"""
+parse_report_sections() finds every section of each round's layout in the sample
+reports and in the fake model's answers, and copes with the heading variants Gemini writes.
+"""
+import glob
+import os
+
+import pytest
+
+from services.audio_processing import (
+    REPORT_SECTION_LAYOUTS, cultural_report_request, hr_report_request, technical_report_request,
+    parse_cultural_output, parse_report_sections
+)
+from services.gcp_fakes import FakeGenerativeModel
+
+REPORTS_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "Reports")
+SAMPLE_REPORTS = sorted(glob.glob(os.path.join(REPORTS_DIR, "*.txt")))
+
+QA_PAIRS = [{"question": "Tell us about a conflict.", "transcript": "We talked it through.", "correct_answer": "-"}]
+REPORT_REQUESTS = {
+    "hr": hr_report_request,
+    "technical": technical_report_request,
+    "cultural": cultural_report_request,
+}
+
+
+def round_of(path: str) -> str:
+    return os.path.splitext(path)[0].rsplit("_", 1)[-1]
+
+
+@pytest.mark.parametrize("path", SAMPLE_REPORTS, ids=os.path.basename)
+def test_sample_reports_have_every_section(path):
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+
+    sections = parse_report_sections(text, round_of(path))
+
+    assert list(sections) == [key for key, _ in REPORT_SECTION_LAYOUTS[round_of(path)]]
+    assert all(sections.values()), [key for key, value in sections.items() if not value]
+
+
+@pytest.mark.parametrize("round_type", sorted(REPORT_SECTION_LAYOUTS))
+def test_every_layout_matches_its_prompt(round_type):
+    # The fake model answers with a placeholder under each numbered heading of the prompt
+    text = FakeGenerativeModel()._respond(REPORT_REQUESTS[round_type](QA_PAIRS)["prompt"]).text
+    if round_type == "cultural":
+        text = parse_cultural_output(text)["report"]
+
+    sections = parse_report_sections(text, round_type)
+
+    assert list(sections) == [key for key, _ in REPORT_SECTION_LAYOUTS[round_type]]
+    assert all(sections.values()), [key for key, value in sections.items() if not value]
+
+
+def test_numbered_follow_up_questions_stay_in_their_section():
+    text = (
+        "5. Suggested Follow-up Questions\n"
+        "1. How would you scale this?\n"
+        "2. What would you test first?\n"
+        "6. Final Assessment & Recommendation\n"
+        "Hire.\n"
+    )
+
+    sections = parse_report_sections(text, "technical")
+
+    assert sections["follow_up_questions"] == ["1. How would you scale this?", "2. What would you test first?"]
+    assert sections["recommendation"] == "Hire."
+
+
+def test_markdown_headings_and_inline_values():
+    text = (
+        "## 1. Interview Summary:\nSolid.\n"
+        "## 7) Technical Score (out of 100): 72\n"
+        "### 8. Grammar & Fluency Score (out of 100): 80/100\n"
+        "9. Confidence Interval: Medium\nMostly consistent answers.\n"
+    )
+
+    sections = parse_report_sections(text, "technical")
+
+    assert sections["summary"] == "Solid."
+    assert sections["technical_score"] == "72"
+    assert sections["grammar_score"] == "80/100"
+    assert sections["confidence"] == "Medium\nMostly consistent answers."
+
+
+def test_missing_sections_are_empty():
+    sections = parse_report_sections("1. Candidate Introduction\nHello.\n", "hr")
+
+    assert sections["introduction"] == "Hello."
+    assert sections["follow_up_questions"] == []
+    assert sections["recommendation"] == ""
+
+
+def test_text_without_headings_gives_empty_sections():
+    sections = parse_report_sections("The model ignored the format.", "cultural")
+
+    assert set(sections) == {key for key, _ in REPORT_SECTION_LAYOUTS["cultural"]}
+    assert not any(sections.values())
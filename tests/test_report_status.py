@@ -0,0 +1,96 @@
+"""
+GET /reports/{round_type}/{task_id} serves a stored report even while a regenerate
+is queued, running or has failed; pending / failed only show when there is no report.
+"""
+import asyncio
+import json
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import routers.reports as reports
+from models import Base, BackgroundJob
+from services.report_generation import report_dedup_key
+from services.report_store import astore_report
+
+REPORT = "1. Overall Assessment\nSolid answers.\n"
+
+
+@pytest.fixture
+def report_db(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    def not_in_gcs(bucket_path):
+        raise FileNotFoundError(bucket_path)
+
+    asyncio.run(create())
+    monkeypatch.setattr(reports, "read_text_from_gcp_bucket", not_in_gcs)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+def setup(Session, job_status: str = None, stored: bool = False):
+    async def run():
+        async with Session() as db:
+            if stored:
+                await astore_report(db, "hr", "task-1", REPORT)
+            if job_status:
+                db.add(BackgroundJob(
+                    id=str(uuid.uuid4()), kind="report", status=job_status, payload="{}",
+                    dedup_key=report_dedup_key("hr", "task-1"),
+                    error="boom" if job_status == "failed" else None
+                ))
+                await db.commit()
+    asyncio.run(run())
+
+
+def get(Session):
+    async def run():
+        async with Session() as db:
+            response = await reports.get_report("hr", "task-1", if_none_match=None, if_modified_since=None, db=db)
+            if isinstance(response, dict):
+                return 200, response
+            return response.status_code, json.loads(response.body)
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("job_status, refresh", [("queued", "pending"), ("running", "pending"), ("failed", "failed")])
+def test_stored_report_wins_over_job_state(report_db, job_status, refresh):
+    setup(report_db, job_status, stored=True)
+
+    status_code, body = get(report_db)
+
+    assert status_code == 200
+    assert body["status"] == "ready"
+    assert body["content"] == REPORT
+    assert body["refresh"]["status"] == refresh
+
+
+@pytest.mark.parametrize("job_status, expected", [("running", (202, "pending")), ("failed", (200, "failed"))])
+def test_job_state_without_a_report(report_db, job_status, expected):
+    setup(report_db, job_status)
+
+    status_code, body = get(report_db)
+
+    assert (status_code, body["status"]) == expected
+
+
+def test_done_job_is_not_reported(report_db):
+    setup(report_db, "done", stored=True)
+
+    status_code, body = get(report_db)
+
+    assert (status_code, body["status"], body["refresh"]) == (200, "ready", None)
+
+
+def test_missing_report_is_404(report_db):
+    with pytest.raises(HTTPException) as exc:
+        get(report_db)
+    assert exc.value.status_code == 404
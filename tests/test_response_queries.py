@@ -0,0 +1,84 @@
+"""
+The joined loader in services.response_queries fetches a task's answers with
+their questions in one statement, whatever the number of answers.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models import Base
+from routers.cultural_fit import get_cultural_responses
+from routers.hr_round import get_hr_responses
+from services.response_queries import (
+    RESPONSE_MODELS, load_responses_with_questions, load_responses_with_questions_sync, build_qa_pairs
+)
+
+ROUNDS = list(RESPONSE_MODELS)
+SIZES = [1, 10, 100]
+
+
+@pytest.mark.parametrize("round_type", ROUNDS)
+def test_joined_loader_is_one_query_at_any_size(round_type, engine, session_factory, count_queries, seed_task):
+    with engine.begin() as conn:
+        for size in SIZES:
+            seed_task(conn, round_type, f"task-{size}", size)
+
+    for size in SIZES:
+        with session_factory() as db, count_queries(engine) as statements:
+            pairs = build_qa_pairs(round_type, load_responses_with_questions_sync(db, round_type, f"task-{size}"))
+
+        assert len(statements) == 1
+        assert len(pairs) == size
+        # Interview (question) order, each answer with its own question
+        assert [p["question"] for p in pairs] == [f"Q{i}" for i in range(size)]
+        assert [p["transcript"] for p in pairs] == [f"answer {i}" for i in range(size)]
+        if round_type == "technical":
+            assert [p["correct_answer"] for p in pairs] == [f"A{i}" for i in range(size)]
+
+
+def test_lazy_loading_is_counted_per_answer(engine, session_factory, count_queries, seed_task):
+    # Guards the counter itself: the pattern the loader replaced costs 1 + N statements
+    with engine.begin() as conn:
+        seed_task(conn, "hr", "task", 10)
+
+    model = RESPONSE_MODELS["hr"]
+    with session_factory() as db, count_queries(engine) as statements:
+        responses = db.execute(select(model).where(model.task_id == "task")).scalars().all()
+        build_qa_pairs("hr", responses)
+
+    assert len(statements) == 11
+
+
+def test_async_loader_and_routes_are_one_query(count_queries, seed_task):
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            for round_type in ROUNDS:
+                await conn.run_sync(seed_task, round_type, f"{round_type}-task", 25)
+
+        counts = {}
+        async with Session() as db:
+            for round_type in ROUNDS:
+                with count_queries(engine.sync_engine) as statements:
+                    responses = await load_responses_with_questions(db, round_type, f"{round_type}-task")
+                    build_qa_pairs(round_type, responses)
+                counts[round_type] = len(statements)
+
+            with count_queries(engine.sync_engine) as statements:
+                hr = await get_hr_responses("hr-task", db)
+                cultural = await get_cultural_responses("cultural-task", db)
+            counts["routes"] = len(statements)
+
+        await engine.dispose()
+        return counts, hr, cultural
+
+    counts, hr, cultural = asyncio.run(run())
+
+    assert counts == {"technical": 1, "hr": 1, "cultural": 1, "routes": 2}
+    assert hr[0] == {"task_id": "hr-task", "question_text": "Q0", "transcript": "answer 0"}
+    assert len(cultural) == 25
@@ -0,0 +1,76 @@
+"""
+GET /technical-round/responses/{task_id} returns every answer with its expected
+answer in one query, and finds the task's rows through the (task_id, question_id) index.
+"""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models import Base
+from routers.technical_round import get_technical_responses
+from services.response_queries import responses_with_questions_query
+
+SIZES = [1, 50, 500]
+
+
+@pytest.fixture
+def technical_db(seed_task):
+    """
+    Async engine and session factory holding one technical task per size.
+    """
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    async def seed():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            for size in SIZES:
+                await conn.run_sync(seed_task, "technical", f"task-{size}", size)
+
+    asyncio.run(seed())
+    yield engine, async_sessionmaker(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+def call_route(Session, task_id: str):
+    async def run():
+        async with Session() as db:
+            return await get_technical_responses(task_id, db)
+    return asyncio.run(run())
+
+
+def test_one_query_per_request_at_any_size(technical_db, count_queries):
+    engine, Session = technical_db
+
+    for size in SIZES:
+        with count_queries(engine.sync_engine) as statements:
+            rows = call_route(Session, f"task-{size}")
+
+        assert len(statements) == 1
+        assert len(rows) == size
+        assert rows[0] == {
+            "task_id": f"task-{size}", "question": "Q0", "transcript": "answer 0",
+            "skill": "python", "correct_answer": "A0"
+        }
+        assert [r["correct_answer"] for r in rows] == [f"A{i}" for i in range(size)]
+
+
+def test_unknown_task_is_404(technical_db):
+    _, Session = technical_db
+
+    with pytest.raises(HTTPException) as error:
+        call_route(Session, "missing")
+    assert error.value.status_code == 404
+
+
+def test_task_lookup_uses_the_response_index(engine):
+    query = responses_with_questions_query("technical", "task-1").compile(
+        engine, compile_kwargs={"literal_binds": True}
+    )
+    with engine.connect() as conn:
+        plan = " ".join(str(row[-1]) for row in conn.execute(text(f"EXPLAIN QUERY PLAN {query}")))
+
+    assert "idx_technical_round_response_task" in plan
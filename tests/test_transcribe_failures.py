@@ -0,0 +1,116 @@
+"""
+A Speech-to-Text failure is never stored as the answer: no response row is
+written and the dedup job ends failed, so a retry of the same upload runs again
+(single /transcribe and each answer of a batch).
+"""
+import asyncio
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import routers.upload as upload
+from models import Base, BackgroundJob, HrRoundResponse
+from services import transcription
+from services.transcription import derive_dedup_key
+
+
+@pytest.fixture
+def upload_db(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create())
+    monkeypatch.setattr(upload, "UPLOAD_JOB_MODE", False)
+    monkeypatch.setattr(upload, "UPLOAD_STREAMING", False)
+    monkeypatch.setattr(upload, "save_upload", lambda file_obj, video_path: None)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+def transcribe(Session, question_id: int = 1):
+    async def run():
+        async with Session() as db:
+            return await upload.process_audio_for_transcription(
+                video_file=SimpleNamespace(file=io.BytesIO(b"video")), task_id="task-1",
+                question_id=question_id, round_type="hr", skill=None, async_mode=None,
+                idempotency_key=None, db=db
+            )
+    return asyncio.run(run())
+
+
+def stored(Session):
+    async def run():
+        async with Session() as db:
+            rows = (await db.execute(select(HrRoundResponse.transcript))).scalars().all()
+            job = (await db.execute(
+                select(BackgroundJob).where(BackgroundJob.dedup_key == derive_dedup_key("hr", "task-1", 1))
+            )).scalars().first()
+            return rows, job
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("failure", ["[Error: 503 Service Unavailable]", "[Transcription failed: timeout]"])
+def test_failed_transcript_is_not_stored_and_retry_runs_again(upload_db, monkeypatch, failure):
+    monkeypatch.setattr(upload, "transcribe_uploaded_video", lambda video_path, base: (failure, None))
+
+    with pytest.raises(HTTPException) as exc:
+        transcribe(upload_db)
+    assert exc.value.status_code == 500
+
+    rows, job = stored(upload_db)
+    assert rows == []
+    assert job.status == "failed"
+
+    monkeypatch.setattr(upload, "transcribe_uploaded_video", lambda video_path, base: ("hello", None))
+    result = transcribe(upload_db)
+
+    assert result["transcript"] == "hello"
+    rows, job = stored(upload_db)
+    assert rows == ["hello"]
+    assert job.status == "done"
+    assert json.loads(job.result)["transcript"] == "hello"
+
+
+def transcribe_batch(Session, question_ids: list[int]):
+    async def run():
+        async with Session() as db:
+            return await upload.process_batch_for_transcription(
+                task_id="task-1", round_type="hr", question_ids=question_ids, skills=None,
+                video_files=[SimpleNamespace(file=io.BytesIO(b"video")) for _ in question_ids],
+                manifest=None, db=db
+            )
+    return asyncio.run(run())
+
+
+def test_failed_batch_answer_is_reported_as_failed(upload_db, monkeypatch):
+    def fake_transcribe(video_path, base):
+        return ("[Error: 503 Service Unavailable]", None) if failing[0] else ("hello", None)
+
+    failing = [True]
+    monkeypatch.setattr(transcription, "transcribe_video_file", fake_transcribe)
+
+    summary = transcribe_batch(upload_db, [1])
+
+    assert summary["results"] == []
+    assert [f["question_id"] for f in summary["failed"]] == [1]
+    assert "503" in summary["failed"][0]["error"]
+    rows, job = stored(upload_db)
+    assert rows == []
+    assert job.status == "failed"
+
+    failing[0] = False
+    summary = transcribe_batch(upload_db, [1])
+
+    assert [r["question_id"] for r in summary["results"]] == [1]
+    rows, job = stored(upload_db)
+    assert rows == ["hello"]
+    assert job.status == "done"
@@ -0,0 +1,73 @@
+"""
+A failing transcript cache backend is treated as a miss: the transcription still
+runs and succeeds, and a streamed upload is finalised rather than cancelled.
+"""
+import io
+
+import pytest
+
+from services import transcription
+
+
+class BrokenCache:
+    def get(self, key):
+        raise OSError("disk I/O error")
+
+    def set(self, key, transcript, audio_url):
+        raise OSError("disk I/O error")
+
+
+class RecordingWriter(io.BytesIO):
+    def __init__(self):
+        super().__init__()
+        self.finalised = False
+        self.terminated = False
+
+    def close(self):
+        self.finalised = not self.closed
+        super().close()
+
+    def terminate(self):
+        self.terminated = True
+        super().close()
+
+
+@pytest.fixture(params=["get_cache", "get", "set"])
+def broken_cache(request, monkeypatch):
+    if request.param == "get_cache":
+        def failing_backend():
+            raise RuntimeError("could not connect to server")
+        monkeypatch.setattr(transcription, "get_transcript_cache", failing_backend)
+    else:
+        cache = BrokenCache()
+        if request.param == "set":
+            monkeypatch.setattr(cache, "get", lambda key: None)
+        monkeypatch.setattr(transcription, "get_transcript_cache", lambda: cache)
+
+
+def test_saved_upload_is_transcribed_despite_cache_errors(broken_cache, monkeypatch, tmp_path):
+    def extract(video_path, audio_path, codec):
+        with open(audio_path, "wb") as f:
+            f.write(b"audio")
+
+    monkeypatch.setattr(transcription, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(transcription, "extract_audio_from_compressed_video", extract)
+    monkeypatch.setattr(transcription, "probe_audio_duration", lambda audio_path: 5.0)
+    monkeypatch.setattr(transcription, "transcribe_inline_with_vertex_ai", lambda audio_path, audio_format: "hello")
+
+    assert transcription.transcribe_video_file("video.webm", "answer") == ("hello", None)
+
+
+def test_streamed_upload_is_finalised_despite_cache_errors(broken_cache, monkeypatch):
+    writer = RecordingWriter()
+    monkeypatch.setattr(transcription, "open_gcp_blob_writer", lambda path, content_type: writer)
+    monkeypatch.setattr(transcription, "streaming_audio_format", lambda codec: "flac")
+    monkeypatch.setattr(transcription, "stream_audio_extraction",
+                        lambda stream, out, audio_format: out.write(b"audio"))
+    monkeypatch.setattr(transcription, "transcribe_with_vertex_ai", lambda uri, audio_format: "hello")
+
+    transcript, gcs_uri = transcription.transcribe_video_stream(io.BytesIO(), "answer")
+
+    assert transcript == "hello"
+    assert gcs_uri.endswith("/audios/answer.flac")
+    assert writer.finalised and not writer.terminated